@@ -3,11 +3,15 @@ Base Agent Class
 Abstract base class for all agents in the system
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from app.models.message import AgentMessage, MessageType, MessageResponse
 from app.models.workflow import AgentType
+from app.agents.message_history import MessageHistory
+from app.config import settings
+from app.log import get_logger
+import logging
+import os
 import uuid
-from datetime import datetime
 
 
 class BaseAgent(ABC):
@@ -16,11 +20,22 @@ class BaseAgent(ABC):
     Provides common functionality and enforces interface.
     """
     
-    def __init__(self, agent_type: AgentType, agent_id: Optional[str] = None):
+    def __init__(
+        self,
+        agent_type: AgentType,
+        agent_id: Optional[str] = None,
+        history_size: Optional[int] = None
+    ):
         self.agent_id = agent_id or f"{agent_type.value}_{uuid.uuid4().hex[:8]}"
         self.agent_type = agent_type
         self.status = "idle"
-        self.message_history = []
+        self.active_tasks = 0
+        spill_dir = settings.AGENT_MESSAGE_SPILL_DIR
+        self.message_history = MessageHistory(
+            history_size if history_size is not None else settings.AGENT_MESSAGE_HISTORY_SIZE,
+            spill_path=os.path.join(spill_dir, f"{self.agent_id}.jsonl") if spill_dir else None
+        )
+        self.logger = get_logger(f"agents.{agent_type.value}")
     
     @abstractmethod
     async def process_message(self, message: AgentMessage) -> MessageResponse:
@@ -38,6 +53,18 @@ class BaseAgent(ABC):
         """
         pass
     
+    def task_started(self):
+        """Mark a task as in flight; agents may run several tasks concurrently"""
+        self.active_tasks += 1
+        self.status = "busy"
+    
+    def task_finished(self):
+        """Mark an in-flight task as done"""
+        self.active_tasks -= 1
+        if self.active_tasks <= 0:
+            self.active_tasks = 0
+            self.status = "idle"
+    
     def create_message(
         self,
         message_type: MessageType,
@@ -65,7 +92,11 @@ class BaseAgent(ABC):
         self.message_history.append(message)
         return message
     
-    def log(self, message: str):
-        """Log agent activity"""
-        timestamp = datetime.utcnow().isoformat()
-        print(f"[{timestamp}] [{self.agent_type.value}:{self.agent_id}] {message}")
+    def get_messages(self, workflow_id: Optional[str] = None, limit: Optional[int] = None) -> List[AgentMessage]:
+        """Recent messages this agent created or received, from the history ring buffer"""
+        return self.message_history.query(workflow_id, limit)
+    
+    def log(self, message: str, *args, level: int = logging.INFO):
+        """Log agent activity; %-style args are only formatted if the record is emitted"""
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, message, *args, extra={"agent_id": self.agent_id})
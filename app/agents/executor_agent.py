@@ -2,17 +2,53 @@
 Executor Agent
 Performs actual database operations and system updates
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, List, Optional, Set
 from app.agents.base_agent import BaseAgent
-from app.models.message import AgentMessage, MessageResponse
+from app.models.message import (
+    AgentMessage, MessageResponse, InternalMessage, InternalResponse, AnyMessage, AnyResponse
+)
 from app.models.workflow import AgentType
 from app.models.customer import CustomerCreate, CustomerUpdate
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete
-from app.database import CustomerDB
+from sqlalchemy import select, insert, update, delete, bindparam
+from sqlalchemy.exc import OperationalError
+from app.database import AsyncSessionLocal, CustomerDB
+from app.cache import customer_cache
+from app.analytics import customer_analytics
+from app.queries import profile_query
+from app.config import settings
+from app.tracing import tracer
+from app.write_coordinator import write_coordinator, WRITE_RETRY_ATTEMPTS, WRITE_RETRY_BACKOFF
+import asyncio
+import logging
+import math
+import random
 import uuid
 
 
+# Valid database columns for CustomerDB updates
+UPDATABLE_COLUMNS = frozenset({
+    "customer_name", "email", "phone", "credit_limit", "kyc_date",
+    "status", "region", "industry", "country", "zip_code",
+    "subscription_plan", "signup_date", "last_login",
+    "total_transactions", "total_spent", "preferred_category",
+    "loyalty_points", "data"
+})
+
+# Python type each scalar column is coerced to before it is written ("data" is free-form JSON)
+COLUMN_TYPES = {
+    column.name: column.type.python_type
+    for column in CustomerDB.__table__.columns
+    if column.name in UPDATABLE_COLUMNS and column.name != "data"
+}
+
+# Operation keys that never map to columns
+CONTROL_KEYS = frozenset({"operation", "target_customer_id", "customer_id", "parameters"})
+
+# Keep IN (...) lists well under SQLite's bound-parameter limit
+ID_LOOKUP_CHUNK = 500
+
+
 class ExecutorAgent(BaseAgent):
     """
     Executor Agent - Performs database operations and system updates
@@ -22,20 +58,39 @@ class ExecutorAgent(BaseAgent):
     - Manage database transactions
     - Handle errors and rollbacks
     - Report execution results
+    
+    The session passed per call (usually from the read pool) serves lookups
+    and queries. Writes go through the write coordinator, or a session of
+    their own from write_session_factory, so the single writer connection is
+    only held for the write itself.
     """
     
-    def __init__(self, agent_id: Optional[str] = None):
-        super().__init__(AgentType.EXECUTOR, agent_id)
+    def __init__(self, agent_id: Optional[str] = None, history_size: Optional[int] = None):
+        super().__init__(AgentType.EXECUTOR, agent_id, history_size)
         self.db_session: Optional[AsyncSession] = None
+        self.write_session_factory = AsyncSessionLocal
         self.log("Executor Agent initialized")
     
     def set_db_session(self, session: AsyncSession):
-        """Set database session for operations"""
+        """
+        Set the default database session for operations.
+        Only used when a call does not pass its own session; concurrent
+        workflows must pass a session per call instead of sharing this one.
+        """
         self.db_session = session
     
-    async def process_message(self, message: AgentMessage) -> MessageResponse:
+    def _resolve_session(self, db_session: Optional[AsyncSession]) -> AsyncSession:
+        """Pick the per-call session, falling back to the default session"""
+        session = db_session or self.db_session
+        if not session:
+            raise RuntimeError("Database session not set")
+        return session
+    
+    async def process_message(self, message: AnyMessage) -> AnyResponse:
         """Process incoming message and route to appropriate handler"""
-        self.log(f"Processing message: {message.action}")
+        self.log("Processing message: %s", message.action, level=logging.DEBUG)
+        self.message_history.append(message)
+        response_type = InternalResponse if isinstance(message, InternalMessage) else MessageResponse
         
         try:
             if message.action == "execute_operation":
@@ -43,224 +98,491 @@ class ExecutorAgent(BaseAgent):
             else:
                 raise ValueError(f"Unknown action: {message.action}")
             
-            return MessageResponse(
+            return response_type(
                 success=True,
                 message_id=message.message_id,
                 result=result
             )
         except Exception as e:
-            self.log(f"Error processing message: {str(e)}")
-            return MessageResponse(
+            self.log("Error processing message: %s", e, level=logging.ERROR)
+            return response_type(
                 success=False,
                 message_id=message.message_id,
                 error=str(e)
             )
     
-    async def execute_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute a database operation task"""
-        self.status = "busy"
-        self.log(f"Executing task: {task.get('description')}")
+    async def execute_task(
+        self,
+        task: Dict[str, Any],
+        db_session: Optional[AsyncSession] = None
+    ) -> Dict[str, Any]:
+        """Execute a database operation task on the given (or default) session"""
+        self.task_started()
+        self.log("Executing task: %s", task.get("description"), level=logging.DEBUG)
         
         try:
-            if not self.db_session:
-                raise RuntimeError("Database session not set")
+            session = self._resolve_session(db_session)
             
             operation = task.get("parameters", {}).get("operation")
             params = task.get("parameters", {})
             
-            if operation == "create":
-                result = await self._create_customer(params)
-            elif operation == "update":
-                result = await self._update_customer(params)
-            elif operation == "delete":
-                result = await self._delete_customer(params)
-            elif operation == "query":
-                result = await self._query_customer(params)
-            else:
-                raise ValueError(f"Unknown operation: {operation}")
+            result = await self._dispatch(operation, params, session)
             
-            self.status = "idle"
             return {
                 "status": "success",
                 "result": result,
                 "message": f"Successfully executed {operation} operation"
             }
         except Exception as e:
-            self.status = "idle"
-            self.log(f"Task execution failed: {str(e)}")
+            self.log("Task execution failed: %s", e, level=logging.WARNING)
             raise e
+        finally:
+            self.task_finished()
     
-    async def execute_operation(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+    async def execute_operation(
+        self,
+        payload: Dict[str, Any],
+        db_session: Optional[AsyncSession] = None
+    ) -> Dict[str, Any]:
         """Execute a database operation"""
         operation = payload.get("operation")
         params = payload.get("parameters", {})
         
-        self.log(f"Executing operation: {operation}")
+        self.log("Executing operation: %s", operation, level=logging.DEBUG)
         
+        return await self._dispatch(operation, params, self._resolve_session(db_session))
+    
+    async def _dispatch(
+        self,
+        operation: Optional[str],
+        params: Dict[str, Any],
+        session: AsyncSession
+    ) -> Dict[str, Any]:
+        """Route an operation to its handler"""
         if operation == "create":
-            return await self._create_customer(params)
+            return await self._create_customer(params, session)
         elif operation == "update":
-            return await self._update_customer(params)
+            return await self._update_customer(params, session)
         elif operation == "delete":
-            return await self._delete_customer(params)
+            return await self._delete_customer(params, session)
         elif operation == "query":
-            return await self._query_customer(params)
+            return await self._query_customer(params, session)
         else:
             raise ValueError(f"Unknown operation: {operation}")
     
-    async def _create_customer(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Create a new customer record"""
+    async def execute_batch(
+        self,
+        operations: List[Dict[str, Any]],
+        db_session: Optional[AsyncSession] = None
+    ) -> List[Any]:
+        """
+        Execute many independent operations with grouped statements and one commit.
+        
+        Updates that set the same columns share one executemany, creates share
+        one multi-row insert, and deletes and queries each share one IN lookup.
+        Returns one entry per operation: its result dict, or the exception it raised.
+        """
+        self.task_started()
+        self.log("Executing batch of %d operations", len(operations))
+        
         try:
-            # Generate new customer ID
-            mcp_id = f"CUST{uuid.uuid4().hex[:6].upper()}"
-            
-            # Create customer object
-            customer = CustomerDB(
-                mcp_id=mcp_id,
-                customer_name=params.get("customer_name"),
-                email=params.get("email"),
-                phone=params.get("phone"),
-                credit_limit=params.get("credit_limit", 0.0),
-                kyc_date=params.get("kyc_date", ""),
-                status=params.get("status", "active"),
-                region=params.get("region"),
-                industry=params.get("industry"),
-                country=params.get("country"),
-                zip_code=params.get("zip_code"),
-                subscription_plan=params.get("subscription_plan", "Basic"),
-                signup_date=params.get("signup_date", ""),
-                last_login=params.get("last_login", ""),
-                total_transactions=0,
-                total_spent=0.0,
-                preferred_category=params.get("preferred_category"),
-                loyalty_points=0,
-                data=params.get("data")
-            )
+            session = self._resolve_session(db_session)
+            results: List[Any] = [None] * len(operations)
             
-            self.db_session.add(customer)
-            await self.db_session.commit()
-            await self.db_session.refresh(customer)
+            # Group operations by kind; invalid ones fail individually
+            updates: Dict[tuple, List[tuple]] = {}
+            creates: List[tuple] = []
+            deletes: List[tuple] = []
+            queries: List[tuple] = []
+            for i, params in enumerate(operations):
+                try:
+                    operation = params.get("operation")
+                    if operation == "update":
+                        customer_id = self._customer_id(params, "update")
+                        update_data = self._build_update_data(params)
+                        updates.setdefault(tuple(sorted(update_data)), []).append(
+                            (i, customer_id, update_data)
+                        )
+                    elif operation == "create":
+                        creates.append((i, self._build_create_values(params)))
+                    elif operation == "delete":
+                        deletes.append((i, self._customer_id(params, "delete")))
+                    elif operation == "query":
+                        queries.append((i, params))
+                    else:
+                        raise ValueError(f"Unknown operation: {operation}")
+                except Exception as e:
+                    results[i] = e
             
-            self.log(f"Created customer: {mcp_id}")
+            if updates or creates or deletes:
+                await self._execute_batch_writes(updates, creates, deletes, results)
+            if queries:
+                await self._execute_batch_queries(session, queries, results)
             
-            return {
-                "operation": "create",
-                "customer_id": mcp_id,
-                "success": True
-            }
-        except Exception as e:
-            await self.db_session.rollback()
-            raise e
+            return results
+        finally:
+            self.task_finished()
     
-    async def _update_customer(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Update an existing customer record"""
-        try:
-            customer_id = params.get("target_customer_id") or params.get("customer_id")
-            if not customer_id:
-                raise ValueError("Customer ID is required for update")
-            
-            # Valid database columns for CustomerDB
-            valid_columns = {
-                "customer_name", "email", "phone", "credit_limit", "kyc_date",
-                "status", "region", "industry", "country", "zip_code",
-                "subscription_plan", "signup_date", "last_login",
-                "total_transactions", "total_spent", "preferred_category",
-                "loyalty_points", "data"
-            }
-            
-            # Build update dictionary (exclude None values, operation keys, and invalid columns)
-            update_data = {
-                k: v for k, v in params.items() 
-                if v is not None 
-                and k not in ["operation", "target_customer_id", "customer_id", "parameters"]
-                and k in valid_columns
-            }
-            
-            if not update_data:
-                raise ValueError("No update data provided")
-            
-            # Execute update
-            stmt = (
-                update(CustomerDB)
-                .where(CustomerDB.mcp_id == customer_id)
-                .values(**update_data)
+    async def _existing_customer_ids(self, session: AsyncSession, customer_ids: Iterable[str]) -> Set[str]:
+        """Which of the given customer IDs exist"""
+        customer_ids = list(set(customer_ids))
+        existing: Set[str] = set()
+        for offset in range(0, len(customer_ids), ID_LOOKUP_CHUNK):
+            chunk = customer_ids[offset:offset + ID_LOOKUP_CHUNK]
+            result = await session.execute(select(CustomerDB.mcp_id).where(CustomerDB.mcp_id.in_(chunk)))
+            existing.update(result.scalars().all())
+        return existing
+    
+    async def _execute_batch_writes(
+        self,
+        updates: Dict[tuple, List[tuple]],
+        creates: List[tuple],
+        deletes: List[tuple],
+        results: List[Any]
+    ):
+        """
+        Apply grouped writes in a single transaction on a writer session, filling
+        in per-operation results. If the grouped transaction fails, it is retried with each row under its
+        own SAVEPOINT, so only the rows that fail again are reported failed.
+        """
+        table = CustomerDB.__table__
+        
+        async def execute(session: AsyncSession, statement, entries: List[tuple], outcomes: Dict[int, Any], isolate: bool):
+            """Run statement for each (index, row): one executemany, or one SAVEPOINT per row"""
+            if not isolate:
+                await session.execute(statement, [row for _, row in entries])
+                return
+            for i, row in entries:
+                try:
+                    async with session.begin_nested():
+                        await session.execute(statement, [row])
+                except Exception as e:
+                    if isinstance(e, OperationalError) and "database is locked" in str(e):
+                        raise
+                    outcomes[i] = e
+        
+        async def write(session: AsyncSession, isolate: bool) -> Dict[int, Any]:
+            outcomes: Dict[int, Any] = {}
+            existing = await self._existing_customer_ids(
+                session,
+                [cid for group in updates.values() for _, cid, _ in group] + [cid for _, cid in deletes]
             )
-            result = await self.db_session.execute(stmt)
-            await self.db_session.commit()
             
-            if result.rowcount == 0:
-                raise ValueError(f"Customer {customer_id} not found")
+            # One executemany per distinct set of updated columns; SET comes from the row keys
+            update_stmt = table.update().where(table.c.mcp_id == bindparam("_customer_id"))
+            for columns, group in updates.items():
+                rows = []
+                for i, customer_id, update_data in group:
+                    if customer_id not in existing:
+                        outcomes[i] = ValueError(f"Customer {customer_id} not found")
+                        continue
+                    rows.append((i, {"_customer_id": customer_id, **update_data}))
+                    outcomes[i] = {
+                        "operation": "update",
+                        "customer_id": customer_id,
+                        "updated_fields": list(update_data.keys()),
+                        "success": True
+                    }
+                if rows:
+                    await execute(session, update_stmt, rows, outcomes, isolate)
             
-            self.log(f"Updated customer: {customer_id}")
+            if creates:
+                for i, values in creates:
+                    outcomes[i] = {"operation": "create", "customer_id": values["mcp_id"], "success": True}
+                await execute(session, table.insert(), creates, outcomes, isolate)
             
-            return {
-                "operation": "update",
-                "customer_id": customer_id,
-                "updated_fields": list(update_data.keys()),
-                "success": True
-            }
-        except Exception as e:
-            await self.db_session.rollback()
-            raise e
+            deleted: List[tuple] = []
+            seen: Set[str] = set()
+            for i, customer_id in deletes:
+                if customer_id not in existing or customer_id in seen:
+                    outcomes[i] = ValueError(f"Customer {customer_id} not found")
+                    continue
+                seen.add(customer_id)
+                deleted.append((i, {"_customer_id": customer_id}))
+                outcomes[i] = {"operation": "delete", "customer_id": customer_id, "success": True}
+            if deleted:
+                delete_stmt = table.delete().where(table.c.mcp_id == bindparam("_customer_id"))
+                await execute(session, delete_stmt, deleted, outcomes, isolate)
+            
+            return outcomes
+        
+        outcomes: Optional[Dict[int, Any]] = None
+        for isolate in (False, True):
+            try:
+                async with self.write_session_factory() as session:
+                    outcomes = await self._commit_with_retry(session, lambda: write(session, isolate))
+                break
+            except Exception as e:
+                # Nothing was committed; the row-by-row pass isolates the bad rows
+                self.log("Batch write failed%s: %s", " row by row" if isolate else "", e, level=logging.WARNING)
+                error = e
+        
+        if outcomes is None:
+            indexes = [i for group in updates.values() for i, _, _ in group]
+            indexes += [i for i, _ in creates] + [i for i, _ in deletes]
+            for i in indexes:
+                results[i] = error
+            return
+        
+        for i, outcome in outcomes.items():
+            results[i] = outcome
+        self._publish_writes(
+            upserts=[
+                (cid, update_data)
+                for group in updates.values()
+                for i, cid, update_data in group
+                if not isinstance(outcomes[i], Exception)
+            ] + [(values["mcp_id"], values) for i, values in creates if not isinstance(outcomes[i], Exception)],
+            deletes=[cid for i, cid in deletes if not isinstance(outcomes[i], Exception)]
+        )
     
-    async def _delete_customer(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Delete a customer record"""
+    async def _execute_batch_queries(self, session: AsyncSession, queries: List[tuple], results: List[Any]):
+        """Answer single-customer queries from the cache, then one IN lookup; list queries run individually"""
+        by_id = [(i, self._customer_id(params)) for i, params in queries]
+        
+        customers: Dict[str, Dict[str, Any]] = {}
+        missing: List[str] = []
+        for _, customer_id in by_id:
+            if customer_id and customer_id not in customers:
+                profile = customer_cache.get(customer_id)
+                if profile is None:
+                    missing.append(customer_id)
+                else:
+                    customers[customer_id] = profile
+        
+        generation = customer_cache.generation
+        missing = list(set(missing))
+        for offset in range(0, len(missing), ID_LOOKUP_CHUNK):
+            chunk = missing[offset:offset + ID_LOOKUP_CHUNK]
+            result = await session.execute(profile_query().where(CustomerDB.mcp_id.in_(chunk)))
+            for row in result.mappings():
+                customers[row["mcp_id"]] = profile = dict(row)
+                customer_cache.set(row["mcp_id"], profile, generation)
+        
+        for (i, customer_id), (_, params) in zip(by_id, queries):
+            try:
+                if not customer_id:
+                    results[i] = await self._query_customer(params, session)
+                elif customer_id in customers:
+                    results[i] = {
+                        "operation": "query",
+                        "customer": self._customer_summary(customers[customer_id]),
+                        "success": True
+                    }
+                else:
+                    raise ValueError(f"Customer {customer_id} not found")
+            except Exception as e:
+                results[i] = e
+    
+    def _publish_writes(self, upserts: Iterable[tuple] = (), deletes: Iterable[str] = ()):
+        """
+        Propagate committed writes to the customer cache and analytics snapshot.
+        Called only after the commit succeeded; a failure here is logged and
+        never changes the outcome of the write.
+        """
+        upserts = list(upserts)
+        deletes = list(deletes)
+        customer_cache.invalidate([customer_id for customer_id, _ in upserts] + deletes)
         try:
-            customer_id = params.get("target_customer_id") or params.get("customer_id")
-            if not customer_id:
-                raise ValueError("Customer ID is required for delete")
-            
-            # Execute delete
-            stmt = delete(CustomerDB).where(CustomerDB.mcp_id == customer_id)
-            result = await self.db_session.execute(stmt)
-            await self.db_session.commit()
-            
-            if result.rowcount == 0:
-                raise ValueError(f"Customer {customer_id} not found")
-            
-            self.log(f"Deleted customer: {customer_id}")
-            
-            return {
-                "operation": "delete",
-                "customer_id": customer_id,
-                "success": True
-            }
+            for customer_id, values in upserts:
+                customer_analytics.apply_upsert(customer_id, values)
+            customer_analytics.apply_delete(deletes)
         except Exception as e:
-            await self.db_session.rollback()
-            raise e
+            self.log("Analytics update failed after commit: %s", e, level=logging.ERROR)
+    
+    async def _commit_write(self, statement):
+        """
+        Execute a single write statement and commit it.
+        With the write coordinator enabled the statement joins the next group
+        commit; otherwise it commits on a writer session of its own.
+        """
+        if settings.WRITE_COORDINATOR_ENABLED:
+            # Statements run on the coordinator's task; this span covers wait plus group commit
+            with tracer.span("db.group_commit"):
+                return await write_coordinator.submit(statement)
+        async with self.write_session_factory() as session:
+            return await self._commit_with_retry(session, lambda: session.execute(statement))
+    
+    async def _commit_with_retry(self, session: AsyncSession, work):
+        """
+        Run a write transaction and commit it.
+        When concurrent workflows write at once, SQLite aborts one side with
+        "database is locked"; that side is rolled back and retried with jittered backoff.
+        """
+        for attempt in range(WRITE_RETRY_ATTEMPTS):
+            try:
+                with tracer.span("db.transaction", attempt=attempt + 1):
+                    result = await work()
+                    await session.commit()
+                return result
+            except OperationalError as e:
+                await session.rollback()
+                if "database is locked" not in str(e) or attempt == WRITE_RETRY_ATTEMPTS - 1:
+                    raise
+                await asyncio.sleep(WRITE_RETRY_BACKOFF * (2 ** attempt) * random.random())
+    
+    @staticmethod
+    def _customer_id(params: Dict[str, Any], operation: Optional[str] = None) -> Optional[str]:
+        """Target customer of an operation; required when operation is named"""
+        customer_id = params.get("target_customer_id") or params.get("customer_id")
+        if operation and not customer_id:
+            raise ValueError(f"Customer ID is required for {operation}")
+        return customer_id
+    
+    @staticmethod
+    def _coerce_column(column: str, value: Any) -> Any:
+        """Value converted to its column's type; raises ValueError before anything is written"""
+        kind = COLUMN_TYPES.get(column)
+        if kind is None or value is None:
+            return value
+        try:
+            if isinstance(value, (bool, dict, list)):
+                raise TypeError
+            if kind is str:
+                return str(value)
+            coerced = kind(value)
+            if kind is float and not math.isfinite(coerced):
+                raise ValueError
+            if kind is int and isinstance(value, float) and coerced != value:
+                raise ValueError
+            return coerced
+        except (TypeError, ValueError, OverflowError):
+            raise ValueError(f"Invalid value for {column}: expected {kind.__name__}, got {value!r}") from None
+    
+    @classmethod
+    def _build_update_data(cls, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Column values of an update (excluding None values, operation keys, and invalid columns)"""
+        update_data = {
+            k: cls._coerce_column(k, v) for k, v in params.items()
+            if v is not None
+            and k not in CONTROL_KEYS
+            and k in UPDATABLE_COLUMNS
+        }
+        if not update_data:
+            raise ValueError("No update data provided")
+        return update_data
+    
+    @classmethod
+    def _build_create_values(cls, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Column values of a new customer record with a generated ID"""
+        values = dict(
+            # Generate new customer ID
+            mcp_id=f"CUST{uuid.uuid4().hex[:6].upper()}",
+            customer_name=params.get("customer_name"),
+            email=params.get("email"),
+            phone=params.get("phone"),
+            credit_limit=params.get("credit_limit", 0.0),
+            kyc_date=params.get("kyc_date", ""),
+            status=params.get("status", "active"),
+            region=params.get("region"),
+            industry=params.get("industry"),
+            country=params.get("country"),
+            zip_code=params.get("zip_code"),
+            subscription_plan=params.get("subscription_plan", "Basic"),
+            signup_date=params.get("signup_date", ""),
+            last_login=params.get("last_login", ""),
+            total_transactions=0,
+            total_spent=0.0,
+            preferred_category=params.get("preferred_category"),
+            loyalty_points=0,
+            data=params.get("data")
+        )
+        return {column: cls._coerce_column(column, value) for column, value in values.items()}
+    
+    @staticmethod
+    def _customer_summary(profile: Dict[str, Any]) -> Dict[str, Any]:
+        """Fields returned for a single-customer query"""
+        return {
+            "mcp_id": profile["mcp_id"],
+            "customer_name": profile["customer_name"],
+            "email": profile["email"],
+            "status": profile["status"],
+            "subscription_plan": profile["subscription_plan"],
+            "credit_limit": profile["credit_limit"],
+            "total_spent": profile["total_spent"],
+            "loyalty_points": profile["loyalty_points"]
+        }
+    
+    async def _create_customer(self, params: Dict[str, Any], session: AsyncSession) -> Dict[str, Any]:
+        """Create a new customer record"""
+        values = self._build_create_values(params)
+        mcp_id = values["mcp_id"]
+        
+        await self._commit_write(insert(CustomerDB).values(**values))
+        self._publish_writes(upserts=[(mcp_id, values)])
+        self.log("Created customer: %s", mcp_id, level=logging.DEBUG)
+        
+        return {
+            "operation": "create",
+            "customer_id": mcp_id,
+            "success": True
+        }
+    
+    async def _update_customer(self, params: Dict[str, Any], session: AsyncSession) -> Dict[str, Any]:
+        """Update an existing customer record"""
+        customer_id = self._customer_id(params, "update")
+        update_data = self._build_update_data(params)
+        
+        # Execute update
+        stmt = (
+            update(CustomerDB)
+            .where(CustomerDB.mcp_id == customer_id)
+            .values(**update_data)
+        )
+        result = await self._commit_write(stmt)
+        if result.rowcount == 0:
+            raise ValueError(f"Customer {customer_id} not found")
+        
+        self._publish_writes(upserts=[(customer_id, update_data)])
+        self.log("Updated customer: %s", customer_id, level=logging.DEBUG)
+        
+        return {
+            "operation": "update",
+            "customer_id": customer_id,
+            "updated_fields": list(update_data.keys()),
+            "success": True
+        }
+    
+    async def _delete_customer(self, params: Dict[str, Any], session: AsyncSession) -> Dict[str, Any]:
+        """Delete a customer record"""
+        customer_id = self._customer_id(params, "delete")
+        
+        # Execute delete
+        stmt = delete(CustomerDB).where(CustomerDB.mcp_id == customer_id)
+        result = await self._commit_write(stmt)
+        if result.rowcount == 0:
+            raise ValueError(f"Customer {customer_id} not found")
+        
+        self._publish_writes(deletes=[customer_id])
+        self.log("Deleted customer: %s", customer_id, level=logging.DEBUG)
+        
+        return {
+            "operation": "delete",
+            "customer_id": customer_id,
+            "success": True
+        }
     
-    async def _query_customer(self, params: Dict[str, Any]) -> Dict[str, Any]:
+    async def _query_customer(self, params: Dict[str, Any], session: AsyncSession) -> Dict[str, Any]:
         """Query customer data"""
         try:
-            customer_id = params.get("target_customer_id") or params.get("customer_id")
+            customer_id = self._customer_id(params)
             
             if customer_id:
-                # Query specific customer
-                stmt = select(CustomerDB).where(CustomerDB.mcp_id == customer_id)
-                result = await self.db_session.execute(stmt)
-                customer = result.scalar_one_or_none()
+                # Query specific customer (read-through cache)
+                profile = await customer_cache.get_profile(session, customer_id)
                 
-                if not customer:
+                if not profile:
                     raise ValueError(f"Customer {customer_id} not found")
                 
                 return {
                     "operation": "query",
-                    "customer": {
-                        "mcp_id": customer.mcp_id,
-                        "customer_name": customer.customer_name,
-                        "email": customer.email,
-                        "status": customer.status,
-                        "subscription_plan": customer.subscription_plan,
-                        "credit_limit": customer.credit_limit,
-                        "total_spent": customer.total_spent,
-                        "loyalty_points": customer.loyalty_points
-                    },
+                    "customer": self._customer_summary(profile),
                     "success": True
                 }
             else:
                 # Query all customers (with limit)
                 stmt = select(CustomerDB).limit(10)
-                result = await self.db_session.execute(stmt)
+                result = await session.execute(stmt)
                 customers = result.scalars().all()
                 
                 return {
@@ -0,0 +1,97 @@
+"""
+Agent Message History
+Fixed-capacity ring buffer of recent ACL messages with optional audit spill
+"""
+from typing import Dict, Any, List, Optional, TextIO
+from collections import deque
+from app.models.message import AgentMessage, InternalMessage, AnyMessage
+import os
+
+
+def as_acl(message: AnyMessage) -> AgentMessage:
+    """The ACL form of a message, converting InternalMessage on demand"""
+    return message.to_acl() if isinstance(message, InternalMessage) else message
+
+
+class MessageHistory:
+    """
+    Ring buffer holding an agent's most recent messages.
+    
+    Memory stays constant: once capacity is reached each new message evicts
+    the oldest one. If spill_path is set, evicted messages are appended to
+    that file as JSON lines so the full history is kept for audit.
+    InternalMessages are kept as-is and only converted with to_acl() when
+    queried or spilled.
+    """
+    
+    def __init__(self, capacity: int, spill_path: Optional[str] = None):
+        self.capacity = max(0, capacity)
+        self.spill_path = spill_path
+        
+        self._messages: "deque[AnyMessage]" = deque(maxlen=self.capacity)
+        self._spill_file: Optional[TextIO] = None
+        self.appended = 0
+        self.evicted = 0
+        self.spilled = 0
+    
+    def __len__(self) -> int:
+        return len(self._messages)
+    
+    def __iter__(self):
+        return iter(self._messages)
+    
+    def append(self, message: AnyMessage):
+        """Record a message, evicting (and spilling) the oldest one when full"""
+        self.appended += 1
+        if self.capacity == 0:
+            self._spill(message)
+            return
+        if len(self._messages) == self.capacity:
+            self.evicted += 1
+            self._spill(self._messages[0])
+        self._messages.append(message)
+    
+    def query(self, workflow_id: Optional[str] = None, limit: Optional[int] = None) -> List[AgentMessage]:
+        """Retained messages, oldest first, optionally for one workflow and capped to the newest limit"""
+        if workflow_id is None:
+            messages = list(self._messages)
+        else:
+            messages = [m for m in self._messages if m.workflow_id == workflow_id]
+        if limit is not None:
+            messages = messages[-limit:] if limit > 0 else []
+        return [as_acl(m) for m in messages]
+    
+    def _spill(self, message: AnyMessage):
+        """Append an evicted message to the audit file"""
+        if not self.spill_path:
+            return
+        if self._spill_file is None:
+            directory = os.path.dirname(self.spill_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._spill_file = open(self.spill_path, "a", encoding="utf-8")
+        self._spill_file.write(as_acl(message).model_dump_json())
+        self._spill_file.write("\n")
+        self.spilled += 1
+    
+    def flush(self):
+        """Push buffered spill lines to the operating system"""
+        if self._spill_file is not None:
+            self._spill_file.flush()
+    
+    def close(self):
+        """Flush and close the spill file; it is reopened on the next eviction"""
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Ring buffer statistics"""
+        return {
+            "capacity": self.capacity,
+            "size": len(self._messages),
+            "appended": self.appended,
+            "evicted": self.evicted,
+            "spilled": self.spilled,
+            "spill_path": self.spill_path
+        }
@@ -2,13 +2,72 @@
 Planner Agent
 Generates task lists and plans for workflow execution
 """
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple
 from app.agents.base_agent import BaseAgent
-from app.models.message import AgentMessage, MessageResponse, MessageType
+from app.models.message import (
+    AgentMessage, MessageBatch, MessageResponse, MessageType,
+    InternalMessage, InternalResponse, AnyMessage, AnyResponse
+)
 from app.models.workflow import AgentType, Task, TaskStatus
+from app.config import settings
+from app.metrics import PLANNING_SECONDS
+from collections import OrderedDict
+from types import MappingProxyType
+import logging
+import time
 import uuid
 
 
+class PlanTaskTemplate(NamedTuple):
+    """Immutable description of one planned task"""
+    description: str
+    agent_type: str
+    priority: int
+    static_parameters: Tuple[Tuple[str, Any], ...]
+    takes_request_parameters: bool
+    depends_on: Tuple[int, ...] = ()  # positions of earlier tasks in the same plan
+
+
+class PlanTemplate(NamedTuple):
+    """Compiled plan for an (operation, parameter-key shape) pair"""
+    tasks: Tuple[PlanTaskTemplate, ...]
+    estimated_duration: int
+    complexity: str
+
+
+def _steps(*steps: Tuple[str, str]) -> Tuple[Dict[str, Any], ...]:
+    """Number a sequence of (action, description) pairs"""
+    return tuple(
+        MappingProxyType({"step": i, "action": action, "description": description})
+        for i, (action, description) in enumerate(steps, start=1)
+    )
+
+
+CREATE_CUSTOMER_STEPS = _steps(
+    ("validate_customer_data", "Validate customer information"),
+    ("check_duplicate", "Check for duplicate customer"),
+    ("insert_customer", "Insert new customer record")
+)
+
+UPDATE_CUSTOMER_STEPS = _steps(
+    ("fetch_current_data", "Retrieve current customer data"),
+    ("validate_updates", "Validate update parameters"),
+    ("apply_updates", "Apply updates to customer record")
+)
+
+DELETE_CUSTOMER_STEPS = _steps(
+    ("verify_customer_exists", "Verify customer exists"),
+    ("check_dependencies", "Check for dependent records"),
+    ("delete_customer", "Delete customer record")
+)
+
+QUERY_CUSTOMER_STEPS = _steps(
+    ("build_query", "Build database query"),
+    ("execute_query", "Execute query and retrieve data"),
+    ("format_results", "Format and return results")
+)
+
+
 class PlannerAgent(BaseAgent):
     """
     Planner Agent - Analyzes requests and generates executable task lists
@@ -20,14 +79,38 @@ class PlannerAgent(BaseAgent):
     - Determine task sequence and dependencies
     """
     
-    def __init__(self, agent_id: Optional[str] = None):
-        super().__init__(AgentType.PLANNER, agent_id)
+    def __init__(
+        self,
+        agent_id: Optional[str] = None,
+        use_plan_cache: bool = True,
+        history_size: Optional[int] = None
+    ):
+        super().__init__(AgentType.PLANNER, agent_id, history_size)
+        self.use_plan_cache = use_plan_cache
+        self.plan_cache_size = settings.PLAN_CACHE_SIZE
+        self._plan_cache: "OrderedDict[tuple, PlanTemplate]" = OrderedDict()
+        self.plan_cache_hits = 0
+        self.plan_cache_misses = 0
         self.log("Planner Agent initialized")
     
-    async def process_message(self, message: AgentMessage) -> MessageResponse:
+    async def process_message(self, message: AnyMessage) -> AnyResponse:
         """Process incoming message and route to appropriate handler"""
-        self.log(f"Processing message: {message.action}")
-        
+        self.log("Processing message: %s", message.action, level=logging.DEBUG)
+        return await self._handle_message(message)
+    
+    async def process_batch(self, batch: MessageBatch) -> List[AnyResponse]:
+        """Process every message of a batch in a single pass"""
+        self.log("Processing batch %s (%d messages)", batch.batch_id, len(batch.messages))
+        return await self.process_messages(batch.messages)
+    
+    async def process_messages(self, messages: List[AnyMessage]) -> List[AnyResponse]:
+        """Process a list of messages in a single pass"""
+        return [await self._handle_message(message) for message in messages]
+    
+    async def _handle_message(self, message: AnyMessage) -> AnyResponse:
+        """Route a message to its handler; internal messages get internal responses"""
+        self.message_history.append(message)
+        response_type = InternalResponse if isinstance(message, InternalMessage) else MessageResponse
         try:
             if message.action == "plan_workflow":
                 result = await self.plan_workflow(message.payload)
@@ -36,14 +119,14 @@ class PlannerAgent(BaseAgent):
             else:
                 raise ValueError(f"Unknown action: {message.action}")
             
-            return MessageResponse(
+            return response_type(
                 success=True,
                 message_id=message.message_id,
                 result=result
             )
         except Exception as e:
-            self.log(f"Error processing message: {str(e)}")
-            return MessageResponse(
+            self.log("Error processing message: %s", e, level=logging.ERROR)
+            return response_type(
                 success=False,
                 message_id=message.message_id,
                 error=str(e)
@@ -51,8 +134,8 @@ class PlannerAgent(BaseAgent):
     
     async def execute_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a planning task"""
-        self.status = "busy"
-        self.log(f"Executing task: {task.get('description')}")
+        self.task_started()
+        self.log("Executing task: %s", task.get("description"), level=logging.DEBUG)
         
         try:
             operation = task.get("parameters", {}).get("operation")
@@ -68,68 +151,123 @@ class PlannerAgent(BaseAgent):
             else:
                 raise ValueError(f"Unknown operation: {operation}")
             
-            self.status = "idle"
             return {
                 "status": "success",
                 "plan": plan,
                 "message": f"Generated plan for {operation} operation"
             }
-        except Exception as e:
-            self.status = "idle"
-            raise e
+        finally:
+            self.task_finished()
     
     async def plan_workflow(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         """Generate a complete task plan for a workflow"""
         operation = payload.get("operation")
         parameters = payload.get("parameters", {})
         
-        self.log(f"Planning workflow for operation: {operation}")
+        self.log("Planning workflow for operation: %s", operation, level=logging.DEBUG)
         
-        tasks = []
-        
-        # Add validation task
-        tasks.append({
-            "task_id": str(uuid.uuid4()),
-            "description": f"Validate {operation} request",
-            "agent_type": "planner",
-            "status": "pending",
-            "priority": 1,
-            "parameters": {
-                "operation": operation,
-                "validation_type": "pre_execution"
-            }
-        })
+        started = time.perf_counter()
+        template = self.get_plan_template(operation, parameters)
+        plan = self._instantiate_plan(template, parameters)
+        PLANNING_SECONDS.observe(time.perf_counter() - started)
+        return plan
+    
+    def get_plan_template(self, operation: Optional[str], parameters: Dict[str, Any]) -> PlanTemplate:
+        """Fetch the compiled template for an (operation, parameter-key shape) pair"""
+        if not self.use_plan_cache:
+            return self._compile_plan_template(operation)
         
-        # Add execution task
-        tasks.append({
-            "task_id": str(uuid.uuid4()),
-            "description": f"Execute {operation} operation",
-            "agent_type": "executor",
-            "status": "pending",
-            "priority": 2,
-            "parameters": {
-                "operation": operation,
-                **parameters
-            }
-        })
+        key = (operation, tuple(sorted(parameters)))
+        template = self._plan_cache.get(key)
+        if template is not None:
+            self.plan_cache_hits += 1
+            self._plan_cache.move_to_end(key)
+            return template
         
-        # Add post-validation task
-        tasks.append({
-            "task_id": str(uuid.uuid4()),
-            "description": f"Validate {operation} result",
-            "agent_type": "validator",
-            "status": "pending",
-            "priority": 3,
-            "parameters": {
-                "operation": operation,
-                "validation_type": "post_execution"
-            }
-        })
+        self.plan_cache_misses += 1
+        template = self._compile_plan_template(operation)
+        self._plan_cache[key] = template
+        if len(self._plan_cache) > self.plan_cache_size:
+            self._plan_cache.popitem(last=False)
+        return template
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Plan template cache counters"""
+        lookups = self.plan_cache_hits + self.plan_cache_misses
+        return {
+            "enabled": self.use_plan_cache,
+            "size": len(self._plan_cache),
+            "capacity": self.plan_cache_size,
+            "hits": self.plan_cache_hits,
+            "misses": self.plan_cache_misses,
+            "hit_rate": self.plan_cache_hits / lookups if lookups else 0.0
+        }
+    
+    @staticmethod
+    def _compile_plan_template(operation: Optional[str]) -> PlanTemplate:
+        """
+        Build the validate -> execute -> validate plan for an operation.
+        Each step depends on the one before it. The plan is a chain with a
+        single executor task, so the orchestrator runs it step by step;
+        concurrent execution only helps plans that fan out executor tasks.
+        """
+        tasks = (
+            # Validation task
+            PlanTaskTemplate(
+                description=f"Validate {operation} request",
+                agent_type="planner",
+                priority=1,
+                static_parameters=(("operation", operation), ("validation_type", "pre_execution")),
+                takes_request_parameters=False
+            ),
+            # Execution task
+            PlanTaskTemplate(
+                description=f"Execute {operation} operation",
+                agent_type="executor",
+                priority=2,
+                static_parameters=(("operation", operation),),
+                takes_request_parameters=True,
+                depends_on=(0,)
+            ),
+            # Post-validation task
+            PlanTaskTemplate(
+                description=f"Validate {operation} result",
+                agent_type="validator",
+                priority=3,
+                static_parameters=(("operation", operation), ("validation_type", "post_execution")),
+                takes_request_parameters=False,
+                depends_on=(1,)
+            )
+        )
+        return PlanTemplate(
+            tasks=tasks,
+            estimated_duration=len(tasks) * 5,  # 5 seconds per task
+            complexity="medium"
+        )
+    
+    @staticmethod
+    def _instantiate_plan(template: PlanTemplate, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """Fill a template with fresh task IDs and the request parameters"""
+        task_ids = [str(uuid.uuid4()) for _ in template.tasks]
+        tasks = []
+        for task_id, spec in zip(task_ids, template.tasks):
+            task_parameters = dict(spec.static_parameters)
+            if spec.takes_request_parameters:
+                task_parameters.update(parameters)
+            tasks.append({
+                "task_id": task_id,
+                "description": spec.description,
+                "agent_type": spec.agent_type,
+                "status": "pending",
+                "priority": spec.priority,
+                "parameters": task_parameters,
+                "depends_on": [task_ids[i] for i in spec.depends_on]
+            })
         
         return {
             "tasks": tasks,
-            "estimated_duration": len(tasks) * 5,  # 5 seconds per task
-            "complexity": "medium"
+            "estimated_duration": template.estimated_duration,
+            "complexity": template.complexity
         }
     
     async def validate_request(self, payload: Dict[str, Any]) -> Dict[str, Any]:
@@ -156,80 +294,16 @@ class PlannerAgent(BaseAgent):
     
     async def _plan_create_customer(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate plan for customer creation"""
-        return [
-            {
-                "step": 1,
-                "action": "validate_customer_data",
-                "description": "Validate customer information"
-            },
-            {
-                "step": 2,
-                "action": "check_duplicate",
-                "description": "Check for duplicate customer"
-            },
-            {
-                "step": 3,
-                "action": "insert_customer",
-                "description": "Insert new customer record"
-            }
-        ]
+        return [dict(step) for step in CREATE_CUSTOMER_STEPS]
     
     async def _plan_update_customer(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate plan for customer update"""
-        return [
-            {
-                "step": 1,
-                "action": "fetch_current_data",
-                "description": "Retrieve current customer data"
-            },
-            {
-                "step": 2,
-                "action": "validate_updates",
-                "description": "Validate update parameters"
-            },
-            {
-                "step": 3,
-                "action": "apply_updates",
-                "description": "Apply updates to customer record"
-            }
-        ]
+        return [dict(step) for step in UPDATE_CUSTOMER_STEPS]
     
     async def _plan_delete_customer(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate plan for customer deletion"""
-        return [
-            {
-                "step": 1,
-                "action": "verify_customer_exists",
-                "description": "Verify customer exists"
-            },
-            {
-                "step": 2,
-                "action": "check_dependencies",
-                "description": "Check for dependent records"
-            },
-            {
-                "step": 3,
-                "action": "delete_customer",
-                "description": "Delete customer record"
-            }
-        ]
+        return [dict(step) for step in DELETE_CUSTOMER_STEPS]
     
     async def _plan_query_customer(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate plan for customer query"""
-        return [
-            {
-                "step": 1,
-                "action": "build_query",
-                "description": "Build database query"
-            },
-            {
-                "step": 2,
-                "action": "execute_query",
-                "description": "Execute query and retrieve data"
-            },
-            {
-                "step": 3,
-                "action": "format_results",
-                "description": "Format and return results"
-            }
-        ]
+        return [dict(step) for step in QUERY_CUSTOMER_STEPS]
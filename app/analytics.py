@@ -0,0 +1,304 @@
+"""
+Customer Analytics
+NumPy column-store snapshot of the customers table for grouped aggregates
+"""
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.database import CustomerDB
+from app.models.customer import CustomerFilters
+import numpy as np
+import pandas as pd
+import time
+
+# Categorical columns stored as integer codes
+DIMENSIONS = ("status", "industry", "country", "subscription_plan", "region", "preferred_category")
+
+# Numeric columns stored as float64 (NaN for missing values)
+MEASURES = ("credit_limit", "total_spent", "total_transactions", "loyalty_points")
+
+AGGREGATIONS = ("count", "sum", "mean", "min", "max", "percentile")
+
+# Largest combined group-by key space counted densely with bincount
+DENSE_GROUP_LIMIT = 1 << 22
+
+# (filter field, measure, comparison) for the range filters of CustomerFilters
+RANGE_FILTERS = (
+    ("min_credit_limit", "credit_limit", np.greater_equal),
+    ("max_credit_limit", "credit_limit", np.less_equal),
+    ("min_total_spent", "total_spent", np.greater_equal),
+    ("max_total_spent", "total_spent", np.less_equal),
+)
+
+
+def _to_measure(value: Any) -> float:
+    """Measure value as stored by load_frame(); NaN when missing or not numeric"""
+    if value is None:
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class CustomerColumnStore:
+    """
+    Column-oriented snapshot of customers.
+    
+    Dimensions are dictionary-encoded into int32 code arrays and measures are
+    float64 arrays, so a group-by is a bincount over codes. Arrays grow by
+    doubling; deleted rows are tombstoned in the alive mask and skipped.
+    Executor writes are applied with apply_upsert()/apply_delete() after commit.
+    """
+    
+    def __init__(self):
+        self.loaded = False
+        self.size = 0
+        self.row_of: Dict[str, int] = {}
+        self.alive = np.zeros(0, dtype=bool)
+        self.codes: Dict[str, np.ndarray] = {name: np.zeros(0, dtype=np.int32) for name in DIMENSIONS}
+        self.categories: Dict[str, List[Any]] = {name: [] for name in DIMENSIONS}
+        self.category_codes: Dict[str, Dict[Any, int]] = {name: {} for name in DIMENSIONS}
+        self.values: Dict[str, np.ndarray] = {name: np.zeros(0) for name in MEASURES}
+        self.loaded_at: Optional[float] = None
+        self.updates_applied = 0
+    
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+    
+    async def load(self, engine: AsyncEngine):
+        """Replace the snapshot with the current contents of the customers table"""
+        started = time.perf_counter()
+        columns = [CustomerDB.mcp_id] + [getattr(CustomerDB, name) for name in DIMENSIONS + MEASURES]
+        async with engine.connect() as conn:
+            df = await conn.run_sync(lambda sync_conn: pd.read_sql(select(*columns), sync_conn))
+        self.load_frame(df)
+        print(f"✓ Analytics snapshot: {self.size} customers in {time.perf_counter() - started:.2f}s")
+    
+    def load_frame(self, df: pd.DataFrame):
+        """Replace the snapshot with a DataFrame holding mcp_id, DIMENSIONS and MEASURES"""
+        size = len(df)
+        self.row_of = {mcp_id: i for i, mcp_id in enumerate(df["mcp_id"].tolist())}
+        self.alive = np.ones(size, dtype=bool)
+        for name in DIMENSIONS:
+            codes, uniques = pd.factorize(df[name], use_na_sentinel=False)
+            self.codes[name] = codes.astype(np.int32)
+            self.categories[name] = [None if pd.isna(v) else v for v in uniques]
+            self.category_codes[name] = {v: i for i, v in enumerate(self.categories[name])}
+        for name in MEASURES:
+            self.values[name] = pd.to_numeric(df[name], errors="coerce").to_numpy(dtype=np.float64)
+        self.size = size
+        self.loaded = True
+        self.loaded_at = time.time()
+    
+    # ------------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------------
+    
+    def _code(self, dimension: str, value: Any) -> int:
+        """Code for a dimension value, adding a new category if needed"""
+        code = self.category_codes[dimension].get(value)
+        if code is None:
+            code = len(self.categories[dimension])
+            self.categories[dimension].append(value)
+            self.category_codes[dimension][value] = code
+        return code
+    
+    def _grow(self):
+        """Double array capacity"""
+        capacity = max(16, len(self.alive) * 2)
+        self.alive = np.resize(self.alive, capacity)
+        self.alive[self.size:] = False
+        for name in DIMENSIONS:
+            self.codes[name] = np.resize(self.codes[name], capacity)
+        for name in MEASURES:
+            self.values[name] = np.resize(self.values[name], capacity)
+    
+    def apply_upsert(self, mcp_id: str, values: Dict[str, Any]):
+        """Apply a committed create or update; columns not in values keep their value"""
+        if not self.loaded:
+            return
+        
+        row = self.row_of.get(mcp_id)
+        if row is None:
+            if self.size == len(self.alive):
+                self._grow()
+            row = self.size
+            self.size += 1
+            self.row_of[mcp_id] = row
+            self.alive[row] = True
+            for name in DIMENSIONS:
+                self.codes[name][row] = self._code(name, values.get(name))
+            for name in MEASURES:
+                self.values[name][row] = np.nan
+        
+        for name in DIMENSIONS:
+            if name in values:
+                self.codes[name][row] = self._code(name, values[name])
+        for name in MEASURES:
+            if name in values:
+                self.values[name][row] = _to_measure(values[name])
+        self.updates_applied += 1
+    
+    def apply_delete(self, mcp_ids: Iterable[str]):
+        """Tombstone committed deletes"""
+        if not self.loaded:
+            return
+        for mcp_id in mcp_ids:
+            row = self.row_of.pop(mcp_id, None)
+            if row is not None:
+                self.alive[row] = False
+                self.updates_applied += 1
+    
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    
+    def _filter_mask(self, filters: Optional[CustomerFilters]) -> np.ndarray:
+        """Rows that are alive and match the filters"""
+        mask = self.alive[:self.size].copy()
+        if filters is None:
+            return mask
+        
+        for name in ("status", "industry", "country", "subscription_plan"):
+            value = getattr(filters, name)
+            if value is not None:
+                code = self.category_codes[name].get(value)
+                if code is None:
+                    return np.zeros(self.size, dtype=bool)
+                mask &= self.codes[name][:self.size] == code
+        
+        for field, measure, compare in RANGE_FILTERS:
+            bound = getattr(filters, field)
+            if bound is not None:
+                mask &= compare(self.values[measure][:self.size], bound)
+        return mask
+    
+    def _group_codes(self, group_by: Tuple[str, ...], mask: np.ndarray) -> Tuple[np.ndarray, List[Tuple[Any, ...]]]:
+        """Dense group ID per selected row, and the dimension values of each group"""
+        if not group_by:
+            return np.zeros(int(mask.sum()), dtype=np.int64), [()]
+        
+        combined = np.zeros(int(mask.sum()), dtype=np.int64)
+        cardinalities = []
+        for name in group_by:
+            cardinality = max(1, len(self.categories[name]))
+            combined = combined * cardinality + self.codes[name][:self.size][mask]
+            cardinalities.append(cardinality)
+        
+        # Compact to the groups that actually occur; bincount avoids a sort
+        # unless the key space is too large to count densely
+        key_space = int(np.prod(cardinalities))
+        if key_space <= DENSE_GROUP_LIMIT:
+            present = np.flatnonzero(np.bincount(combined, minlength=key_space))
+            dense = np.full(key_space, -1, dtype=np.int64)
+            dense[present] = np.arange(len(present))
+            group_ids = dense[combined]
+        else:
+            present, group_ids = np.unique(combined, return_inverse=True)
+        
+        keys = []
+        for remainder in present.tolist():
+            key = []
+            for name, cardinality in zip(reversed(group_by), reversed(cardinalities)):
+                remainder, part = divmod(remainder, cardinality)
+                key.append(self.categories[name][part])
+            keys.append(tuple(reversed(key)))
+        return group_ids, keys
+    
+    def aggregate(
+        self,
+        metric: Optional[str] = None,
+        agg: str = "count",
+        group_by: Iterable[str] = (),
+        filters: Optional[CustomerFilters] = None,
+        q: float = 50.0
+    ) -> Dict[str, Any]:
+        """Grouped aggregate of a measure over the customers matching filters"""
+        group_by = tuple(group_by)
+        unknown = [name for name in group_by if name not in DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Cannot group by: {', '.join(unknown)}")
+        if agg not in AGGREGATIONS:
+            raise ValueError(f"Unknown aggregation: {agg}")
+        if agg != "count" and metric not in MEASURES:
+            raise ValueError(f"Unknown metric: {metric}")
+        if not 0 <= q <= 100:
+            raise ValueError("Percentile must be between 0 and 100")
+        
+        started = time.perf_counter()
+        mask = self._filter_mask(filters)
+        if agg != "count":
+            mask &= ~np.isnan(self.values[metric][:self.size])
+        
+        group_ids, keys = self._group_codes(group_by, mask)
+        counts = np.bincount(group_ids, minlength=len(keys))
+        
+        if agg == "count":
+            results = counts.astype(np.float64)
+        else:
+            values = self.values[metric][:self.size][mask]
+            if agg in ("sum", "mean"):
+                sums = np.bincount(group_ids, weights=values, minlength=len(keys))
+                results = sums if agg == "sum" else sums / np.maximum(counts, 1)
+            else:
+                results = self._ordered_aggregate(group_ids, values, counts, agg, q)
+        
+        groups = [
+            {**dict(zip(group_by, key)), "value": float(value), "count": int(count)}
+            for key, value, count in zip(keys, results.tolist(), counts.tolist())
+            if count
+        ]
+        return {
+            "group_by": list(group_by),
+            "metric": metric,
+            "agg": agg,
+            "rows": int(mask.sum()),
+            "groups": groups,
+            "elapsed_ms": (time.perf_counter() - started) * 1000
+        }
+    
+    @staticmethod
+    def _ordered_aggregate(
+        group_ids: np.ndarray,
+        values: np.ndarray,
+        counts: np.ndarray,
+        agg: str,
+        q: float
+    ) -> np.ndarray:
+        """min/max/percentile per group over values laid out group by group"""
+        results = np.zeros(len(counts))
+        if not len(values):
+            return results
+        
+        # Stable sort of small integer keys is a radix sort
+        key_dtype = np.int16 if len(counts) <= np.iinfo(np.int16).max else np.int64
+        grouped = values[np.argsort(group_ids.astype(key_dtype), kind="stable")]
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        nonempty = counts > 0
+        
+        if agg == "min":
+            results[nonempty] = np.minimum.reduceat(grouped, starts[nonempty])
+        elif agg == "max":
+            results[nonempty] = np.maximum.reduceat(grouped, starts[nonempty])
+        else:
+            for group in np.flatnonzero(nonempty).tolist():
+                start = starts[group]
+                results[group] = np.percentile(grouped[start:start + counts[group]], q)
+        return results
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot size and freshness"""
+        return {
+            "loaded": self.loaded,
+            "customers": len(self.row_of),
+            "rows_allocated": len(self.alive),
+            "updates_applied": self.updates_applied,
+            "loaded_at": self.loaded_at,
+            "dimensions": {name: len(self.categories[name]) for name in DIMENSIONS}
+        }
+
+
+# Global column store instance
+customer_analytics = CustomerColumnStore()
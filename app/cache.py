@@ -0,0 +1,114 @@
+"""
+Customer Cache
+In-process read-through cache of customer profiles keyed by mcp_id
+"""
+from typing import Dict, Any, Iterable, Optional
+from collections import OrderedDict
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.database import CustomerDB
+from app.queries import profile_query
+import time
+
+
+class CustomerCache:
+    """
+    LRU cache of customer profiles with a per-entry TTL.
+    
+    Writers call invalidate() after committing. Every invalidation bumps a
+    generation counter; a reader that started its database read before an
+    invalidation does not store its (possibly stale) result.
+    """
+    
+    def __init__(self, max_size: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        self.max_size = max_size if max_size is not None else settings.CUSTOMER_CACHE_SIZE
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.CUSTOMER_CACHE_TTL_SECONDS
+        
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # mcp_id -> (expires_at, profile)
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+    
+    def get(self, mcp_id: str) -> Optional[Dict[str, Any]]:
+        """Cached profile, or None on a miss or expired entry"""
+        entry = self._entries.get(mcp_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        expires_at, profile = entry
+        if expires_at <= time.monotonic():
+            del self._entries[mcp_id]
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(mcp_id)
+        self.hits += 1
+        return profile
+    
+    def set(self, mcp_id: str, profile: Dict[str, Any], generation: Optional[int] = None):
+        """Store a profile unless an invalidation happened since generation was read"""
+        if self.max_size <= 0:
+            return
+        if generation is not None and generation != self.generation:
+            return
+        
+        self._entries[mcp_id] = (time.monotonic() + self.ttl_seconds, profile)
+        self._entries.move_to_end(mcp_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def invalidate(self, mcp_ids: Iterable[str]):
+        """Drop cached profiles for customers that were written"""
+        self.generation += 1
+        for mcp_id in mcp_ids:
+            self.invalidations += 1
+            self._entries.pop(mcp_id, None)
+    
+    def clear(self):
+        """Drop every cached profile"""
+        self.generation += 1
+        self._entries.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache size and hit-rate statistics"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
+    
+    async def get_profile(
+        self,
+        session: AsyncSession,
+        mcp_id: str,
+        bypass: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Read-through lookup; bypass skips the cached copy but still refreshes it"""
+        if not bypass:
+            profile = self.get(mcp_id)
+            if profile is not None:
+                return profile
+        
+        generation = self.generation
+        result = await session.execute(profile_query().where(CustomerDB.mcp_id == mcp_id))
+        row = result.mappings().first()
+        if row is None:
+            return None
+        
+        profile = dict(row)
+        self.set(mcp_id, profile, generation)
+        return profile
+
+
+# Global cache instance
+customer_cache = CustomerCache()
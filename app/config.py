@@ -20,14 +20,65 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = "sqlite+aiosqlite:///./mcp_database.db"
+    DB_PROFILE: str = "production"  # production (WAL, single writer + read pool) | default
+    DB_ECHO: bool = False  # log every SQL statement
+    DB_READ_POOL_SIZE: int = 5
+    DB_BUSY_TIMEOUT_MS: int = 5000
+    DB_CACHE_SIZE_KB: int = 65536
+    DB_MMAP_SIZE: int = 268435456  # 256 MiB
+    
+    # Group commit for single-operation executor writes
+    WRITE_COORDINATOR_ENABLED: bool = True
+    WRITE_BATCH_MAX_SIZE: int = 256
+    WRITE_BATCH_MAX_DELAY_MS: float = 2.0
+    
+    # Logging
+    LOG_LEVEL: str = "INFO"  # DEBUG logs every workflow step
+    LOG_FORMAT: str = "text"  # text | json
+    LOG_SAMPLE_RATE: float = 1.0  # fraction of workflows whose DEBUG/INFO lines are kept
+    
+    # Metrics
+    METRICS_ENABLED: bool = True  # serve /metrics and time every DB statement
+    
+    # Tracing
+    TRACING_ENABLED: bool = True
+    TRACE_MAX_WORKFLOWS: int = 1000  # most recent workflow traces kept in memory
+    TRACE_MAX_SPANS: int = 256  # spans kept per trace
+    
+    # Data Ingestion
+    CSV_PATH: str = "mcp_dataset.csv"
+    CSV_CHUNK_SIZE: int = 10000
+    CSV_INGEST_MODE: str = "bulk"  # bulk | streaming
+    
+    # Customer Cache
+    CUSTOMER_CACHE_SIZE: int = 10000  # 0 disables caching
+    CUSTOMER_CACHE_TTL_SECONDS: float = 300
+    
+    # Analytics
+    ANALYTICS_ENABLED: bool = True  # load the column store on startup
+    
+    # Customer Export
+    EXPORT_BATCH_SIZE: int = 1000  # rows fetched and sent per chunk
     
     # Agent Configuration
     MAX_AGENTS: int = 10
     AGENT_TIMEOUT: int = 300
+    PLAN_CACHE_SIZE: int = 256
+    AGENT_MESSAGE_HISTORY_SIZE: int = 1000  # recent messages kept per agent
+    AGENT_MESSAGE_SPILL_DIR: str = ""  # if set, evicted messages are appended to <dir>/<agent_id>.jsonl
     
     # Orchestrator Settings
-    MAX_CONCURRENT_WORKFLOWS: int = 5
+    MAX_CONCURRENT_WORKFLOWS: int = 5  # number of workflow workers
+    WORKFLOW_QUEUE_SIZE: int = 1000
+    WORKFLOW_TASK_CONCURRENCY: int = 4  # ready tasks of one workflow run at once
+    WORKFLOW_BATCH_MAX_SIZE: int = 10000
     WORKFLOW_RETENTION_DAYS: int = 30
+    WORKFLOW_MAX_IN_MEMORY: int = 10000  # finished workflows kept in memory
+    WORKFLOW_MEMORY_TTL_SECONDS: int = 3600
+    WORKFLOW_SWEEP_INTERVAL_SECONDS: int = 60
+    WORKFLOW_FLUSH_INTERVAL_SECONDS: float = 0.5
+    WORKFLOW_FLUSH_BATCH_SIZE: int = 200
+    SHUTDOWN_TIMEOUT_SECONDS: float = 10.0  # longest wait for background tasks to stop
     
     class Config:
         env_file = ".env"
@@ -2,13 +2,21 @@
 Database Module
 Handles all database operations for the MCP system
 """
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy import Column, String, Float, Integer, JSON, DateTime, Text
+from sqlalchemy import Column, String, Float, Integer, Boolean, JSON, DateTime, Text, Index, bindparam, insert, select, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Row
 from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, Optional
 from app.config import settings
+from app.metrics import DB_STATEMENT_SECONDS
+from app.tracing import tracer
 import pandas as pd
 import json
+import time
 
 
 class Base(DeclarativeBase):
@@ -40,6 +48,19 @@ class CustomerDB(Base):
     loyalty_points = Column(Integer, default=0)
     data = Column(JSON)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Composite indexes backing the list/export filters
+    __table_args__ = (
+        Index("ix_customers_status_industry", "status", "industry"),
+        Index("ix_customers_status_plan", "status", "subscription_plan"),
+        Index("ix_customers_country_status", "country", "status"),
+        Index("ix_customers_status_credit_limit", "status", "credit_limit"),
+        Index("ix_customers_status_total_spent", "status", "total_spent"),
+        # Filters that don't include status or country
+        Index("ix_customers_plan_credit_limit", "subscription_plan", "credit_limit"),
+        Index("ix_customers_credit_limit", "credit_limit"),
+        Index("ix_customers_total_spent", "total_spent"),
+    )
 
 
 class WorkflowDB(Base):
@@ -59,78 +80,344 @@ class WorkflowDB(Base):
     error = Column(Text, nullable=True)
 
 
-# Create async engine
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    future=True
-)
+class IngestProgressDB(Base):
+    """SQLAlchemy model for CSV ingestion checkpoints"""
+    __tablename__ = "ingest_progress"
+    
+    source = Column(String, primary_key=True)
+    rows_committed = Column(Integer, default=0)
+    last_mcp_id = Column(String, nullable=True)
+    completed = Column(Boolean, default=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+# PRAGMAs applied to every new SQLite connection, per DB_PROFILE
+SQLITE_PROFILES: Dict[str, Dict[str, Any]] = {
+    # Stock SQLite: rollback journal, full fsync, one engine for everything
+    "default": {},
+    # WAL lets readers run alongside the writer; NORMAL sync is durable under WAL
+    # except for the last transactions on power loss
+    "production": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": settings.DB_BUSY_TIMEOUT_MS,
+        "cache_size": -settings.DB_CACHE_SIZE_KB,  # negative = KiB
+        "mmap_size": settings.DB_MMAP_SIZE,
+        "temp_store": "MEMORY"
+    }
+}
+
+
+def _is_sqlite_file(url: str) -> bool:
+    """Whether url points at an on-disk SQLite database"""
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database not in (None, "", ":memory:")
+
+
+def _set_pragmas(engine: AsyncEngine, pragmas: Dict[str, Any]):
+    """Run the PRAGMAs on each connection the engine opens"""
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def _time_statements(engine: AsyncEngine, label: str):
+    """Record every statement's latency in the DB statement histogram and the active trace"""
+    series = DB_STATEMENT_SECONDS.labels(label) if settings.METRICS_ENABLED else None
+    
+    # The start time lives on the execution context, which is discarded with the
+    # statement; after_cursor_execute does not fire for a statement that fails
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._statement_started = time.perf_counter()
+    
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def stop_timer(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_statement_started", None)
+        if started is None:
+            return
+        ended = time.perf_counter()
+        if series is not None:
+            series.observe(ended - started)
+        tracer.record("db.statement", started, ended, engine=label, sql=statement[:200], executemany=executemany)
+
+
+def create_db_engine(
+    url: Optional[str] = None,
+    profile: Optional[str] = None,
+    pool_size: Optional[int] = None,
+    read_only: bool = False
+) -> AsyncEngine:
+    """
+    Create an engine configured for a DB profile.
+    pool_size keeps that many pooled connections (no overflow); without it
+    the driver default is used (NullPool for aiosqlite files).
+    """
+    url = url or settings.DATABASE_URL
+    profile = profile or settings.DB_PROFILE
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Unknown DB profile: {profile}")
+    
+    options: Dict[str, Any] = {"echo": settings.DB_ECHO, "future": True}
+    if pool_size:
+        options.update(poolclass=AsyncAdaptedQueuePool, pool_size=pool_size, max_overflow=0)
+    db_engine = create_async_engine(url, **options)
+    
+    if make_url(url).get_backend_name() == "sqlite":
+        pragmas = dict(SQLITE_PROFILES[profile])
+        if read_only and pragmas:
+            pragmas["query_only"] = "ON"
+        if pragmas:
+            _set_pragmas(db_engine, pragmas)
+    if settings.METRICS_ENABLED or settings.TRACING_ENABLED:
+        _time_statements(db_engine, "read" if read_only else "write")
+    return db_engine
 
-# Create async session factory
+
+def create_engines(url: Optional[str] = None, profile: Optional[str] = None):
+    """
+    Writer and reader engines for a profile.
+    The production profile on a SQLite file funnels writes through one pooled
+    connection, so in-process writers queue instead of failing with
+    "database is locked", and serves reads from a separate pool under WAL.
+    Otherwise both are the same engine.
+    """
+    url = url or settings.DATABASE_URL
+    profile = profile or settings.DB_PROFILE
+    if profile == "production" and _is_sqlite_file(url):
+        writer = create_db_engine(url, profile, pool_size=1)
+        reader = create_db_engine(url, profile, pool_size=settings.DB_READ_POOL_SIZE, read_only=True)
+        return writer, reader
+    
+    db_engine = create_db_engine(url, profile)
+    return db_engine, db_engine
+
+
+# Create async engines (writer, and reader for read-only endpoints)
+engine, read_engine = create_engines()
+
+# Create async session factories
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
     expire_on_commit=False
 )
 
+ReadSessionLocal = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False
+)
+
 
 async def init_db():
     """Initialize database and create tables"""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        # create_all skips indexes on tables that already exist
+        for index in CustomerDB.__table__.indexes:
+            await conn.run_sync(index.create, checkfirst=True)
     print("✓ Database initialized successfully")
 
 
-async def load_csv_data():
-    """Load data from CSV into database"""
+# Column layout of mcp_dataset.csv, coerced once per column on load
+CSV_TEXT_COLUMNS = [
+    "mcp_id", "customer_name", "email", "phone", "kyc_date", "status",
+    "region", "industry", "country", "zip_code", "subscription_plan",
+    "signup_date", "last_login", "preferred_category", "data"
+]
+CSV_FLOAT_COLUMNS = ["credit_limit", "total_spent"]
+CSV_INT_COLUMNS = ["total_transactions", "loyalty_points"]
+
+
+CSV_COLUMNS = CSV_TEXT_COLUMNS + CSV_FLOAT_COLUMNS + CSV_INT_COLUMNS
+
+
+def _encode_data_value(value) -> str:
+    """Normalise a single raw value from the data column to JSON text"""
     try:
-        # Read CSV file
-        df = pd.read_csv("mcp_dataset.csv")
+        parsed = json.loads(value)
+    except (TypeError, ValueError):
+        parsed = {"raw": str(value)}
+    return json.dumps(parsed)
+
+
+def _encode_data_column(series: pd.Series) -> pd.Series:
+    """
+    Parse the JSON data column.
+    Each distinct string is decoded once and mapped back onto the column,
+    which is far cheaper than decoding row by row for low-cardinality metadata.
+    """
+    encoded = {value: _encode_data_value(value) for value in series.dropna().unique()}
+    return series.map(encoded)
+
+
+def prepare_customer_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Coerce a raw CSV frame into insert-ready customer columns"""
+    df = df[CSV_COLUMNS].copy()
+    for column in CSV_FLOAT_COLUMNS:
+        df[column] = pd.to_numeric(df[column], errors="coerce").fillna(0.0)
+    for column in CSV_INT_COLUMNS:
+        df[column] = pd.to_numeric(df[column], errors="coerce").fillna(0).astype("int64")
+    df["data"] = _encode_data_column(df["data"])
+    # Missing text values become NULL rather than the string "nan"
+    return df.astype(object).where(df.notna(), None)
+
+
+async def bulk_insert_customers(conn, df: pd.DataFrame, chunk_size: int) -> int:
+    """
+    Insert a prepared customer frame in executemany chunks on an open connection.
+    The data column is already JSON text, so it is bound as Text rather than
+    encoded a second time by the JSON type.
+    """
+    stmt = insert(CustomerDB.__table__).values(
+        data=bindparam("data", type_=Text),
+        updated_at=datetime.utcnow()
+    )
+    columns = list(df.columns)
+    
+    inserted = 0
+    for offset in range(0, len(df), chunk_size):
+        chunk = df.iloc[offset:offset + chunk_size]
+        rows = [dict(zip(columns, row)) for row in chunk.itertuples(index=False, name=None)]
+        await conn.execute(stmt, rows)
+        inserted += len(rows)
+    return inserted
+
+
+def _read_csv(csv_path: str, **options):
+    """Read the customer CSV with text columns kept as strings"""
+    return pd.read_csv(
+        csv_path,
+        dtype={column: str for column in CSV_TEXT_COLUMNS},
+        keep_default_na=False,
+        na_values=[""],
+        **options
+    )
+
+
+def iter_csv_chunks(csv_path: str, chunk_size: int, skip_rows: int = 0) -> Iterator[pd.DataFrame]:
+    """Read stage: yield raw frames of at most chunk_size rows, skipping already-loaded rows"""
+    skiprows = range(1, skip_rows + 1) if skip_rows else None
+    with _read_csv(csv_path, chunksize=chunk_size, skiprows=skiprows) as reader:
+        for chunk in reader:
+            yield chunk
+
+
+def iter_prepared_chunks(chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+    """Parse stage: coerce each raw frame into insert-ready columns"""
+    for chunk in chunks:
+        yield prepare_customer_frame(chunk)
+
+
+async def _get_ingest_progress(conn, source: str) -> Optional[Row]:
+    """Fetch the ingestion checkpoint for a source file, if any"""
+    result = await conn.execute(
+        select(IngestProgressDB.__table__).where(IngestProgressDB.source == source)
+    )
+    return result.first()
+
+
+async def _save_ingest_progress(
+    conn,
+    source: str,
+    rows_committed: int,
+    last_mcp_id: Optional[str],
+    completed: bool
+):
+    """Upsert the ingestion checkpoint inside the caller's transaction"""
+    values = {
+        "rows_committed": rows_committed,
+        "last_mcp_id": last_mcp_id,
+        "completed": completed,
+        "updated_at": datetime.utcnow()
+    }
+    stmt = sqlite_insert(IngestProgressDB).values(source=source, **values)
+    await conn.execute(
+        stmt.on_conflict_do_update(index_elements=["source"], set_=values)
+    )
+
+
+async def _load_csv_bulk(csv_path: str, chunk_size: int) -> int:
+    """Load the whole file in a single transaction"""
+    async with engine.begin() as conn:
+        df = prepare_customer_frame(_read_csv(csv_path))
         
-        async with AsyncSessionLocal() as session:
-            # Check if data already exists
-            from sqlalchemy import select
-            result = await session.execute(select(CustomerDB).limit(1))
-            if result.scalar_one_or_none():
-                print("✓ Database already populated")
-                return
-            
-            # Process and insert data
-            for _, row in df.iterrows():
-                # Parse the data column if it's a string
-                data_value = row.get('data')
-                if pd.notna(data_value) and isinstance(data_value, str):
-                    try:
-                        data_value = json.loads(data_value)
-                    except:
-                        data_value = {"raw": str(data_value)}
-                
-                customer = CustomerDB(
-                    mcp_id=row['mcp_id'],
-                    customer_name=row['customer_name'],
-                    email=row['email'],
-                    phone=str(row['phone']),
-                    credit_limit=float(row['credit_limit']),
-                    kyc_date=str(row['kyc_date']),
-                    status=row['status'],
-                    region=row['region'],
-                    industry=row['industry'],
-                    country=row['country'],
-                    zip_code=str(row['zip_code']),
-                    subscription_plan=row['subscription_plan'],
-                    signup_date=str(row['signup_date']),
-                    last_login=str(row['last_login']),
-                    total_transactions=int(row['total_transactions']),
-                    total_spent=float(row['total_spent']),
-                    preferred_category=row['preferred_category'],
-                    loyalty_points=int(row['loyalty_points']),
-                    data=data_value
-                )
-                session.add(customer)
-            
-            await session.commit()
-            print(f"✓ Loaded {len(df)} customers from CSV")
-            
+        # All chunks share one transaction so a failed load leaves no partial data
+        inserted = await bulk_insert_customers(conn, df, chunk_size)
+        last_mcp_id = df["mcp_id"].iloc[-1] if inserted else None
+        await _save_ingest_progress(conn, csv_path, inserted, last_mcp_id, completed=True)
+    return inserted
+
+
+async def _load_csv_streaming(csv_path: str, chunk_size: int, skip_rows: int = 0) -> int:
+    """
+    Load the file chunk by chunk, committing each chunk together with its checkpoint.
+    Peak memory is bounded by chunk_size, and a crashed load resumes after
+    the last committed chunk.
+    """
+    rows_committed = skip_rows
+    last_mcp_id = None
+    
+    for df in iter_prepared_chunks(iter_csv_chunks(csv_path, chunk_size, skip_rows)):
+        async with engine.begin() as conn:
+            await bulk_insert_customers(conn, df, chunk_size)
+            rows_committed += len(df)
+            last_mcp_id = df["mcp_id"].iloc[-1]
+            await _save_ingest_progress(conn, csv_path, rows_committed, last_mcp_id, completed=False)
+    
+    async with engine.begin() as conn:
+        await _save_ingest_progress(conn, csv_path, rows_committed, last_mcp_id, completed=True)
+    return rows_committed - skip_rows
+
+
+async def load_csv_data(
+    csv_path: Optional[str] = None,
+    chunk_size: Optional[int] = None,
+    mode: Optional[str] = None
+):
+    """
+    Load data from CSV into database
+    
+    Modes:
+    - bulk: read the whole file and insert it in one transaction
+    - streaming: read, parse and commit one chunk at a time with resumable progress
+    """
+    csv_path = csv_path or settings.CSV_PATH
+    chunk_size = chunk_size or settings.CSV_CHUNK_SIZE
+    mode = mode or settings.CSV_INGEST_MODE
+    
+    try:
+        async with engine.connect() as conn:
+            progress = await _get_ingest_progress(conn, csv_path)
+            # Databases populated before checkpoints existed have customers but no progress row
+            result = await conn.execute(select(CustomerDB.mcp_id).limit(1))
+            populated = result.first() is not None
+        
+        if (progress and progress.completed) or (populated and not progress):
+            print("✓ Database already populated")
+            return
+        
+        started = time.perf_counter()
+        if progress:
+            # An interrupted streaming load can only be finished by streaming
+            print(f"↻ Resuming CSV load after {progress.last_mcp_id} ({progress.rows_committed} rows committed)")
+            inserted = await _load_csv_streaming(csv_path, chunk_size, progress.rows_committed)
+        elif mode == "streaming":
+            inserted = await _load_csv_streaming(csv_path, chunk_size)
+        elif mode == "bulk":
+            inserted = await _load_csv_bulk(csv_path, chunk_size)
+        else:
+            raise ValueError(f"Unknown CSV ingest mode: {mode}")
+        
+        elapsed = time.perf_counter() - started
+        rate = inserted / elapsed if elapsed > 0 else float(inserted)
+        print(f"✓ Loaded {inserted} customers from CSV in {elapsed:.2f}s ({rate:,.0f} rows/sec)")
+    
     except Exception as e:
         print(f"✗ Error loading CSV data: {e}")
 
@@ -142,3 +429,12 @@ async def get_db():
             yield session
         finally:
             await session.close()
+
+
+async def get_read_db():
+    """Dependency for getting a read-only database session"""
+    async with ReadSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
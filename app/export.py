@@ -0,0 +1,68 @@
+"""
+Customer Export
+Streams the customer table as NDJSON or CSV from a server-side cursor
+"""
+from typing import Any, AsyncIterator, Tuple
+from sqlalchemy import Column
+from sqlalchemy.sql import Select
+from app.config import settings
+from app.database import ReadSessionLocal
+from app.responses import dumps
+import csv
+import io
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv"
+}
+
+
+async def stream_rows(stmt: Select, batch_size: int) -> AsyncIterator[list]:
+    """
+    Yield result rows in batches of batch_size.
+    Opens its own session: the request's session is closed before a
+    streaming response body is sent.
+    """
+    async with ReadSessionLocal() as session:
+        result = await session.stream(stmt.execution_options(yield_per=batch_size))
+        async for rows in result.partitions():
+            yield rows
+
+
+async def export_ndjson(stmt: Select, columns: Tuple[Column, ...], batch_size: int) -> AsyncIterator[bytes]:
+    """One JSON object per line"""
+    names = [column.name for column in columns]
+    async for rows in stream_rows(stmt, batch_size):
+        yield b"".join(dumps(dict(zip(names, row))) + b"\n" for row in rows)
+
+
+def _csv_value(value: Any) -> Any:
+    """CSV cell for a column value; JSON columns are written as JSON text"""
+    if isinstance(value, (dict, list)):
+        return dumps(value).decode()
+    return value
+
+
+async def export_csv(stmt: Select, columns: Tuple[Column, ...], batch_size: int) -> AsyncIterator[bytes]:
+    """Header row followed by one row per customer"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    
+    writer.writerow([column.name for column in columns])
+    async for rows in stream_rows(stmt, batch_size):
+        writer.writerows([_csv_value(value) for value in row] for row in rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    
+    # Header alone when nothing matched
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def export_customers(stmt: Select, columns: Tuple[Column, ...], fmt: str) -> AsyncIterator[bytes]:
+    """Byte stream of the selected customers in the requested format"""
+    batch_size = settings.EXPORT_BATCH_SIZE
+    if fmt == "csv":
+        return export_csv(stmt, columns, batch_size)
+    return export_ndjson(stmt, columns, batch_size)
@@ -0,0 +1,164 @@
+"""
+Logging
+Structured, leveled logging with a queue-backed handler and workflow correlation IDs
+"""
+from typing import Any, Dict, Optional, TextIO
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from app.config import settings
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+import zlib
+
+ROOT_LOGGER = "mcp"
+
+# Workflow being processed by the current task; stamped on every record
+current_workflow_id: ContextVar[Optional[str]] = ContextVar("current_workflow_id", default=None)
+
+_listener: Optional[QueueListener] = None
+_configured = False
+
+
+@contextmanager
+def workflow_context(workflow_id: Optional[str]):
+    """Attach workflow_id to every log record emitted inside the block"""
+    token = current_workflow_id.set(workflow_id)
+    try:
+        yield
+    finally:
+        current_workflow_id.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """
+    Stamp the correlation ID and sample hot-path records.
+    Records below WARNING are kept at sample_rate; sampling is keyed on the
+    workflow ID so a sampled workflow keeps all of its lines.
+    """
+    
+    def __init__(self, sample_rate: float = 1.0):
+        super().__init__()
+        self.sample_rate = sample_rate
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        workflow_id = current_workflow_id.get()
+        record.workflow_id = workflow_id
+        if self.sample_rate >= 1.0 or record.levelno >= logging.WARNING:
+            return True
+        if workflow_id is None:
+            return random.random() < self.sample_rate
+        return zlib.crc32(workflow_id.encode()) % 10000 < self.sample_rate * 10000
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Queue handler that leaves formatting to the listener thread.
+    Only the %-interpolation of the message happens on the caller's thread,
+    so later mutation of the arguments cannot change what is logged.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class TextFormatter(logging.Formatter):
+    """[timestamp] level [logger:agent] [wf:workflow] message"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        timestamp = datetime.utcfromtimestamp(record.created).isoformat()
+        source = record.name
+        if getattr(record, "agent_id", None):
+            source += f":{record.agent_id}"
+        workflow = f" [wf:{record.workflow_id}]" if getattr(record, "workflow_id", None) else ""
+        line = f"[{timestamp}] {record.levelname:<7} [{source}]{workflow} {record.getMessage()}"
+        if record.exc_text:
+            line += "\n" + record.exc_text
+        return line
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per record"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": datetime.utcfromtimestamp(record.created).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        for key in ("workflow_id", "agent_id"):
+            value = getattr(record, key, None)
+            if value is not None:
+                entry[key] = value
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+def configure_logging(
+    level: Optional[str] = None,
+    fmt: Optional[str] = None,
+    sample_rate: Optional[float] = None,
+    stream: Optional[TextIO] = None,
+    queued: bool = True
+):
+    """
+    (Re)configure the mcp logger tree.
+    With queued=True records are handed to a QueueListener thread that formats
+    and writes them, so the event loop never blocks on the output stream.
+    """
+    global _listener, _configured
+    stop_logging()
+    
+    level = (level or settings.LOG_LEVEL).upper()
+    fmt = fmt or settings.LOG_FORMAT
+    sample_rate = settings.LOG_SAMPLE_RATE if sample_rate is None else sample_rate
+    
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JSONFormatter() if fmt == "json" else TextFormatter())
+    
+    if queued:
+        records: queue.SimpleQueue = queue.SimpleQueue()
+        handler: logging.Handler = DeferredQueueHandler(records)
+        _listener = QueueListener(records, output)
+        _listener.start()
+    else:
+        handler = output
+    handler.addFilter(ContextFilter(sample_rate))
+    
+    root = logging.getLogger(ROOT_LOGGER)
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
+    root.propagate = False
+    _configured = True
+
+
+def stop_logging():
+    """Write out queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger under the mcp tree, configuring logging on first use"""
+    if not _configured:
+        configure_logging()
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,223 @@
+"""
+Metrics
+In-process counters and histograms rendered in Prometheus text format
+"""
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence, Tuple
+from bisect import bisect_left
+import math
+
+# Latency buckets in seconds, 0.5 ms up to 10 s
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+def _format_value(value: float) -> str:
+    """Prometheus sample value"""
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(pairs: Sequence[Tuple[str, str]]) -> str:
+    """Render a label set as {name="value",...}"""
+    if not pairs:
+        return ""
+    escaped = (
+        (name, str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'))
+        for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+class _CounterChild:
+    """One labelled counter series"""
+    
+    __slots__ = ("value",)
+    
+    def __init__(self):
+        self.value = 0.0
+    
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+
+class _HistogramChild:
+    """
+    One labelled histogram series.
+    observe() only bumps one bucket; cumulative counts are built at render time.
+    """
+    
+    __slots__ = ("bounds", "counts", "sum")
+    
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+    
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+
+class _Metric(ABC):
+    """Base for a named metric family with optional labels"""
+    
+    kind = ""
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        if not self.labelnames:
+            self._children[()] = self._new_child()
+    
+    @abstractmethod
+    def _new_child(self):
+        """
+        Create the series for one label combination.
+        Must be implemented by all metric kinds.
+        """
+        pass
+    
+    def labels(self, *values):
+        """Series for one label combination, created on first use"""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            child = self._children[values] = self._new_child()
+        return child
+    
+    def _label_pairs(self, values: Tuple[str, ...]) -> List[Tuple[str, str]]:
+        return list(zip(self.labelnames, values))
+    
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in list(self._children.items()):
+            lines.extend(self._render_child(self._label_pairs(values), child))
+        return lines
+    
+    @abstractmethod
+    def _render_child(self, pairs, child) -> List[str]:
+        """
+        Exposition lines for one series.
+        Must be implemented by all metric kinds.
+        """
+        pass
+
+
+class Counter(_Metric):
+    """Monotonic counter"""
+    
+    kind = "counter"
+    
+    def _new_child(self):
+        return _CounterChild()
+    
+    def inc(self, amount: float = 1.0):
+        """Increment the unlabelled series"""
+        self._children[()].inc(amount)
+    
+    def _render_child(self, pairs, child) -> List[str]:
+        return [f"{self.name}{_format_labels(pairs)} {_format_value(child.value)}"]
+
+
+class Histogram(_Metric):
+    """Histogram with fixed upper bounds"""
+    
+    kind = "histogram"
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+    
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+    
+    def observe(self, value: float):
+        """Record a value on the unlabelled series"""
+        self._children[()].observe(value)
+    
+    def _render_child(self, pairs, child) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (math.inf,), child.counts):
+            cumulative += count
+            labels = _format_labels(pairs + [("le", _format_value(bound))])
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(pairs)
+        lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metric families rendered together for a scrape"""
+    
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+    
+    def register(self, metric: _Metric) -> _Metric:
+        """Add a metric family; names must be unique"""
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+    
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Create and register a counter"""
+        return self.register(Counter(name, documentation, labelnames))
+    
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Optional[Sequence[float]] = None
+    ) -> Histogram:
+        """Create and register a histogram"""
+        return self.register(Histogram(name, documentation, labelnames, buckets or LATENCY_BUCKETS))
+    
+    def render(self) -> str:
+        """Every metric in Prometheus text exposition format"""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# ----------------------------------------------------------------------------
+# Application metrics
+# ----------------------------------------------------------------------------
+
+registry = MetricsRegistry()
+
+PLANNING_SECONDS = registry.histogram(
+    "mcp_planning_seconds", "Time to generate a workflow plan"
+)
+TASK_SECONDS = registry.histogram(
+    "mcp_task_seconds", "Task execution time by agent type", ["agent_type"]
+)
+DB_STATEMENT_SECONDS = registry.histogram(
+    "mcp_db_statement_seconds", "Database statement latency by engine", ["engine"]
+)
+QUEUE_WAIT_SECONDS = registry.histogram(
+    "mcp_queue_wait_seconds", "Time a workflow or batch waited in the work queue"
+)
+WORKFLOW_SECONDS = registry.histogram(
+    "mcp_workflow_seconds", "Workflow end-to-end latency from creation to terminal status", ["status"]
+)
+WORKFLOWS_TOTAL = registry.counter(
+    "mcp_workflows_total", "Workflows that reached a terminal status", ["status"]
+)
@@ -2,16 +2,20 @@
 Data Models Module
 Contains all Pydantic and SQLAlchemy models
 """
-from .customer import Customer, CustomerCreate, CustomerUpdate
+from .customer import Customer, CustomerCreate, CustomerUpdate, CustomerPage, CustomerFilters
 from .workflow import WorkflowState, WorkflowStatus
-from .message import AgentMessage, MessageType
+from .message import AgentMessage, MessageType, InternalMessage, InternalResponse
 
 __all__ = [
     "Customer",
     "CustomerCreate", 
     "CustomerUpdate",
+    "CustomerPage",
+    "CustomerFilters",
     "WorkflowState",
     "WorkflowStatus",
     "AgentMessage",
-    "MessageType"
+    "MessageType",
+    "InternalMessage",
+    "InternalResponse"
 ]
@@ -3,7 +3,7 @@ Customer Profile Models
 Represents the Master Customer Profile (MCP) data structure
 """
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 from enum import Enum
 
@@ -70,6 +70,24 @@ class Customer(BaseModel):
         }
 
 
+class CustomerPage(BaseModel):
+    """One page of customers from cursor pagination"""
+    items: List[Customer] = Field(..., description="Customers on this page")
+    next_cursor: Optional[str] = Field(default=None, description="Cursor for the next page; None on the last page")
+
+
+class CustomerFilters(BaseModel):
+    """Filters for customer list and export endpoints (query parameters)"""
+    status: Optional[str] = None
+    industry: Optional[str] = None
+    country: Optional[str] = None
+    subscription_plan: Optional[str] = None
+    min_credit_limit: Optional[float] = None
+    max_credit_limit: Optional[float] = None
+    min_total_spent: Optional[float] = None
+    max_total_spent: Optional[float] = None
+
+
 class CustomerCreate(BaseModel):
     """Data required to create a new customer"""
     customer_name: str
@@ -3,9 +3,11 @@ Agent Communication Protocol (ACL)
 Standard JSON format for inter-agent communication
 """
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Union
 from datetime import datetime
 from enum import Enum
+import itertools
+import time
 import uuid
 
 
@@ -87,13 +89,6 @@ class AgentMessage(BaseModel):
         }
 
 
-class MessageBatch(BaseModel):
-    """Batch of messages for bulk operations"""
-    batch_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    messages: List[AgentMessage]
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-
-
 class MessageResponse(BaseModel):
     """Standard response to a message"""
     success: bool
@@ -101,3 +96,118 @@ class MessageResponse(BaseModel):
     result: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
     timestamp: datetime = Field(default_factory=datetime.utcnow)
+
+
+# ----------------------------------------------------------------------------
+# Internal hot-path messages
+# ----------------------------------------------------------------------------
+
+_internal_ids = itertools.count(1)
+
+
+class InternalMessage:
+    """
+    Lightweight in-process counterpart of AgentMessage.
+    
+    Carries only what agents read on the hot path and skips validation, UUID
+    generation and datetime construction. Call to_acl() to get the full ACL
+    message when it crosses a process boundary or is logged.
+    """
+    
+    __slots__ = (
+        "message_type", "sender_id", "sender_type", "receiver_id", "receiver_type",
+        "workflow_id", "task_id", "action", "payload", "in_reply_to",
+        "seq", "created_at"
+    )
+    
+    def __init__(
+        self,
+        message_type: MessageType,
+        sender_id: str,
+        sender_type: str,
+        workflow_id: str,
+        action: str,
+        payload: Dict[str, Any],
+        receiver_id: Optional[str] = None,
+        receiver_type: Optional[str] = None,
+        task_id: Optional[str] = None,
+        in_reply_to: Optional[str] = None
+    ):
+        self.message_type = message_type
+        self.sender_id = sender_id
+        self.sender_type = sender_type
+        self.receiver_id = receiver_id
+        self.receiver_type = receiver_type
+        self.workflow_id = workflow_id
+        self.task_id = task_id
+        self.action = action
+        self.payload = payload
+        self.in_reply_to = in_reply_to
+        self.seq = next(_internal_ids)
+        self.created_at = time.time()
+    
+    @property
+    def message_id(self) -> str:
+        """Process-local message ID"""
+        return f"int_{self.seq}"
+    
+    def to_acl(self) -> AgentMessage:
+        """Convert to the ACL Pydantic model"""
+        return AgentMessage(
+            message_id=self.message_id,
+            message_type=self.message_type,
+            timestamp=datetime.utcfromtimestamp(self.created_at),
+            sender_id=self.sender_id,
+            sender_type=self.sender_type,
+            receiver_id=self.receiver_id,
+            receiver_type=self.receiver_type,
+            workflow_id=self.workflow_id,
+            task_id=self.task_id,
+            action=self.action,
+            payload=self.payload,
+            in_reply_to=self.in_reply_to
+        )
+
+
+class InternalResponse:
+    """Lightweight in-process counterpart of MessageResponse"""
+    
+    __slots__ = ("success", "message_id", "result", "error", "created_at")
+    
+    def __init__(
+        self,
+        success: bool,
+        message_id: str,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None
+    ):
+        self.success = success
+        self.message_id = message_id
+        self.result = result
+        self.error = error
+        self.created_at = time.time()
+    
+    def to_acl(self) -> MessageResponse:
+        """Convert to the ACL Pydantic model"""
+        return MessageResponse(
+            success=self.success,
+            message_id=self.message_id,
+            result=self.result,
+            error=self.error,
+            timestamp=datetime.utcfromtimestamp(self.created_at)
+        )
+
+
+# Either representation; agents accept both and answer in kind
+AnyMessage = Union[AgentMessage, InternalMessage]
+AnyResponse = Union[MessageResponse, InternalResponse]
+
+
+class MessageBatch(BaseModel):
+    """Batch of messages for bulk operations; in-process batches carry InternalMessages"""
+    batch_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    messages: List[AnyMessage]
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    
+    class Config:
+        arbitrary_types_allowed = True
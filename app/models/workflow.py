@@ -41,6 +41,7 @@ class Task(BaseModel):
     status: TaskStatus = TaskStatus.PENDING
     priority: int = Field(default=1, ge=1, le=10)
     parameters: Dict[str, Any] = Field(default_factory=dict)
+    depends_on: List[str] = Field(default_factory=list, description="task_ids that must complete first")
     result: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -54,6 +55,7 @@ class WorkflowState(BaseModel):
     name: str = Field(..., description="Workflow name")
     description: Optional[str] = None
     status: WorkflowStatus = WorkflowStatus.PENDING
+    priority: int = Field(default=5, ge=1, le=10, description="Queue priority (1 runs first)")
     tasks: List[Task] = Field(default_factory=list)
     current_task_index: int = 0
     context: Dict[str, Any] = Field(default_factory=dict, description="Shared workflow context")
@@ -96,6 +98,7 @@ class WorkflowRequest(BaseModel):
     operation: str = Field(..., description="Operation type: create, update, delete, query")
     target_customer_id: Optional[str] = None
     parameters: Dict[str, Any] = Field(default_factory=dict)
+    priority: int = Field(default=5, ge=1, le=10, description="Queue priority (1 runs first)")
     
     class Config:
         json_schema_extra = {
@@ -119,3 +122,55 @@ class WorkflowResponse(BaseModel):
     message: str
     current_task: Optional[Task] = None
     progress: float = Field(ge=0, le=100, description="Completion percentage")
+    queue_position: Optional[int] = Field(default=None, description="Position in the work queue while pending")
+
+
+class WorkflowBatchRequest(BaseModel):
+    """Request to create many workflows in one call"""
+    requests: List[WorkflowRequest] = Field(..., min_length=1, description="Workflows to create")
+    priority: int = Field(default=5, ge=1, le=10, description="Queue priority (1 runs first)")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "requests": [
+                    {
+                        "name": "Upgrade CUST001",
+                        "operation": "update",
+                        "target_customer_id": "CUST001",
+                        "parameters": {"subscription_plan": "Premium"}
+                    },
+                    {
+                        "name": "Upgrade CUST002",
+                        "operation": "update",
+                        "target_customer_id": "CUST002",
+                        "parameters": {"subscription_plan": "Premium"}
+                    }
+                ]
+            }
+        }
+
+
+class WorkflowBatchState(BaseModel):
+    """Aggregated state of a workflow batch"""
+    batch_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    status: WorkflowStatus = WorkflowStatus.PENDING
+    priority: int = 5
+    workflow_ids: List[str] = Field(default_factory=list)
+    completed: int = 0
+    failed: int = 0
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+
+class WorkflowBatchResponse(BaseModel):
+    """Response after batch creation or status check"""
+    batch_id: str
+    status: WorkflowStatus
+    message: str
+    total: int
+    completed: int = 0
+    failed: int = 0
+    progress: float = Field(ge=0, le=100, description="Share of workflows finished")
+    queue_position: Optional[int] = None
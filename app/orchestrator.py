@@ -6,12 +6,24 @@ This is a core reusable asset - the Orchestration Engine module
 from typing import Dict, Any, List, Optional
 from app.models.workflow import (
     WorkflowState, WorkflowStatus, WorkflowRequest, WorkflowResponse,
+    WorkflowBatchRequest, WorkflowBatchState, WorkflowBatchResponse,
     Task, TaskStatus, AgentType
 )
-from app.models.message import AgentMessage, MessageType
+from app.models.message import InternalMessage, MessageBatch, AnyResponse, MessageType
 from app.agents import PlannerAgent, ExecutorAgent
+from app.config import settings
+from app.workflow_store import WorkflowStore, wait_event
+from app.write_coordinator import write_coordinator
+from app.log import get_logger, workflow_context
+from app.tracing import tracer
+from app.metrics import TASK_SECONDS, QUEUE_WAIT_SECONDS, WORKFLOW_SECONDS, WORKFLOWS_TOTAL
 from sqlalchemy.ext.asyncio import AsyncSession
-from datetime import datetime
+from collections import OrderedDict
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+import itertools
+import logging
+import time
 import uuid
 import asyncio
 
@@ -23,76 +35,274 @@ class OrchestrationEngine:
     Responsibilities:
     - Start and manage workflows
     - Store and update workflow state (pending, running, completed)
-    - Call agents in sequence
+    - Call agents in dependency order, running independent tasks concurrently
     - Coordinate inter-agent communication
     - Handle errors and retries
+    - Queue workflows and drain them with a bounded pool of workers
+    - Persist workflow transitions through a write-behind buffer
+    - Evict finished workflows from memory into the workflows table
     """
     
-    def __init__(self):
+    TERMINAL_STATUSES = frozenset({
+        WorkflowStatus.COMPLETED, WorkflowStatus.FAILED, WorkflowStatus.CANCELLED
+    })
+    
+    def __init__(
+        self,
+        max_concurrent_workflows: Optional[int] = None,
+        max_queued_workflows: Optional[int] = None,
+        store: Optional[WorkflowStore] = None
+    ):
+        self.logger = get_logger("orchestrator")
         self.workflows: Dict[str, WorkflowState] = {}
+        self.batches: Dict[str, WorkflowBatchState] = {}
+        # Workflow IDs indexed by status (dicts used as insertion-ordered sets)
+        self._status_index: Dict[WorkflowStatus, Dict[str, None]] = {
+            status: {} for status in WorkflowStatus
+        }
         self.planner_agent = PlannerAgent()
         self.executor_agent = ExecutorAgent()
-        self.max_concurrent_workflows = 5
+        self.max_concurrent_workflows = max_concurrent_workflows or settings.MAX_CONCURRENT_WORKFLOWS
+        self.max_queued_workflows = max_queued_workflows or settings.WORKFLOW_QUEUE_SIZE
+        self.task_concurrency = max(1, settings.WORKFLOW_TASK_CONCURRENCY)
+        
+        # Work queue state; created lazily inside the running event loop
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._queued_entries: Dict[str, tuple] = {}
+        # Queued entries kept sorted in pop order, so a position is one bisect
+        self._queued_order: List[tuple] = []
+        self._sequence = itertools.count()
+        self._workers: List[asyncio.Task] = []
+        self._workers_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._busy_workers = 0
+        self._busy_seconds = 0.0
+        self._workers_started_at = 0.0
+        
+        # Eviction state: terminal workflow IDs in least-recently-used order
+        self.store = store or WorkflowStore()
+        self.max_workflows_in_memory = settings.WORKFLOW_MAX_IN_MEMORY
+        self.workflow_memory_ttl = settings.WORKFLOW_MEMORY_TTL_SECONDS
+        self._terminal_lru: "OrderedDict[str, float]" = OrderedDict()
+        self._sweeper: Optional[asyncio.Task] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._sweep_requested: Optional[asyncio.Event] = None
+        self.evicted_workflows = 0
         self.log("Orchestration Engine initialized")
     
-    def log(self, message: str):
-        """Log orchestrator activity"""
-        timestamp = datetime.utcnow().isoformat()
-        print(f"[{timestamp}] [ORCHESTRATOR] {message}")
+    def log(self, message: str, *args, level: int = logging.INFO):
+        """Log orchestrator activity; %-style args are only formatted if the record is emitted"""
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, message, *args)
+    
+    # ------------------------------------------------------------------
+    # Workflow registry and status accounting
+    # ------------------------------------------------------------------
+    
+    def _track_workflow(self, workflow: WorkflowState):
+        """Register a new workflow and index it under its status"""
+        self.workflows[workflow.workflow_id] = workflow
+        self._status_index[workflow.status][workflow.workflow_id] = None
+        self.store.mark_dirty(workflow)
+    
+    def _set_status(self, workflow: WorkflowState, status: WorkflowStatus):
+        """Transition a workflow, keeping the status index in step"""
+        if workflow.status == status:
+            return
+        self._status_index[workflow.status].pop(workflow.workflow_id, None)
+        self._status_index[status][workflow.workflow_id] = None
+        workflow.status = status
+        self.store.mark_dirty(workflow)
+        
+        if status in self.TERMINAL_STATUSES:
+            WORKFLOWS_TOTAL.labels(status.value).inc()
+            WORKFLOW_SECONDS.labels(status.value).observe(
+                (datetime.utcnow() - workflow.created_at).total_seconds()
+            )
+            self._terminal_lru[workflow.workflow_id] = time.monotonic()
+            if len(self._terminal_lru) > self.max_workflows_in_memory and self._sweep_requested:
+                self._sweep_requested.set()
+    
+    def _untrack_workflow(self, workflow_id: str):
+        """Drop a workflow from memory and from every index"""
+        workflow = self.workflows.pop(workflow_id, None)
+        if workflow:
+            self._status_index[workflow.status].pop(workflow_id, None)
+        self._terminal_lru.pop(workflow_id, None)
+    
+    def count_workflows(self, *statuses: WorkflowStatus) -> int:
+        """Number of workflows in the given statuses (all statuses if none given)"""
+        return sum(len(self._status_index[s]) for s in (statuses or WorkflowStatus))
+    
+    def get_status_counts(self) -> Dict[str, int]:
+        """Workflow counts per status"""
+        return {status.value: len(ids) for status, ids in self._status_index.items()}
     
     async def create_workflow(
         self,
         request: WorkflowRequest,
         db_session: AsyncSession
     ) -> WorkflowResponse:
-        """Create and start a new workflow"""
-        
-        # Check concurrent workflow limit
-        active_workflows = sum(
-            1 for w in self.workflows.values() 
-            if w.status in [WorkflowStatus.PENDING, WorkflowStatus.RUNNING]
-        )
+        """Create a new workflow and queue it for execution"""
+        self.start()
         
-        if active_workflows >= self.max_concurrent_workflows:
+        # Backpressure: reject only when the bounded queue itself is full
+        if self._queue.full():
             return WorkflowResponse(
                 workflow_id="",
                 status=WorkflowStatus.FAILED,
-                message="Maximum concurrent workflows reached",
+                message="Workflow queue is full",
+                progress=0
+            )
+        
+        workflow = self._new_workflow(request)
+        self.log("Created workflow: %s - %s", workflow.workflow_id, workflow.name, level=logging.DEBUG)
+        
+        # Generate task plan using Planner Agent
+        with workflow_context(workflow.workflow_id), tracer.trace(workflow.workflow_id):
+            await self._plan_workflow(workflow, db_session)
+        
+        if workflow.status == WorkflowStatus.FAILED:
+            return WorkflowResponse(
+                workflow_id=workflow.workflow_id,
+                status=workflow.status,
+                message=f"Workflow planning failed: {workflow.error}",
                 progress=0
             )
         
-        # Create workflow state
+        # Queue for execution; a worker runs it with its own database session
+        try:
+            self._enqueue(workflow.workflow_id, workflow.priority)
+        except asyncio.QueueFull:
+            self._set_status(workflow, WorkflowStatus.FAILED)
+            workflow.error = "Workflow queue is full"
+            workflow.completed_at = datetime.utcnow()
+            return WorkflowResponse(
+                workflow_id=workflow.workflow_id,
+                status=workflow.status,
+                message=workflow.error,
+                progress=0
+            )
+        
+        return WorkflowResponse(
+            workflow_id=workflow.workflow_id,
+            status=workflow.status,
+            message="Workflow created and queued",
+            current_task=workflow.tasks[0] if workflow.tasks else None,
+            progress=0,
+            queue_position=self.get_queue_position(workflow.workflow_id)
+        )
+    
+    def _new_workflow(self, request: WorkflowRequest, priority: Optional[int] = None) -> WorkflowState:
+        """Create and register workflow state for a request"""
         workflow = WorkflowState(
             name=request.name,
             description=request.description,
+            priority=priority or request.priority,
             context={
                 "operation": request.operation,
                 "target_customer_id": request.target_customer_id,
                 "parameters": request.parameters
             }
         )
+        self._track_workflow(workflow)
+        return workflow
+    
+    async def create_workflow_batch(self, request: WorkflowBatchRequest) -> WorkflowBatchResponse:
+        """
+        Create many workflows at once.
+        All plans are generated in one planner pass, and the whole
+        batch is queued as a single job whose database writes are grouped.
+        """
+        self.start()
         
-        self.workflows[workflow.workflow_id] = workflow
-        self.log(f"Created workflow: {workflow.workflow_id} - {workflow.name}")
+        if len(request.requests) > settings.WORKFLOW_BATCH_MAX_SIZE:
+            return WorkflowBatchResponse(
+                batch_id="",
+                status=WorkflowStatus.FAILED,
+                message=f"Batch exceeds {settings.WORKFLOW_BATCH_MAX_SIZE} workflows",
+                total=len(request.requests),
+                progress=0
+            )
+        if self._queue.full():
+            return WorkflowBatchResponse(
+                batch_id="",
+                status=WorkflowStatus.FAILED,
+                message="Workflow queue is full",
+                total=len(request.requests),
+                progress=0
+            )
         
-        # Generate task plan using Planner Agent
-        await self._plan_workflow(workflow, db_session)
+        workflows = [self._new_workflow(r, request.priority) for r in request.requests]
+        batch = WorkflowBatchState(
+            priority=request.priority,
+            workflow_ids=[w.workflow_id for w in workflows]
+        )
+        self.batches[batch.batch_id] = batch
+        self.log("Created batch %s with %d workflows", batch.batch_id, len(workflows))
         
-        # Start workflow execution in background with its own database session
-        asyncio.create_task(self._execute_workflow_background(workflow))
+        # Plan every workflow through the planner in one batch hop
+        with tracer.trace(batch.batch_id), tracer.span("plan", workflows=len(workflows)):
+            responses = await self.planner_agent.process_batch(MessageBatch(
+                batch_id=batch.batch_id,
+                messages=[self._planning_message(w) for w in workflows]
+            ))
+        for workflow, response in zip(workflows, responses):
+            try:
+                self._apply_plan(workflow, response)
+            except Exception as e:
+                self._fail_planning(workflow, e)
+                batch.failed += 1
         
-        return WorkflowResponse(
-            workflow_id=workflow.workflow_id,
-            status=workflow.status,
-            message=f"Workflow created and started",
-            current_task=workflow.tasks[0] if workflow.tasks else None,
-            progress=0
+        try:
+            self._enqueue(batch.batch_id, batch.priority)
+        except asyncio.QueueFull:
+            for workflow in workflows:
+                if workflow.status == WorkflowStatus.PENDING:
+                    self._finish_workflow(workflow, Exception("Workflow queue is full"))
+                    batch.failed += 1
+            self._finish_batch(batch)
+        
+        return self._batch_response(batch, "Batch created and queued")
+    
+    def get_batch_status(self, batch_id: str) -> Optional[WorkflowBatchResponse]:
+        """Get aggregated progress of a workflow batch"""
+        batch = self.batches.get(batch_id)
+        if not batch:
+            return None
+        return self._batch_response(batch, f"Batch {batch.status.value}")
+    
+    def _batch_response(self, batch: WorkflowBatchState, message: str) -> WorkflowBatchResponse:
+        """Summarise a batch's counters"""
+        total = len(batch.workflow_ids)
+        finished = batch.completed + batch.failed
+        return WorkflowBatchResponse(
+            batch_id=batch.batch_id,
+            status=batch.status,
+            message=message,
+            total=total,
+            completed=batch.completed,
+            failed=batch.failed,
+            progress=(finished / total) * 100 if total else 0,
+            queue_position=self.get_queue_position(batch.batch_id)
         )
     
+    def _finish_batch(self, batch: WorkflowBatchState):
+        """Move a batch to its terminal status"""
+        batch.status = WorkflowStatus.FAILED if batch.failed == len(batch.workflow_ids) else WorkflowStatus.COMPLETED
+        batch.completed_at = datetime.utcnow()
+        self.log("Batch %s: %s (%d completed, %d failed)", batch.status.value, batch.batch_id, batch.completed, batch.failed)
+    
     async def get_workflow_status(self, workflow_id: str) -> Optional[WorkflowResponse]:
-        """Get current status of a workflow"""
+        """Get current status of a workflow, falling back to storage once evicted"""
         workflow = self.workflows.get(workflow_id)
         
+        if workflow:
+            if workflow_id in self._terminal_lru:
+                self._terminal_lru[workflow_id] = time.monotonic()
+                self._terminal_lru.move_to_end(workflow_id)
+        else:
+            workflow = await self.store.load(workflow_id)
+        
         if not workflow:
             return None
         
@@ -115,127 +325,558 @@ class OrchestrationEngine:
             status=workflow.status,
             message=f"Workflow {workflow.status.value}",
             current_task=current_task,
-            progress=progress
+            progress=progress,
+            queue_position=self.get_queue_position(workflow_id)
+        )
+    
+    # ------------------------------------------------------------------
+    # Work queue and worker pool
+    # ------------------------------------------------------------------
+    
+    def start(self):
+        """Start the worker pool in the running event loop (idempotent)"""
+        loop = asyncio.get_running_loop()
+        if self._workers_loop is loop and self._workers:
+            return
+        
+        # Queues and tasks are bound to a loop; rebuild them if the loop changed
+        self._queue = asyncio.PriorityQueue(maxsize=self.max_queued_workflows)
+        self._queued_entries = {}
+        self._queued_order = []
+        self._busy_workers = 0
+        self._busy_seconds = 0.0
+        self._workers_started_at = time.monotonic()
+        self._workers_loop = loop
+        self._workers = [
+            loop.create_task(self._worker(i))
+            for i in range(self.max_concurrent_workflows)
+        ]
+        self._sweep_requested = asyncio.Event()
+        self._sweeper = loop.create_task(self._sweep_loop())
+        self._flusher = loop.create_task(
+            self.store.run_flusher(on_error=lambda e: self.log("Workflow flush failed: %s", e, level=logging.ERROR))
         )
+        self.log("Started %d workflow workers (queue capacity %d)", len(self._workers), self.max_queued_workflows)
+    
+    async def shutdown(self):
+        """Stop background tasks and flush buffered state; queued workflows stay pending"""
+        # The flusher is stopped (not cancelled) so a flush in progress completes
+        if self._flusher:
+            self.store.stop_flusher()
+        for task in self._workers + [self._sweeper]:
+            if task:
+                task.cancel()
+        tasks = self._workers + [t for t in (self._sweeper, self._flusher) if t]
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=settings.SHUTDOWN_TIMEOUT_SECONDS)
+            if pending:
+                self.log(
+                    "%d background tasks did not stop within %ss",
+                    len(pending), settings.SHUTDOWN_TIMEOUT_SECONDS, level=logging.WARNING
+                )
+        await write_coordinator.shutdown()
+        await self.store.flush()
+        for agent in (self.planner_agent, self.executor_agent):
+            agent.message_history.close()
+        self._workers = []
+        self._sweeper = None
+        self._flusher = None
+        self._sweep_requested = None
+        self._workers_loop = None
+        self.log("Workflow workers stopped")
+    
+    def _enqueue(self, job_id: str, priority: int):
+        """Put a planned workflow or batch on the priority queue"""
+        entry = (priority, next(self._sequence), job_id, time.perf_counter())
+        self._queue.put_nowait(entry)
+        self._queued_entries[job_id] = entry
+        insort(self._queued_order, entry)
+    
+    def get_queue_position(self, job_id: str) -> Optional[int]:
+        """1-based position of a queued workflow or batch, or None if it is not waiting"""
+        entry = self._queued_entries.get(job_id)
+        if entry is None:
+            return None
+        return 1 + bisect_left(self._queued_order, entry)
+    
+    def _dequeued(self, entry: tuple):
+        """Forget a queue entry a worker has taken"""
+        self._queued_entries.pop(entry[2], None)
+        index = bisect_left(self._queued_order, entry)
+        if index < len(self._queued_order) and self._queued_order[index] == entry:
+            del self._queued_order[index]
+    
+    async def _worker(self, worker_index: int):
+        """Drain the queue, running one workflow or batch at a time"""
+        while True:
+            entry = await self._queue.get()
+            _, _, job_id, enqueued_at = entry
+            self._dequeued(entry)
+            picked_up = time.perf_counter()
+            QUEUE_WAIT_SECONDS.observe(picked_up - enqueued_at)
+            tracer.record("queue.wait", enqueued_at, picked_up, workflow_id=job_id)
+            batch = self.batches.get(job_id)
+            workflow = self.workflows.get(job_id)
+            
+            self._busy_workers += 1
+            started = time.monotonic()
+            try:
+                if batch and batch.status == WorkflowStatus.PENDING:
+                    await self._execute_batch_background(batch)
+                elif workflow and workflow.status == WorkflowStatus.PENDING:
+                    await self._execute_workflow_background(workflow)
+            except Exception as e:
+                self.log("Worker %d error on job %s: %s", worker_index, job_id, e, level=logging.ERROR)
+            finally:
+                self._busy_workers -= 1
+                self._busy_seconds += time.monotonic() - started
+                self._queue.task_done()
+    
+    # ------------------------------------------------------------------
+    # Eviction of finished workflows
+    # ------------------------------------------------------------------
+    
+    async def _sweep_loop(self):
+        """Sweep periodically, or immediately when the in-memory cap is exceeded"""
+        while True:
+            await wait_event(self._sweep_requested, settings.WORKFLOW_SWEEP_INTERVAL_SECONDS)
+            self._sweep_requested.clear()
+            
+            try:
+                await self.sweep_workflows()
+            except Exception as e:
+                self.log("Workflow sweep failed: %s", e, level=logging.ERROR)
+    
+    async def sweep_workflows(self, purge: bool = True) -> int:
+        """
+        Evict idle or over-cap terminal workflows to storage.
+        Expired rows beyond WORKFLOW_RETENTION_DAYS are purged from storage.
+        """
+        cutoff = time.monotonic() - self.workflow_memory_ttl
+        overflow = len(self._terminal_lru) - self.max_workflows_in_memory
+        
+        # The LRU is ordered by last access, so candidates are always a prefix
+        candidates = []
+        for workflow_id, last_access in self._terminal_lru.items():
+            if len(candidates) >= overflow and last_access >= cutoff:
+                break
+            candidates.append(workflow_id)
+        
+        evicted = await self._evict_workflows(candidates)
+        
+        # Finished batches only hold counters; drop them after the same idle window
+        batch_cutoff = datetime.utcnow() - timedelta(seconds=self.workflow_memory_ttl)
+        for batch_id in [
+            b.batch_id for b in self.batches.values()
+            if b.completed_at and b.completed_at < batch_cutoff
+        ]:
+            del self.batches[batch_id]
+        
+        if purge:
+            await self.store.purge_expired(settings.WORKFLOW_RETENTION_DAYS)
+        return evicted
+    
+    async def _evict_workflows(self, workflow_ids: List[str]) -> int:
+        """Persist terminal workflows, then drop them from memory"""
+        workflows = [self.workflows[wid] for wid in workflow_ids if wid in self.workflows]
+        if not workflows:
+            return 0
+        
+        # Only drop state once it is safely stored, so status lookups never miss.
+        # The save is ordered after any flush in progress and supersedes
+        # buffered writes for these workflows.
+        await self.store.save_through(workflows)
+        for workflow in workflows:
+            self._untrack_workflow(workflow.workflow_id)
+        
+        self.evicted_workflows += len(workflows)
+        self.log("Evicted %d finished workflows to storage", len(workflows))
+        return len(workflows)
+    
+    def get_queue_stats(self) -> Dict[str, Any]:
+        """Queue depth, worker utilization and workflow counts by status"""
+        workers = len(self._workers)
+        uptime = time.monotonic() - self._workers_started_at if workers else 0.0
+        return {
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "queue_capacity": self.max_queued_workflows,
+            "workers": workers,
+            "busy_workers": self._busy_workers,
+            "worker_utilization": self._busy_workers / workers if workers else 0.0,
+            "average_utilization": self._busy_seconds / (uptime * workers) if uptime and workers else 0.0,
+            "active_workflows": self.count_workflows(WorkflowStatus.PENDING, WorkflowStatus.RUNNING),
+            "workflows_by_status": self.get_status_counts(),
+            "workflows_in_memory": len(self.workflows),
+            "evicted_workflows": self.evicted_workflows,
+            "persistence": self.store.get_stats(),
+            "group_commit": write_coordinator.get_stats()
+        }
     
     async def _plan_workflow(self, workflow: WorkflowState, db_session: AsyncSession):
         """Use Planner Agent to generate task plan"""
-        self.log(f"Planning workflow: {workflow.workflow_id}")
+        self.log("Planning workflow: %s", workflow.workflow_id, level=logging.DEBUG)
         
-        workflow.status = WorkflowStatus.PENDING
+        self._set_status(workflow, WorkflowStatus.PENDING)
         
         try:
-            # Create message for planner
-            message = AgentMessage(
-                message_type=MessageType.REQUEST,
-                sender_id="orchestrator",
-                sender_type="orchestrator",
-                receiver_id=self.planner_agent.agent_id,
-                receiver_type="planner",
-                workflow_id=workflow.workflow_id,
-                action="plan_workflow",
-                payload={
-                    "operation": workflow.context["operation"],
-                    "target_customer_id": workflow.context.get("target_customer_id"),
-                    "parameters": workflow.context.get("parameters", {})
-                }
-            )
-            
             # Get plan from planner agent
-            response = await self.planner_agent.process_message(message)
-            
-            if not response.success:
-                raise Exception(response.error)
-            
-            # Convert plan to tasks
-            task_definitions = response.result.get("tasks", [])
-            for task_def in task_definitions:
-                task = Task(
-                    task_id=task_def["task_id"],
-                    description=task_def["description"],
-                    agent_type=AgentType(task_def["agent_type"]),
-                    status=TaskStatus.PENDING,
-                    priority=task_def.get("priority", 1),
-                    parameters=task_def.get("parameters", {})
-                )
-                workflow.tasks.append(task)
-            
-            self.log(f"Generated {len(workflow.tasks)} tasks for workflow {workflow.workflow_id}")
-            
+            with tracer.span("plan"):
+                response = await self.planner_agent.process_message(self._planning_message(workflow))
+            self._apply_plan(workflow, response)
         except Exception as e:
-            workflow.status = WorkflowStatus.FAILED
-            workflow.error = str(e)
-            self.log(f"Failed to plan workflow: {str(e)}")
+            self._fail_planning(workflow, e)
+    
+    def _planning_message(self, workflow: WorkflowState) -> InternalMessage:
+        """Create message for planner; it stays in-process, so the compact form is used"""
+        return InternalMessage(
+            message_type=MessageType.REQUEST,
+            sender_id="orchestrator",
+            sender_type="orchestrator",
+            receiver_id=self.planner_agent.agent_id,
+            receiver_type="planner",
+            workflow_id=workflow.workflow_id,
+            action="plan_workflow",
+            payload={
+                "operation": workflow.context["operation"],
+                "target_customer_id": workflow.context.get("target_customer_id"),
+                "parameters": workflow.context.get("parameters", {})
+            }
+        )
+    
+    def _apply_plan(self, workflow: WorkflowState, response: AnyResponse):
+        """Convert the planner's response into workflow tasks"""
+        if not response.success:
+            raise Exception(response.error)
+        
+        task_definitions = response.result.get("tasks", [])
+        for task_def in task_definitions:
+            task = Task(
+                task_id=task_def["task_id"],
+                description=task_def["description"],
+                agent_type=AgentType(task_def["agent_type"]),
+                status=TaskStatus.PENDING,
+                priority=task_def.get("priority", 1),
+                parameters=task_def.get("parameters", {}),
+                depends_on=task_def.get("depends_on", [])
+            )
+            workflow.tasks.append(task)
+        
+        self.store.mark_dirty(workflow)
+        self.log("Generated %d tasks for workflow %s", len(workflow.tasks), workflow.workflow_id, level=logging.DEBUG)
+    
+    def _fail_planning(self, workflow: WorkflowState, error: Exception):
+        """Mark a workflow whose plan could not be generated"""
+        self._set_status(workflow, WorkflowStatus.FAILED)
+        workflow.error = str(error)
+        self.log("Failed to plan workflow: %s", error, level=logging.WARNING)
     
     async def _execute_workflow_background(self, workflow: WorkflowState):
-        """Execute workflow in background with its own database session"""
-        from app.database import AsyncSessionLocal
+        """Execute workflow in background with its own read session; writes go through the writer"""
+        from app.database import ReadSessionLocal
         
         # Create a new database session for this background task
-        async with AsyncSessionLocal() as db_session:
-            await self._execute_workflow(workflow, db_session)
+        with workflow_context(workflow.workflow_id), tracer.trace(workflow.workflow_id):
+            async with ReadSessionLocal() as db_session:
+                await self._execute_workflow(workflow, db_session)
     
     async def _execute_workflow(self, workflow: WorkflowState, db_session: AsyncSession):
-        """Execute workflow tasks in sequence"""
-        self.log(f"Starting workflow execution: {workflow.workflow_id}")
-        
-        workflow.status = WorkflowStatus.RUNNING
-        workflow.started_at = datetime.utcnow()
+        """
+        Execute workflow tasks.
+        Tasks that declare depends_on run as a DAG; plans without any
+        dependencies keep the original strict list order.
+        """
+        self.log("Starting workflow execution: %s", workflow.workflow_id, level=logging.DEBUG)
+        self._start_workflow(workflow)
         
         try:
-            # Set database session for executor
-            self.executor_agent.set_db_session(db_session)
+            if any(task.depends_on for task in workflow.tasks):
+                await self._execute_task_graph(workflow, db_session)
+                self._finish_workflow(workflow)
+                return
             
             # Execute tasks in sequence
             for i, task in enumerate(workflow.tasks):
-                workflow.current_task_index = i
-                self.log(f"Executing task {i+1}/{len(workflow.tasks)}: {task.description}")
-                
-                task.status = TaskStatus.IN_PROGRESS
-                task.started_at = datetime.utcnow()
+                self.log("Executing task %d/%d: %s", i + 1, len(workflow.tasks), task.description, level=logging.DEBUG)
+                self._start_task(workflow, i)
                 
                 try:
-                    # Route task to appropriate agent
-                    if task.agent_type == AgentType.PLANNER:
-                        result = await self.planner_agent.execute_task({
-                            "description": task.description,
-                            "parameters": {**task.parameters, **workflow.context}
-                        })
-                    elif task.agent_type == AgentType.EXECUTOR:
-                        result = await self.executor_agent.execute_task({
-                            "description": task.description,
-                            "parameters": {**task.parameters, **workflow.context}
-                        })
-                    else:
-                        # Validator or other agents - placeholder
-                        result = {"status": "success", "message": "Task simulated"}
-                    
-                    task.result = result
-                    task.status = TaskStatus.COMPLETED
-                    task.completed_at = datetime.utcnow()
-                    
-                    self.log(f"Task completed: {task.description}")
-                    
+                    result = await self._run_task(workflow, task, db_session)
+                    self._complete_task(workflow, task, result)
                 except Exception as e:
-                    task.status = TaskStatus.FAILED
-                    task.error = str(e)
-                    task.completed_at = datetime.utcnow()
-                    self.log(f"Task failed: {task.description} - {str(e)}")
+                    self._fail_task(workflow, task, e)
                     raise e
             
             # All tasks completed successfully
-            workflow.status = WorkflowStatus.COMPLETED
-            workflow.completed_at = datetime.utcnow()
-            self.log(f"Workflow completed: {workflow.workflow_id}")
-            
+            self._finish_workflow(workflow)
+        
         except Exception as e:
-            workflow.status = WorkflowStatus.FAILED
-            workflow.error = str(e)
+            self._finish_workflow(workflow, e)
+    
+    async def _execute_task_graph(self, workflow: WorkflowState, db_session: AsyncSession):
+        """
+        Run a workflow's tasks as a dependency graph.
+        
+        Ready tasks start in (priority, plan order). Executor tasks wait on the
+        database, so ready ones are launched together, at most task_concurrency
+        at a time and each on its own session, and the workflow takes its
+        critical-path time. Planner and validator tasks never wait on I/O, so
+        they run inline (overlapping any executor tasks in flight) instead of
+        paying for a task of their own; so does a lone ready executor task with
+        nothing in flight, on the workflow's session, which keeps plain chains
+        as cheap as the sequential loop.
+        
+        Only plans that fan out executor tasks gain any concurrency; the
+        planner's validate -> execute -> validate chains run one step at a time.
+        
+        After a failure no new tasks start, in-flight ones are allowed to finish,
+        and the first error is raised.
+        """
+        index_of = {task.task_id: i for i, task in enumerate(workflow.tasks)}
+        waiting_on: Dict[int, int] = {}
+        dependents: Dict[int, List[int]] = {i: [] for i in range(len(workflow.tasks))}
+        for i, task in enumerate(workflow.tasks):
+            unknown = [dep for dep in task.depends_on if dep not in index_of]
+            if unknown:
+                raise ValueError(f"Task {task.task_id} depends on unknown tasks: {', '.join(unknown)}")
+            waiting_on[i] = len(task.depends_on)
+            for dep in task.depends_on:
+                dependents[index_of[dep]].append(i)
+        
+        ready = [i for i, count in waiting_on.items() if count == 0]
+        running: Dict[asyncio.Task, int] = {}
+        finished = 0
+        first_error: Optional[Exception] = None
+        
+        def settle(i: int, result: Any = None, error: Optional[Exception] = None):
+            nonlocal finished, first_error
+            task = workflow.tasks[i]
+            finished += 1
+            if error is not None:
+                self._fail_task(workflow, task, error)
+                first_error = first_error or error
+                return
+            self._complete_task(workflow, task, result)
+            for j in dependents[i]:
+                waiting_on[j] -= 1
+                if waiting_on[j] == 0:
+                    ready.append(j)
+        
+        try:
+            while first_error is None and (ready or running):
+                ready.sort(key=lambda i: (workflow.tasks[i].priority, i))
+                lone = not running and len(ready) == 1
+                
+                if not lone:
+                    for i in [i for i in ready if workflow.tasks[i].agent_type == AgentType.EXECUTOR]:
+                        if len(running) >= self.task_concurrency:
+                            break
+                        ready.remove(i)
+                        self._start_task(workflow, i)
+                        running[asyncio.create_task(self._run_concurrent_task(workflow, workflow.tasks[i], db_session))] = i
+                
+                inline = next((i for i in ready if lone or workflow.tasks[i].agent_type != AgentType.EXECUTOR), None)
+                if inline is not None:
+                    ready.remove(inline)
+                    self._start_task(workflow, inline)
+                    try:
+                        result = await self._run_task(workflow, workflow.tasks[inline], db_session)
+                    except Exception as e:
+                        settle(inline, error=e)
+                    else:
+                        settle(inline, result)
+                    continue
+                
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    i = running.pop(future)
+                    error = future.exception()
+                    settle(i, None if error else future.result(), error)
+            
+            # Let in-flight tasks finish so their writes are either committed or rolled back
+            if running:
+                await asyncio.wait(running)
+                for future, i in running.items():
+                    error = future.exception()
+                    settle(i, None if error else future.result(), error)
+                running.clear()
+        finally:
+            # Only reached with tasks still running if this coroutine was cancelled
+            for future in running:
+                future.cancel()
+        
+        if first_error is not None:
+            raise first_error
+        if finished < len(workflow.tasks):
+            raise ValueError("Task dependencies contain a cycle")
+    
+    async def _run_concurrent_task(self, workflow: WorkflowState, task: Task, db_session: AsyncSession) -> Dict[str, Any]:
+        """Run an executor task alongside others on a read session of its own"""
+        from app.database import ReadSessionLocal
+        async with ReadSessionLocal() as session:
+            return await self._run_task(workflow, task, session)
+    
+    async def _execute_batch_background(self, batch: WorkflowBatchState):
+        """Execute a batch in background with its own read session; writes go through the writer"""
+        from app.database import ReadSessionLocal
+        
+        # Lines from batched workflows carry the batch ID
+        with workflow_context(batch.batch_id), tracer.trace(batch.batch_id):
+            async with ReadSessionLocal() as db_session:
+                await self._execute_batch(batch, db_session)
+    
+    async def _execute_batch(self, batch: WorkflowBatchState, db_session: AsyncSession):
+        """
+        Execute a batch round by round.
+        Round k runs task k of every live workflow; executor tasks of a round are
+        handed to the executor together so their writes share grouped statements
+        and one commit. Plans list tasks in dependency order, so rounds respect
+        depends_on. A failed task fails only its own workflow.
+        """
+        batch.status = WorkflowStatus.RUNNING
+        batch.started_at = datetime.utcnow()
+        
+        active = [
+            self.workflows[wid] for wid in batch.workflow_ids
+            if wid in self.workflows and self.workflows[wid].status == WorkflowStatus.PENDING
+        ]
+        for workflow in active:
+            self._start_workflow(workflow)
+        
+        index = 0
+        while active:
+            executor_tasks = []
+            for workflow in active:
+                if index >= len(workflow.tasks):
+                    continue
+                task = workflow.tasks[index]
+                self._start_task(workflow, index)
+                if task.agent_type == AgentType.EXECUTOR:
+                    executor_tasks.append((workflow, task))
+                    continue
+                try:
+                    self._complete_task(workflow, task, await self._run_task(workflow, task, db_session))
+                except Exception as e:
+                    self._fail_task(workflow, task, e)
+                    self._finish_workflow(workflow, e)
+                    batch.failed += 1
+            
+            if executor_tasks:
+                started = time.perf_counter()
+                with tracer.span("task.executor", round=index, operations=len(executor_tasks)):
+                    results = await self.executor_agent.execute_batch(
+                        [self._task_parameters(w, t) for w, t in executor_tasks],
+                        db_session=db_session
+                    )
+                # Every task in the round waited for the whole grouped write
+                elapsed = time.perf_counter() - started
+                series = TASK_SECONDS.labels(AgentType.EXECUTOR.value)
+                for _ in executor_tasks:
+                    series.observe(elapsed)
+                for (workflow, task), result in zip(executor_tasks, results):
+                    if isinstance(result, Exception):
+                        self._fail_task(workflow, task, result)
+                        self._finish_workflow(workflow, result)
+                        batch.failed += 1
+                    else:
+                        self._complete_task(workflow, task, {
+                            "status": "success",
+                            "result": result,
+                            "message": f"Successfully executed {result.get('operation')} operation"
+                        })
+            
+            index += 1
+            still_active = []
+            for workflow in active:
+                if workflow.status != WorkflowStatus.RUNNING:
+                    continue
+                if index >= len(workflow.tasks):
+                    self._finish_workflow(workflow)
+                    batch.completed += 1
+                else:
+                    still_active.append(workflow)
+            active = still_active
+        
+        self._finish_batch(batch)
+    
+    async def _run_task(self, workflow: WorkflowState, task: Task, db_session: AsyncSession) -> Dict[str, Any]:
+        """Run a task on its agent, timing it by agent type"""
+        started = time.perf_counter()
+        try:
+            with tracer.span(f"task.{task.agent_type.value}", task_id=task.task_id, description=task.description):
+                return await self._dispatch_task(workflow, task, db_session)
+        finally:
+            TASK_SECONDS.labels(task.agent_type.value).observe(time.perf_counter() - started)
+    
+    async def _dispatch_task(self, workflow: WorkflowState, task: Task, db_session: AsyncSession) -> Dict[str, Any]:
+        """Route task to appropriate agent"""
+        if task.agent_type == AgentType.PLANNER:
+            return await self.planner_agent.execute_task({
+                "description": task.description,
+                "parameters": self._task_parameters(workflow, task)
+            })
+        elif task.agent_type == AgentType.EXECUTOR:
+            # The session is passed per call so concurrent workflows never share one
+            return await self.executor_agent.execute_task({
+                "description": task.description,
+                "parameters": self._task_parameters(workflow, task)
+            }, db_session=db_session)
+        else:
+            # Validator or other agents - placeholder
+            return {"status": "success", "message": "Task simulated"}
+    
+    @staticmethod
+    def _task_parameters(workflow: WorkflowState, task: Task) -> Dict[str, Any]:
+        """Task parameters merged with the shared workflow context"""
+        return {**task.parameters, **workflow.context}
+    
+    def _start_workflow(self, workflow: WorkflowState):
+        """Mark a workflow as running"""
+        self._set_status(workflow, WorkflowStatus.RUNNING)
+        workflow.started_at = datetime.utcnow()
+    
+    def _start_task(self, workflow: WorkflowState, index: int):
+        """Mark a task as in progress"""
+        task = workflow.tasks[index]
+        workflow.current_task_index = index
+        task.status = TaskStatus.IN_PROGRESS
+        task.started_at = datetime.utcnow()
+        self.store.mark_dirty(workflow)
+    
+    def _complete_task(self, workflow: WorkflowState, task: Task, result: Dict[str, Any]):
+        """Record a task's result"""
+        task.result = result
+        task.status = TaskStatus.COMPLETED
+        task.completed_at = datetime.utcnow()
+        self.store.mark_dirty(workflow)
+        self.log("Task completed: %s", task.description, level=logging.DEBUG)
+    
+    def _fail_task(self, workflow: WorkflowState, task: Task, error: Exception):
+        """Record a task's failure"""
+        task.status = TaskStatus.FAILED
+        task.error = str(error)
+        task.completed_at = datetime.utcnow()
+        self.store.mark_dirty(workflow)
+        self.log("Task failed: %s - %s", task.description, error, level=logging.WARNING)
+    
+    def _finish_workflow(self, workflow: WorkflowState, error: Optional[Exception] = None):
+        """Move a workflow to its terminal status"""
+        if error is None:
+            self._set_status(workflow, WorkflowStatus.COMPLETED)
             workflow.completed_at = datetime.utcnow()
-            self.log(f"Workflow failed: {workflow.workflow_id} - {str(e)}")
+            self.log("Workflow completed: %s", workflow.workflow_id)
+        else:
+            self._set_status(workflow, WorkflowStatus.FAILED)
+            workflow.error = str(error)
+            workflow.completed_at = datetime.utcnow()
+            self.log("Workflow failed: %s - %s", workflow.workflow_id, error, level=logging.WARNING)
     
-    def list_workflows(self) -> List[Dict[str, Any]]:
-        """List all workflows with their current status"""
+    def list_workflows(self, status: Optional[WorkflowStatus] = None) -> List[Dict[str, Any]]:
+        """List workflows with their current status, optionally filtered by status"""
+        if status is None:
+            workflows = self.workflows.values()
+        else:
+            workflows = [self.workflows[wid] for wid in self._status_index[status]]
+        
         return [
             {
                 "workflow_id": w.workflow_id,
@@ -245,7 +886,7 @@ class OrchestrationEngine:
                 "tasks_total": len(w.tasks),
                 "tasks_completed": sum(1 for t in w.tasks if t.status == TaskStatus.COMPLETED)
             }
-            for w in self.workflows.values()
+            for w in workflows
         ]
 
 
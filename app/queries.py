@@ -0,0 +1,54 @@
+"""
+Customer Queries
+Column projection and filters shared by the customer read endpoints
+"""
+from typing import Optional, Tuple
+from sqlalchemy import select, Column
+from sqlalchemy.sql import Select
+from app.database import CustomerDB
+from app.models.customer import CustomerFilters
+
+# Columns served in a profile (updated_at is internal bookkeeping)
+PROFILE_COLUMNS: Tuple[Column, ...] = tuple(
+    column for column in CustomerDB.__table__.columns
+    if column.name != "updated_at"
+)
+PROFILE_FIELDS = {column.name: column for column in PROFILE_COLUMNS}
+
+
+def parse_fields(fields: Optional[str]) -> Tuple[Column, ...]:
+    """Columns named in a comma-separated fields= value; all profile columns when empty"""
+    if not fields:
+        return PROFILE_COLUMNS
+    
+    names = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in names if name not in PROFILE_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return tuple(PROFILE_FIELDS[name] for name in names) or PROFILE_COLUMNS
+
+
+def profile_query(columns: Tuple[Column, ...] = PROFILE_COLUMNS) -> Select:
+    """Select customer profiles as plain rows, skipping ORM object construction"""
+    return select(*columns)
+
+
+def filter_customers(stmt: Select, filters: Optional[CustomerFilters]) -> Select:
+    """Push equality and range filters down to SQL"""
+    if filters is None:
+        return stmt
+    
+    for name in ("status", "industry", "country", "subscription_plan"):
+        value = getattr(filters, name)
+        if value is not None:
+            stmt = stmt.where(PROFILE_FIELDS[name] == value)
+    
+    if filters.min_credit_limit is not None:
+        stmt = stmt.where(CustomerDB.credit_limit >= filters.min_credit_limit)
+    if filters.max_credit_limit is not None:
+        stmt = stmt.where(CustomerDB.credit_limit <= filters.max_credit_limit)
+    if filters.min_total_spent is not None:
+        stmt = stmt.where(CustomerDB.total_spent >= filters.min_total_spent)
+    if filters.max_total_spent is not None:
+        stmt = stmt.where(CustomerDB.total_spent <= filters.max_total_spent)
+    return stmt
@@ -0,0 +1,30 @@
+"""
+JSON Responses
+Serializes already-validated data straight to JSON bytes
+"""
+from typing import Any
+from fastapi.responses import Response
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """Encode content as compact JSON bytes, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, separators=(",", ":"), default=str).encode()
+
+
+class FastJSONResponse(Response):
+    """
+    JSON response that skips response_model validation.
+    Only return data that was validated on write, e.g. customer rows.
+    """
+    media_type = "application/json"
+    
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
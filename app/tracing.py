@@ -0,0 +1,208 @@
+"""
+Tracing
+Per-workflow span trees with monotonic timings and Chrome trace-event export
+"""
+from typing import Dict, Any, Iterator, List, Optional
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from app.config import settings
+import itertools
+import time
+
+
+class Span:
+    """One timed operation inside a workflow trace"""
+    
+    __slots__ = ("span_id", "parent_id", "name", "start", "end", "attributes")
+    
+    def __init__(
+        self,
+        span_id: int,
+        parent_id: Optional[int],
+        name: str,
+        start: float,
+        attributes: Optional[Dict[str, Any]] = None
+    ):
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.name = name
+        self.start = start
+        self.end: Optional[float] = None
+        self.attributes = attributes or {}
+
+
+class WorkflowTrace:
+    """Spans recorded for one workflow (or batch), capped at max_spans"""
+    
+    __slots__ = ("workflow_id", "origin", "spans", "dropped_spans", "max_spans", "_ids")
+    
+    def __init__(self, workflow_id: str, max_spans: int):
+        self.workflow_id = workflow_id
+        self.origin = time.perf_counter()
+        self.spans: List[Span] = []
+        self.dropped_spans = 0
+        self.max_spans = max_spans
+        self._ids = itertools.count(1)
+    
+    def add(
+        self,
+        name: str,
+        start: float,
+        parent_id: Optional[int] = None,
+        attributes: Optional[Dict[str, Any]] = None
+    ) -> Optional[Span]:
+        """Open a span, or None once the trace is full"""
+        if len(self.spans) >= self.max_spans:
+            self.dropped_spans += 1
+            return None
+        if start < self.origin:
+            self.origin = start
+        span = Span(next(self._ids), parent_id, name, start, attributes)
+        self.spans.append(span)
+        return span
+    
+    def _offset_ms(self, timestamp: float) -> float:
+        """Milliseconds since the trace started"""
+        return round((timestamp - self.origin) * 1000, 3)
+    
+    def to_tree(self) -> Dict[str, Any]:
+        """Spans nested under their parents, with offsets and durations in ms"""
+        nodes: Dict[int, Dict[str, Any]] = {}
+        roots: List[Dict[str, Any]] = []
+        for span in self.spans:
+            nodes[span.span_id] = {
+                "name": span.name,
+                "start_ms": self._offset_ms(span.start),
+                "duration_ms": round((span.end - span.start) * 1000, 3) if span.end is not None else None,
+                "attributes": span.attributes,
+                "children": []
+            }
+        for span in self.spans:
+            parent = nodes.get(span.parent_id)
+            (parent["children"] if parent else roots).append(nodes[span.span_id])
+        return {
+            "workflow_id": self.workflow_id,
+            "span_count": len(self.spans),
+            "dropped_spans": self.dropped_spans,
+            "spans": roots
+        }
+    
+    def to_chrome(self) -> Dict[str, Any]:
+        """Chrome trace-event JSON (complete events), loadable in chrome://tracing or Perfetto"""
+        events = [
+            {
+                "name": span.name,
+                "cat": span.name.split(".", 1)[0],
+                "ph": "X",
+                "ts": round((span.start - self.origin) * 1e6, 3),
+                "dur": round((span.end - span.start) * 1e6, 3),
+                "pid": 1,
+                "tid": 1,
+                "args": span.attributes
+            }
+            for span in self.spans
+            if span.end is not None
+        ]
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"workflow_id": self.workflow_id}
+        }
+
+
+_current_trace: ContextVar[Optional[WorkflowTrace]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[int]] = ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """
+    Keeps span trees for the most recent workflows.
+    
+    trace() activates a workflow's trace for the current task; span() and
+    record() are no-ops outside an active trace, so untraced code pays only a
+    context variable lookup. Traces are evicted oldest-first beyond max_traces.
+    """
+    
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        max_traces: Optional[int] = None,
+        max_spans: Optional[int] = None
+    ):
+        self.enabled = enabled if enabled is not None else settings.TRACING_ENABLED
+        self.max_traces = max_traces or settings.TRACE_MAX_WORKFLOWS
+        self.max_spans = max_spans or settings.TRACE_MAX_SPANS
+        self._traces: "OrderedDict[str, WorkflowTrace]" = OrderedDict()
+    
+    def _get_or_create(self, workflow_id: str) -> WorkflowTrace:
+        """Trace for a workflow, evicting the oldest beyond max_traces"""
+        trace = self._traces.get(workflow_id)
+        if trace is None:
+            trace = self._traces[workflow_id] = WorkflowTrace(workflow_id, self.max_spans)
+            while len(self._traces) > self.max_traces:
+                self._traces.popitem(last=False)
+        return trace
+    
+    @contextmanager
+    def trace(self, workflow_id: str) -> Iterator[Optional[WorkflowTrace]]:
+        """Record spans opened inside the block under workflow_id"""
+        if not self.enabled:
+            yield None
+            return
+        trace = self._get_or_create(workflow_id)
+        trace_token = _current_trace.set(trace)
+        span_token = _current_span.set(None)
+        try:
+            yield trace
+        finally:
+            _current_span.reset(span_token)
+            _current_trace.reset(trace_token)
+    
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Optional[Span]]:
+        """Time the block as a child of the current span"""
+        trace = _current_trace.get()
+        span = trace.add(name, time.perf_counter(), _current_span.get(), attributes) if trace else None
+        if span is None:
+            yield None
+            return
+        token = _current_span.set(span.span_id)
+        try:
+            yield span
+        finally:
+            span.end = time.perf_counter()
+            _current_span.reset(token)
+    
+    def record(self, name: str, start: float, end: float, workflow_id: Optional[str] = None, **attributes):
+        """
+        Add an already-timed span: under the current span, or at the root of
+        workflow_id's trace when called outside an active trace.
+        """
+        trace = _current_trace.get()
+        parent_id = _current_span.get()
+        if trace is None:
+            if workflow_id is None or not self.enabled:
+                return
+            trace = self._get_or_create(workflow_id)
+            parent_id = None
+        span = trace.add(name, start, parent_id, attributes)
+        if span is not None:
+            span.end = end
+    
+    def get_trace(self, workflow_id: str) -> Optional[WorkflowTrace]:
+        """Recorded trace for a workflow, if it is still retained"""
+        return self._traces.get(workflow_id)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Trace store statistics"""
+        return {
+            "enabled": self.enabled,
+            "traces": len(self._traces),
+            "max_traces": self.max_traces,
+            "max_spans": self.max_spans
+        }
+
+
+# Global tracer instance
+tracer = Tracer()
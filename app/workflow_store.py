@@ -0,0 +1,203 @@
+"""
+Workflow Store
+Persists workflow state to the workflows table
+"""
+from typing import Dict, Any, Iterable, List, Optional
+from datetime import datetime, timedelta
+from sqlalchemy import select, delete
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app.config import settings
+from app.database import AsyncSessionLocal, WorkflowDB
+from app.models.workflow import WorkflowState, WorkflowStatus, Task
+import asyncio
+
+
+def workflow_to_row(workflow: WorkflowState) -> Dict[str, Any]:
+    """Convert workflow state into a WorkflowDB row"""
+    return {
+        "workflow_id": workflow.workflow_id,
+        "name": workflow.name,
+        "description": workflow.description,
+        "status": workflow.status.value,
+        "tasks": [task.model_dump(mode="json") for task in workflow.tasks],
+        "current_task_index": workflow.current_task_index,
+        "context": workflow.context,
+        "created_at": workflow.created_at,
+        "started_at": workflow.started_at,
+        "completed_at": workflow.completed_at,
+        "error": workflow.error
+    }
+
+
+def row_to_workflow(row: WorkflowDB) -> WorkflowState:
+    """Rebuild workflow state from a WorkflowDB row"""
+    return WorkflowState(
+        workflow_id=row.workflow_id,
+        name=row.name,
+        description=row.description,
+        status=WorkflowStatus(row.status),
+        tasks=[Task(**task) for task in (row.tasks or [])],
+        current_task_index=row.current_task_index or 0,
+        context=row.context or {},
+        created_at=row.created_at,
+        started_at=row.started_at,
+        completed_at=row.completed_at,
+        error=row.error
+    )
+
+
+async def wait_event(event: asyncio.Event, timeout: float) -> bool:
+    """
+    Wait until event is set or timeout elapses; True if it was set.
+    Unlike wait_for(), a cancellation arriving as the timeout fires is never swallowed.
+    """
+    waiter = asyncio.ensure_future(event.wait())
+    try:
+        await asyncio.wait({waiter}, timeout=timeout)
+    finally:
+        waiter.cancel()
+    return event.is_set()
+
+
+class WorkflowStore:
+    """
+    Workflow persistence backed by the workflows table.
+    Rows are upserted so a workflow can be saved repeatedly as it changes.
+    
+    Transitions are recorded with mark_dirty() into a write-behind buffer keyed
+    by workflow ID, so repeated transitions of one workflow coalesce into a
+    single row write. The buffer is flushed in one transaction on a timer or
+    once it holds flush_batch_size workflows.
+    """
+    
+    def __init__(
+        self,
+        session_factory=AsyncSessionLocal,
+        flush_interval: Optional[float] = None,
+        flush_batch_size: Optional[int] = None
+    ):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval or settings.WORKFLOW_FLUSH_INTERVAL_SECONDS
+        self.flush_batch_size = flush_batch_size or settings.WORKFLOW_FLUSH_BATCH_SIZE
+        
+        self._dirty: Dict[str, WorkflowState] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_requested: Optional[asyncio.Event] = None
+        self._stop_requested = False
+        self.transitions = 0
+        self.flushes = 0
+        self.rows_written = 0
+    
+    def mark_dirty(self, workflow: WorkflowState):
+        """Record that a workflow changed; it is written on the next flush"""
+        self.transitions += 1
+        self._dirty[workflow.workflow_id] = workflow
+        if len(self._dirty) >= self.flush_batch_size and self._flush_requested:
+            self._flush_requested.set()
+    
+    def discard(self, workflow_ids: Iterable[str]):
+        """Drop buffered writes for workflows that were saved directly"""
+        for workflow_id in workflow_ids:
+            self._dirty.pop(workflow_id, None)
+    
+    async def flush(self) -> int:
+        """Write every buffered workflow in one transaction"""
+        async with self._flush_lock:
+            if not self._dirty:
+                return 0
+            batch, self._dirty = self._dirty, {}
+            try:
+                written = await self.save_many(batch.values())
+            except Exception:
+                # Keep unsaved changes unless a newer transition superseded them
+                for workflow_id, workflow in batch.items():
+                    self._dirty.setdefault(workflow_id, workflow)
+                raise
+            self.flushes += 1
+            self.rows_written += written
+            return written
+    
+    async def save_through(self, workflows: List[WorkflowState]) -> int:
+        """
+        Save workflows now and drop their buffered writes.
+        Holds the flush lock, so a flush that captured an older state of the
+        same workflows cannot commit after this write.
+        """
+        async with self._flush_lock:
+            written = await self.save_many(workflows)
+            self.discard(w.workflow_id for w in workflows)
+            return written
+    
+    async def run_flusher(self, on_error=None):
+        """Flush on a timer, or early when the buffer reaches its size threshold, until stop_flusher()"""
+        self._flush_requested = asyncio.Event()
+        try:
+            while not self._stop_requested:
+                await wait_event(self._flush_requested, self.flush_interval)
+                self._flush_requested.clear()
+                
+                try:
+                    await self.flush()
+                except Exception as e:
+                    if on_error:
+                        on_error(e)
+        finally:
+            self._flush_requested = None
+            self._stop_requested = False
+    
+    def stop_flusher(self):
+        """Ask run_flusher() to return once its current flush is done"""
+        self._stop_requested = True
+        if self._flush_requested is not None:
+            self._flush_requested.set()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Write-behind buffer statistics"""
+        return {
+            "pending_writes": len(self._dirty),
+            "transitions": self.transitions,
+            "flushes": self.flushes,
+            "rows_written": self.rows_written
+        }
+    
+    async def save_many(self, workflows: Iterable[WorkflowState]) -> int:
+        """Upsert a group of workflows in one transaction"""
+        rows = [workflow_to_row(w) for w in workflows]
+        if not rows:
+            return 0
+        
+        stmt = sqlite_insert(WorkflowDB)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["workflow_id"],
+            set_={
+                column: stmt.excluded[column]
+                for column in rows[0]
+                if column != "workflow_id"
+            }
+        )
+        async with self.session_factory() as session:
+            await session.execute(stmt, rows)
+            await session.commit()
+        return len(rows)
+    
+    async def load(self, workflow_id: str) -> Optional[WorkflowState]:
+        """Load a persisted workflow, or None if it was never stored"""
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(WorkflowDB).where(WorkflowDB.workflow_id == workflow_id)
+            )
+            row = result.scalar_one_or_none()
+        return row_to_workflow(row) if row else None
+    
+    async def purge_expired(self, retention_days: int) -> int:
+        """Delete finished workflows older than the retention window"""
+        cutoff = datetime.utcnow() - timedelta(days=retention_days)
+        async with self.session_factory() as session:
+            result = await session.execute(
+                delete(WorkflowDB).where(
+                    WorkflowDB.completed_at.is_not(None),
+                    WorkflowDB.completed_at < cutoff
+                )
+            )
+            await session.commit()
+        return result.rowcount
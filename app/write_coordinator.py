@@ -0,0 +1,160 @@
+"""
+Write Coordinator
+Group-commits single-statement executor writes through one writer coroutine
+"""
+from typing import Any, Dict, List, Optional
+from sqlalchemy.exc import OperationalError
+from app.config import settings
+from app.database import AsyncSessionLocal
+import asyncio
+import contextvars
+import random
+
+# Retries for a whole group that loses the SQLite lock to another process
+WRITE_RETRY_ATTEMPTS = 8
+WRITE_RETRY_BACKOFF = 0.01  # seconds, doubled per attempt
+
+
+class PendingWrite:
+    """A statement waiting for the next group commit"""
+    __slots__ = ("statement", "future")
+    
+    def __init__(self, statement, future: asyncio.Future):
+        self.statement = statement
+        self.future = future
+
+
+class WriteCoordinator:
+    """
+    Single writer that coalesces concurrent write statements into one transaction.
+    
+    submit() enqueues a statement and waits. The writer takes everything queued,
+    waits up to max_delay for more (or until max_batch), executes each statement
+    in order and commits once. Each caller gets its own result or exception:
+    SQLite aborts only the failing statement, so one bad write (e.g. a duplicate
+    key) does not fail the rest of the group. If the commit itself fails, every
+    caller in the group gets that error.
+    """
+    
+    def __init__(
+        self,
+        session_factory=AsyncSessionLocal,
+        max_batch: Optional[int] = None,
+        max_delay: Optional[float] = None
+    ):
+        self.session_factory = session_factory
+        self.max_batch = max_batch or settings.WRITE_BATCH_MAX_SIZE
+        self.max_delay = settings.WRITE_BATCH_MAX_DELAY_MS / 1000 if max_delay is None else max_delay
+        
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.groups = 0
+        self.writes = 0
+        self.failed_writes = 0
+        self.largest_group = 0
+    
+    def start(self):
+        """Start the writer in the running event loop (idempotent)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._writer and not self._writer.done():
+            return
+        self._queue = asyncio.Queue()
+        self._loop = loop
+        # A fresh context, so the writer never inherits the workflow (log and
+        # trace context) of whichever submit happened to start it
+        self._writer = loop.create_task(self._run(), context=contextvars.Context())
+    
+    async def shutdown(self):
+        """Commit whatever is queued, then stop the writer"""
+        if not self._writer:
+            return
+        # A writer left over from an earlier (closed) event loop is simply dropped
+        if self._loop is asyncio.get_running_loop():
+            await self._queue.join()
+            self._writer.cancel()
+            await asyncio.gather(self._writer, return_exceptions=True)
+        self._writer = None
+        self._loop = None
+    
+    async def submit(self, statement) -> Any:
+        """Execute a statement in the next group commit and return its result"""
+        self.start()
+        future = self._loop.create_future()
+        self._queue.put_nowait(PendingWrite(statement, future))
+        return await future
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Group commit statistics"""
+        return {
+            "queued": self._queue.qsize() if self._queue else 0,
+            "groups": self.groups,
+            "writes": self.writes,
+            "failed_writes": self.failed_writes,
+            "average_group_size": self.writes / self.groups if self.groups else 0.0,
+            "largest_group": self.largest_group
+        }
+    
+    def _drain(self, group: List[PendingWrite]):
+        """Move already-queued writes into the group, up to max_batch"""
+        while len(group) < self.max_batch and not self._queue.empty():
+            group.append(self._queue.get_nowait())
+    
+    async def _run(self):
+        """Collect groups and commit them one at a time"""
+        while True:
+            group = [await self._queue.get()]
+            self._drain(group)
+            if len(group) < self.max_batch and self.max_delay > 0:
+                await asyncio.sleep(self.max_delay)
+                self._drain(group)
+            
+            try:
+                await self._commit_group(group)
+            finally:
+                for _ in group:
+                    self._queue.task_done()
+    
+    async def _commit_group(self, group: List[PendingWrite]):
+        """Execute a group in one transaction and resolve each caller"""
+        for attempt in range(WRITE_RETRY_ATTEMPTS):
+            outcomes: List[Any] = []
+            try:
+                async with self.session_factory() as session:
+                    # Core execution on the connection skips ORM session synchronization
+                    connection = await session.connection()
+                    for pending in group:
+                        try:
+                            outcomes.append(await connection.execute(pending.statement))
+                        except OperationalError as e:
+                            if "database is locked" in str(e):
+                                raise
+                            outcomes.append(e)
+                        except Exception as e:
+                            outcomes.append(e)
+                    await session.commit()
+                break
+            except OperationalError as e:
+                if "database is locked" not in str(e) or attempt == WRITE_RETRY_ATTEMPTS - 1:
+                    outcomes = [e] * len(group)
+                    break
+                await asyncio.sleep(WRITE_RETRY_BACKOFF * (2 ** attempt) * random.random())
+            except Exception as e:
+                outcomes = [e] * len(group)
+                break
+        
+        self.groups += 1
+        self.largest_group = max(self.largest_group, len(group))
+        for pending, outcome in zip(group, outcomes):
+            self.writes += 1
+            if pending.future.done():
+                continue
+            if isinstance(outcome, Exception):
+                self.failed_writes += 1
+                pending.future.set_exception(outcome)
+            else:
+                pending.future.set_result(outcome)
+
+
+# Global coordinator instance
+write_coordinator = WriteCoordinator()
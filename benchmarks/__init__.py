@@ -0,0 +1,28 @@
+"""
+Benchmarks
+Micro-benchmarks for hot paths; run each module with python -m benchmarks.<name>
+"""
+import os
+import subprocess
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Point the app at a throwaway database before any app module is imported.
+# Python imports this package before any benchmark module in it.
+TEMP_DIR = tempfile.mkdtemp(prefix="mcp_bench_")
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{os.path.join(TEMP_DIR, 'bench.db')}")
+os.environ.setdefault("CSV_PATH", os.path.join(ROOT, "mcp_dataset.csv"))
+os.environ.setdefault("DEBUG", "false")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+
+def git_commit() -> str:
+    """Short hash of the checked-out commit, recorded in JSON reports"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
@@ -0,0 +1,67 @@
+"""
+Analytics Benchmark
+Times column-store group-bys over a synthetic customer population.
+    
+    python -m benchmarks.bench_analytics --customers 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.analytics import CustomerColumnStore
+from app.models.customer import CustomerFilters
+
+QUERIES = [
+    ("total_spent by industry", dict(metric="total_spent", agg="sum", group_by=["industry"])),
+    ("loyalty_points by plan", dict(metric="loyalty_points", agg="mean", group_by=["subscription_plan"])),
+    ("credit exposure by country", dict(metric="credit_limit", agg="sum", group_by=["country"])),
+    ("active customers by plan, status", dict(agg="count", group_by=["subscription_plan", "status"],
+                                             filters=CustomerFilters(status="active"))),
+    ("p95 total_spent by industry", dict(metric="total_spent", agg="percentile", q=95, group_by=["industry"])),
+]
+
+
+def synthetic_customers(count: int, seed: int = 7) -> pd.DataFrame:
+    """Random customers with realistic cardinalities"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "mcp_id": [f"CUST{i:07d}" for i in range(count)],
+        "status": rng.choice(["active", "inactive"], count),
+        "industry": rng.choice(["IT", "Retail", "Finance", "Healthcare", "Manufacturing", "Education", "Energy"], count),
+        "country": rng.choice([f"Country{i}" for i in range(240)], count),
+        "subscription_plan": rng.choice(["Basic", "Standard", "Premium"], count),
+        "region": rng.choice([f"Region{i}" for i in range(5000)], count),
+        "preferred_category": rng.choice(["Books", "Electronics", "Clothing", "Home", "Sports", "Toys"], count),
+        "credit_limit": rng.uniform(0, 50000, count).round(2),
+        "total_spent": rng.uniform(0, 20000, count).round(2),
+        "total_transactions": rng.integers(0, 500, count),
+        "loyalty_points": rng.integers(0, 1000, count)
+    })
+
+
+def main():
+    """Run the benchmark from the command line"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--customers", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    
+    df = synthetic_customers(args.customers)
+    store = CustomerColumnStore()
+    started = time.perf_counter()
+    store.load_frame(df)
+    print(f"Loaded {args.customers:,} customers in {(time.perf_counter() - started) * 1000:.0f} ms")
+    
+    for label, query in QUERIES:
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            store.aggregate(**query)
+            timings.append((time.perf_counter() - started) * 1000)
+        print(f"{label:<36} best {min(timings):7.1f} ms  median {sorted(timings)[len(timings) // 2]:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
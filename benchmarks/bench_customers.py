@@ -0,0 +1,94 @@
+"""
+Customer Page Benchmark
+Compares rows/sec for limit=1000 customer pages on the validated ORM path
+and the pre-serialized fast path, in-process and over the ASGI app.
+    
+    python -m benchmarks.bench_customers --pages 20
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import time
+from typing import List
+
+import httpx
+from pydantic import TypeAdapter
+from sqlalchemy import select
+
+from app.database import init_db, load_csv_data, AsyncSessionLocal, CustomerDB
+from app.models.customer import Customer
+from app.queries import profile_query
+from app.responses import dumps
+from main import app
+
+PAGE_SIZE = 1000
+CSV_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mcp_dataset.csv")
+
+customer_list = TypeAdapter(List[Customer])
+
+
+async def validated_page(offset: int) -> bytes:
+    """ORM objects copied into Customer models, re-validated and dumped like response_model"""
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(CustomerDB).offset(offset).limit(PAGE_SIZE))
+        customers = [Customer.model_validate(c, from_attributes=True) for c in result.scalars().all()]
+    return customer_list.dump_json(customer_list.validate_python(customers))
+
+
+async def fast_page(offset: int) -> bytes:
+    """Row mappings serialized straight to JSON"""
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(profile_query().offset(offset).limit(PAGE_SIZE))
+        return dumps([dict(row) for row in result.mappings()])
+
+
+async def rows_per_second(fetch, pages: int) -> float:
+    """Fetch pages pages of PAGE_SIZE rows and return rows per second"""
+    started = time.perf_counter()
+    for page in range(pages):
+        await fetch((page * PAGE_SIZE) % 4000)
+    return pages * PAGE_SIZE / (time.perf_counter() - started)
+
+
+async def http_rows_per_second(pages: int) -> float:
+    """Rows per second through GET /api/customers?limit=1000"""
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        started = time.perf_counter()
+        for page in range(pages):
+            response = await client.get("/api/customers", params={"skip": (page * PAGE_SIZE) % 4000, "limit": PAGE_SIZE})
+            response.raise_for_status()
+        return pages * PAGE_SIZE / (time.perf_counter() - started)
+
+
+async def run(pages: int):
+    """Load the dataset and time each path"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        await init_db()
+        await load_csv_data(csv_path=CSV_PATH)
+    
+    # Warm up both paths before timing
+    await validated_page(0)
+    await fast_page(0)
+    
+    validated = await rows_per_second(validated_page, pages)
+    fast = await rows_per_second(fast_page, pages)
+    http = await http_rows_per_second(pages)
+    
+    print(f"Page size: {PAGE_SIZE}, pages per run: {pages}")
+    print(f"Validated ORM path: {validated:,.0f} rows/sec")
+    print(f"Pre-serialized path: {fast:,.0f} rows/sec ({fast / validated:.2f}x)")
+    print(f"GET /api/customers over ASGI: {http:,.0f} rows/sec")
+
+
+def main():
+    """Run the benchmark from the command line"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.pages))
+
+
+if __name__ == "__main__":
+    main()
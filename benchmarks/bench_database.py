@@ -0,0 +1,113 @@
+"""
+Database Profile Benchmark
+Concurrent read/write throughput against a temporary SQLite file under each
+DB_PROFILE: stock SQLite, and WAL with a single writer plus a read pool.
+    
+    python -m benchmarks.bench_database --readers 20 --writers 10 --seconds 5
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.database import (
+    Base, CustomerDB, SQLITE_PROFILES, create_engines,
+    bulk_insert_customers, prepare_customer_frame, _read_csv
+)
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mcp_dataset.csv")
+
+
+def percentile(samples, q: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+
+async def run_profile(profile: str, readers: int, writers: int, seconds: float) -> dict:
+    """Hammer one fresh database with concurrent readers and writers"""
+    url = f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(prefix='mcp_db_bench_'), 'bench.db')}"
+    writer_engine, reader_engine = create_engines(url, profile)
+    write_sessions = async_sessionmaker(writer_engine, class_=AsyncSession, expire_on_commit=False)
+    read_sessions = async_sessionmaker(reader_engine, class_=AsyncSession, expire_on_commit=False)
+    
+    df = prepare_customer_frame(_read_csv(CSV_PATH))
+    async with writer_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await bulk_insert_customers(conn, df, 10000)
+    customer_ids = df["mcp_id"].tolist()
+    
+    stats = {"reads": 0, "writes": 0, "locked": 0, "read_ms": [], "write_ms": []}
+    deadline = time.monotonic() + seconds
+    
+    async def reader():
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            async with read_sessions() as session:
+                await session.execute(select(CustomerDB).where(CustomerDB.mcp_id == random.choice(customer_ids)))
+            stats["read_ms"].append((time.perf_counter() - started) * 1000)
+            stats["reads"] += 1
+    
+    async def writer():
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            try:
+                async with write_sessions() as session:
+                    await session.execute(
+                        update(CustomerDB)
+                        .where(CustomerDB.mcp_id == random.choice(customer_ids))
+                        .values(loyalty_points=random.randint(0, 1000))
+                    )
+                    await session.commit()
+            except OperationalError:
+                # "database is locked": counted, not retried, to expose stalls
+                stats["locked"] += 1
+                continue
+            stats["write_ms"].append((time.perf_counter() - started) * 1000)
+            stats["writes"] += 1
+    
+    started = time.perf_counter()
+    await asyncio.gather(*[reader() for _ in range(readers)], *[writer() for _ in range(writers)])
+    elapsed = time.perf_counter() - started
+    
+    await writer_engine.dispose()
+    if reader_engine is not writer_engine:
+        await reader_engine.dispose()
+    
+    return {
+        "reads_per_sec": stats["reads"] / elapsed,
+        "writes_per_sec": stats["writes"] / elapsed,
+        "locked": stats["locked"],
+        "read_p99_ms": percentile(stats["read_ms"], 99),
+        "write_p99_ms": percentile(stats["write_ms"], 99)
+    }
+
+
+def main():
+    """Run the benchmark from the command line"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--readers", type=int, default=20)
+    parser.add_argument("--writers", type=int, default=10)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+    
+    print(f"{args.readers} readers, {args.writers} writers, {args.seconds:.0f}s per profile")
+    for profile in SQLITE_PROFILES:
+        report = asyncio.run(run_profile(profile, args.readers, args.writers, args.seconds))
+        print(
+            f"{profile:<11} reads {report['reads_per_sec']:8,.0f}/s (p99 {report['read_p99_ms']:6.1f} ms)  "
+            f"writes {report['writes_per_sec']:7,.0f}/s (p99 {report['write_p99_ms']:6.1f} ms)  "
+            f"locked errors {report['locked']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
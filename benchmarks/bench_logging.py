@@ -0,0 +1,85 @@
+"""
+Logging Benchmark
+Workflows/sec through the orchestrator under different logging setups.
+    
+    python -m benchmarks.bench_logging --workflows 1000
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import time
+
+from sqlalchemy import select
+
+from app.database import init_db, load_csv_data, AsyncSessionLocal, CustomerDB
+from app.log import configure_logging, stop_logging
+from app.models.workflow import WorkflowRequest, WorkflowStatus
+from app.orchestrator import OrchestrationEngine
+from benchmarks import TEMP_DIR
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mcp_dataset.csv")
+
+# (label, configure_logging options)
+SETUPS = [
+    ("DEBUG, synchronous handler", dict(level="DEBUG", queued=False)),
+    ("DEBUG, queued handler", dict(level="DEBUG")),
+    ("DEBUG, 10% sampled", dict(level="DEBUG", sample_rate=0.1)),
+    ("INFO, queued handler", dict(level="INFO")),
+    ("off", dict(level="CRITICAL")),
+]
+
+
+async def run_workflows(customer_ids, count: int) -> float:
+    """Submit count update workflows and return workflows per second"""
+    engine = OrchestrationEngine(max_concurrent_workflows=20, max_queued_workflows=count)
+    terminal = (WorkflowStatus.COMPLETED, WorkflowStatus.FAILED, WorkflowStatus.CANCELLED)
+    
+    started = time.perf_counter()
+    for i in range(count):
+        await engine.create_workflow(WorkflowRequest(
+            name=f"Bench update {i}",
+            operation="update",
+            target_customer_id=customer_ids[i % len(customer_ids)],
+            parameters={"loyalty_points": i}
+        ), None)
+    while engine.count_workflows(*terminal) < count:
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - started
+    
+    await engine.shutdown()
+    return count / elapsed
+
+
+async def run(count: int):
+    """Load the dataset and time each logging setup"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        await init_db()
+        await load_csv_data(csv_path=CSV_PATH)
+    async with AsyncSessionLocal() as session:
+        customer_ids = (await session.execute(select(CustomerDB.mcp_id))).scalars().all()
+    
+    log_path = os.path.join(TEMP_DIR, "bench.log")
+    results = []
+    with open(log_path, "w") as sink:
+        for label, options in SETUPS:
+            configure_logging(stream=sink, **options)
+            results.append((label, await run_workflows(customer_ids, count)))
+            stop_logging()
+    
+    print(f"{count} update workflows per setup (log output to {log_path})")
+    for label, rate in results:
+        print(f"{label:<28} {rate:8,.0f} workflows/sec")
+
+
+def main():
+    """Run the benchmark from the command line"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workflows", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(run(args.workflows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Message Benchmark
+Compares PlannerAgent.process_message round-trips with ACL and internal messages.
+    
+    python -m benchmarks.bench_messages --messages 50000
+"""
+import argparse
+import asyncio
+import time
+
+from app.agents.planner_agent import PlannerAgent
+from app.models.message import AgentMessage, InternalMessage, MessageType
+
+PARAMETERS = {"customer_id": "MCP001", "loyalty_points": 100}
+
+
+def planning_message(message_class, planner: PlannerAgent, i: int):
+    """Build the orchestrator's plan_workflow request"""
+    return message_class(
+        message_type=MessageType.REQUEST,
+        sender_id="orchestrator",
+        sender_type="orchestrator",
+        receiver_id=planner.agent_id,
+        receiver_type="planner",
+        workflow_id=f"wf_{i}",
+        action="plan_workflow",
+        payload={
+            "operation": "update",
+            "target_customer_id": "MCP001",
+            "parameters": PARAMETERS
+        }
+    )
+
+
+async def round_trips(message_class, planner: PlannerAgent, count: int) -> float:
+    """Send count messages through process_message and return messages per second"""
+    started = time.perf_counter()
+    for i in range(count):
+        response = await planner.process_message(planning_message(message_class, planner, i))
+        if not response.success:
+            raise RuntimeError(response.error)
+    elapsed = time.perf_counter() - started
+    return count / elapsed
+
+
+def main():
+    """Run the benchmark from the command line"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=50000)
+    args = parser.parse_args()
+    
+    planner = PlannerAgent()
+    acl_rate = asyncio.run(round_trips(AgentMessage, planner, args.messages))
+    internal_rate = asyncio.run(round_trips(InternalMessage, planner, args.messages))
+    
+    print(f"Round-trips per run: {args.messages}")
+    print(f"ACL messages:      {acl_rate:,.0f} messages/sec")
+    print(f"Internal messages: {internal_rate:,.0f} messages/sec ({internal_rate / acl_rate:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Orchestrator Benchmark
+Times OrchestrationEngine.create_workflow, _plan_workflow, _execute_workflow
+and get_workflow_status directly (no HTTP) against an in-memory SQLite store
+and a no-op executor, while the engine holds 1k to 1M workflows, so per-call
+costs that grow with the number of workflows show up.
+    
+    python -m benchmarks.bench_orchestrator --sizes 1000,10000,100000,1000000 --output benchmarks/baselines/orchestrator.json
+    python -m benchmarks.bench_orchestrator --compare benchmarks/baselines/orchestrator.json
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import random
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.pool import StaticPool
+
+from app.agents.executor_agent import ExecutorAgent
+from app.database import Base
+from app.models.workflow import WorkflowRequest, WorkflowStatus
+from app.orchestrator import OrchestrationEngine
+from app.workflow_store import WorkflowStore
+from benchmarks import git_commit
+
+DEFAULT_SIZES = "1000,10000,100000,1000000"
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "orchestrator.json")
+
+REQUEST = WorkflowRequest(
+    name="Bench update",
+    operation="update",
+    target_customer_id="MCP000001",
+    parameters={"loyalty_points": 100}
+)
+
+
+class NoOpExecutor(ExecutorAgent):
+    """Executor that reports success without touching the database"""
+    
+    async def execute_task(self, task: Dict[str, Any], db_session: Optional[AsyncSession] = None) -> Dict[str, Any]:
+        """Echo the operation back as a successful result"""
+        operation = task.get("parameters", {}).get("operation")
+        return {
+            "status": "success",
+            "result": {"operation": operation, "success": True},
+            "message": f"Successfully executed {operation} operation"
+        }
+
+
+def timings(samples: List[float]) -> Dict[str, float]:
+    """Per-call latency summary in microseconds"""
+    latencies = np.array(samples) * 1e6
+    p50, p99 = np.percentile(latencies, [50, 99])
+    return {
+        "calls": len(samples),
+        "mean_us": round(float(latencies.mean()), 2),
+        "p50_us": round(float(p50), 2),
+        "p99_us": round(float(p99), 2),
+        "ops_per_sec": round(1e6 / float(latencies.mean()), 1)
+    }
+
+
+def populate(engine: OrchestrationEngine, count: int):
+    """Register count finished workflows, as a long-running engine would hold"""
+    ids = []
+    for _ in range(count):
+        workflow = engine._new_workflow(REQUEST)
+        engine._set_status(workflow, WorkflowStatus.COMPLETED)
+        ids.append(workflow.workflow_id)
+    # They are only held for scale; skip writing them to the store
+    engine.store.discard(ids)
+    return ids
+
+
+async def bench_size(session_factory, held: int, calls: int, seed: int) -> Dict[str, Any]:
+    """Time each engine entry point while held workflows sit in memory"""
+    engine = OrchestrationEngine(
+        max_queued_workflows=calls + 1,
+        store=WorkflowStore(session_factory=session_factory)
+    )
+    engine.executor_agent = NoOpExecutor()
+    engine.max_workflows_in_memory = held + 4 * calls
+    
+    populate_started = time.perf_counter()
+    held_ids = populate(engine, held)
+    populate_seconds = time.perf_counter() - populate_started
+    rng = random.Random(seed)
+    gc.collect()
+    
+    results: Dict[str, Any] = {}
+    async with session_factory() as session:
+        # create_workflow: plan and enqueue. Nothing in it suspends, so the
+        # workers started on first use never run inside this loop
+        samples = []
+        for _ in range(calls):
+            started = time.perf_counter()
+            await engine.create_workflow(REQUEST, session)
+            samples.append(time.perf_counter() - started)
+        results["create_workflow"] = timings(samples)
+        queued_ids = list(engine._queued_entries)
+        
+        # Stop the workers before they drain the queue; queued workflows stay pending
+        await engine.shutdown()
+        
+        fresh = [engine._new_workflow(REQUEST) for _ in range(calls)]
+        samples = []
+        for workflow in fresh:
+            started = time.perf_counter()
+            await engine._plan_workflow(workflow, session)
+            samples.append(time.perf_counter() - started)
+        results["plan_workflow"] = timings(samples)
+        
+        samples = []
+        for workflow in fresh:
+            started = time.perf_counter()
+            await engine._execute_workflow(workflow, session)
+            samples.append(time.perf_counter() - started)
+        results["execute_workflow"] = timings(samples)
+        
+        for label, ids in (("get_workflow_status", held_ids), ("get_workflow_status_queued", queued_ids)):
+            samples = []
+            for workflow_id in rng.choices(ids, k=calls):
+                started = time.perf_counter()
+                await engine.get_workflow_status(workflow_id)
+                samples.append(time.perf_counter() - started)
+            results[label] = timings(samples)
+    
+    return {
+        "held_workflows": held,
+        "queued_workflows": len(queued_ids),
+        "populate_seconds": round(populate_seconds, 3),
+        "operations": results
+    }
+
+
+async def run(sizes: List[int], calls: int, seed: int) -> Dict[str, Any]:
+    """Benchmark every size on a fresh engine and in-memory store"""
+    db_engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with db_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+    
+    runs = []
+    for size in sizes:
+        runs.append(await bench_size(session_factory, size, calls, seed))
+        gc.collect()
+    await db_engine.dispose()
+    
+    return {
+        "benchmark": "bench_orchestrator",
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "config": {"sizes": sizes, "calls": calls, "seed": seed},
+        "runs": runs
+    }
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any]):
+    """Print mean latency per operation against a baseline report"""
+    previous = {run["held_workflows"]: run["operations"] for run in baseline["runs"]}
+    print(f"Compared with baseline {baseline.get('commit', '?')} ({baseline.get('timestamp', '?')})")
+    for run in report["runs"]:
+        before = previous.get(run["held_workflows"])
+        if before is None:
+            continue
+        print(f"  {run['held_workflows']:>9,} held")
+        for name, stats in run["operations"].items():
+            if name in before:
+                ratio = stats["mean_us"] / before[name]["mean_us"]
+                print(f"    {name:<28} {before[name]['mean_us']:>9.1f} -> {stats['mean_us']:>9.1f} us ({ratio:.2f}x)")
+
+
+def main():
+    """Run the benchmark from the command line"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"held workflow counts (default {DEFAULT_SIZES})")
+    parser.add_argument("--calls", type=int, default=2000, help="calls timed per operation and size")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the JSON report here (e.g. to refresh the baseline)")
+    parser.add_argument("--compare", nargs="?", const=BASELINE_PATH, help="baseline report to compare against")
+    args = parser.parse_args()
+    
+    sizes = [int(size) for size in args.sizes.split(",")]
+    report = asyncio.run(run(sizes, args.calls, args.seed))
+    
+    print(json.dumps(report, indent=2))
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            f.write(json.dumps(report, indent=2) + "\n")
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Group Commit Benchmark
+Concurrent single-customer updates through ExecutorAgent with the write
+coordinator off (commit per operation) and on (group commit).
+    
+    python -m benchmarks.bench_writes --concurrency 100 --operations 3000
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import time
+
+from sqlalchemy import select
+
+from app.agents.executor_agent import ExecutorAgent
+from app.config import settings
+from app.database import init_db, load_csv_data, AsyncSessionLocal, CustomerDB
+from app.write_coordinator import write_coordinator
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mcp_dataset.csv")
+
+
+async def run_updates(executor: ExecutorAgent, customer_ids, concurrency: int, operations: int) -> dict:
+    """operations updates spread over concurrency workers, each with its own session"""
+    failures = 0
+    
+    async def worker(offset: int):
+        nonlocal failures
+        async with AsyncSessionLocal() as session:
+            for i in range(offset, operations, concurrency):
+                try:
+                    await executor.execute_operation({
+                        "operation": "update",
+                        "parameters": {"customer_id": customer_ids[i % len(customer_ids)], "loyalty_points": i}
+                    }, db_session=session)
+                except Exception:
+                    failures += 1
+    
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(offset) for offset in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {"writes_per_sec": operations / elapsed, "failures": failures}
+
+
+async def run(concurrency: int, operations: int):
+    """Load the dataset and time both modes"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        await init_db()
+        await load_csv_data(csv_path=CSV_PATH)
+        executor = ExecutorAgent()
+    async with AsyncSessionLocal() as session:
+        customer_ids = (await session.execute(select(CustomerDB.mcp_id))).scalars().all()
+    
+    print(f"{operations} updates, {concurrency} concurrent callers, DB_PROFILE={settings.DB_PROFILE}")
+    for enabled in (False, True):
+        settings.WRITE_COORDINATOR_ENABLED = enabled
+        # Agent logging prints; keep it out of the timed loop's output
+        with contextlib.redirect_stdout(io.StringIO()):
+            report = await run_updates(executor, customer_ids, concurrency, operations)
+        label = "group commit" if enabled else "commit per op"
+        print(f"{label:<14} {report['writes_per_sec']:8,.0f} writes/sec  failures {report['failures']}")
+    
+    stats = write_coordinator.get_stats()
+    print(f"Groups: {stats['groups']}, average size {stats['average_group_size']:.1f}, largest {stats['largest_group']}")
+    await write_coordinator.shutdown()
+
+
+def main():
+    """Run the benchmark from the command line"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--operations", type=int, default=3000)
+    args = parser.parse_args()
+    asyncio.run(run(args.concurrency, args.operations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+API Load Test
+Drives a weighted mix of customer reads, list pages and workflow creations
+against the in-process app at fixed concurrency and reports throughput and
+latency percentiles as JSON, so runs can be compared across commits.
+    
+    python -m benchmarks.load_test --concurrency 32 --requests 5000 --mix read=60,list=30,workflow=10 --output load.json
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import platform
+import random
+import time
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+import httpx
+import numpy as np
+from sqlalchemy import select
+
+from app.config import settings
+from app.database import AsyncSessionLocal, CustomerDB
+from app.orchestrator import orchestrator
+from main import app, lifespan
+from benchmarks import git_commit
+
+OPERATIONS = ("read", "list", "workflow")
+DEFAULT_MIX = "read=60,list=30,workflow=10"
+DRAIN_TIMEOUT_SECONDS = 120
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """Parse "read=60,list=30,workflow=10" into normalized weights"""
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation in mix: {name} (expected one of {', '.join(OPERATIONS)})")
+        weights[name] = float(weight)
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("Mix weights must add up to more than zero")
+    return {name: weight / total for name, weight in weights.items() if weight > 0}
+
+
+def summarize(samples: List[Tuple[float, bool]], elapsed: float) -> Dict[str, float]:
+    """Count, error count, throughput and latency percentiles (ms) for one operation"""
+    if not samples:
+        return {"requests": 0, "errors": 0, "throughput_rps": 0.0}
+    latencies = np.array([latency for latency, _ in samples]) * 1000
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {
+        "requests": len(samples),
+        "errors": sum(1 for _, ok in samples if not ok),
+        "throughput_rps": round(len(samples) / elapsed, 1),
+        "mean_ms": round(float(latencies.mean()), 3),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "max_ms": round(float(latencies.max()), 3)
+    }
+
+
+async def wait_for_idle(timeout: float = DRAIN_TIMEOUT_SECONDS):
+    """Wait until the orchestrator has no pending or running workflows"""
+    deadline = time.monotonic() + timeout
+    while orchestrator.get_queue_stats()["active_workflows"] and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+
+
+async def run_load(
+    concurrency: int,
+    total_requests: int,
+    mix: Dict[str, float],
+    page_size: int,
+    seed: int,
+    drain: bool
+) -> Dict[str, object]:
+    """Start the app, drive total_requests requests from concurrency workers and report"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        async with lifespan(app):
+            async with AsyncSessionLocal() as db:
+                customer_ids = (await db.execute(select(CustomerDB.mcp_id))).scalars().all()
+            
+            rng = random.Random(seed)
+            names = list(mix)
+            plan = rng.choices(names, weights=[mix[n] for n in names], k=total_requests)
+            targets = [rng.choice(customer_ids) for _ in range(total_requests)]
+            skips = [rng.randrange(0, max(1, len(customer_ids) - page_size)) for _ in range(total_requests)]
+            
+            samples: Dict[str, List[Tuple[float, bool]]] = {name: [] for name in names}
+            next_request = iter(range(total_requests))
+            
+            async def send(client: httpx.AsyncClient, i: int) -> httpx.Response:
+                operation = plan[i]
+                if operation == "read":
+                    return await client.get(f"/api/customers/{targets[i]}")
+                if operation == "list":
+                    return await client.get("/api/customers", params={"skip": skips[i], "limit": page_size})
+                return await client.post("/api/workflows", json={
+                    "name": f"Load update {i}",
+                    "operation": "update",
+                    "target_customer_id": targets[i],
+                    "parameters": {"loyalty_points": i}
+                })
+            
+            async def worker(client: httpx.AsyncClient):
+                for i in next_request:
+                    started = time.perf_counter()
+                    try:
+                        response = await send(client, i)
+                        ok = response.status_code < 400
+                    except httpx.HTTPError:
+                        ok = False
+                    samples[plan[i]].append((time.perf_counter() - started, ok))
+            
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://load") as client:
+                started = time.perf_counter()
+                await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+                elapsed = time.perf_counter() - started
+                
+                drain_seconds = None
+                if drain:
+                    drain_started = time.perf_counter()
+                    await wait_for_idle()
+                    drain_seconds = round(time.perf_counter() - drain_started, 3)
+            
+            status_counts = orchestrator.get_status_counts()
+    
+    all_samples = [sample for group in samples.values() for sample in group]
+    return {
+        "benchmark": "load_test",
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "config": {
+            "concurrency": concurrency,
+            "requests": total_requests,
+            "mix": mix,
+            "page_size": page_size,
+            "seed": seed,
+            "db_profile": settings.DB_PROFILE,
+            "workflow_workers": settings.MAX_CONCURRENT_WORKFLOWS
+        },
+        "elapsed_seconds": round(elapsed, 3),
+        "overall": summarize(all_samples, elapsed),
+        "operations": {name: summarize(group, elapsed) for name, group in samples.items()},
+        "workflows": {
+            "drain_seconds": drain_seconds,
+            "by_status": status_counts
+        }
+    }
+
+
+def main():
+    """Run the load test from the command line"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"operation weights (default {DEFAULT_MIX})")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-drain", action="store_true", help="don't wait for queued workflows to finish")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args()
+    
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+    
+    report = asyncio.run(run_load(
+        args.concurrency, args.requests, mix, args.page_size, args.seed, not args.no_drain
+    ))
+    
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Pytest configuration
+Points the app at a throwaway database before any test imports an app module
+"""
+import asyncio
+import contextlib
+import io
+import os
+import tempfile
+
+import pytest
+
+_TEMP_DIR = tempfile.mkdtemp(prefix="mcp_tests_")
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{os.path.join(_TEMP_DIR, 'test.db')}")
+os.environ.setdefault("DEBUG", "false")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mcp_dataset.csv")
+
+# Manual script that drives a running server (python test_api.py)
+collect_ignore = ["test_api.py"]
+
+
+@pytest.fixture(scope="session")
+def csv_path() -> str:
+    """The sample customer CSV shipped with the repo"""
+    return CSV_PATH
+
+
+@pytest.fixture(scope="session")
+def sample_customers(csv_path):
+    """Create the schema and load the sample customers, once per test session"""
+    from app.database import engine, read_engine, init_db, load_csv_data
+    
+    async def setup():
+        with contextlib.redirect_stdout(io.StringIO()):
+            await init_db()
+            await load_csv_data(csv_path=csv_path)
+        await engine.dispose()
+        await read_engine.dispose()
+    
+    asyncio.run(setup())
+
+
+@pytest.fixture
+def call_api(sample_customers):
+    """Run requests(client) against the app in-process, from a cold customer cache"""
+    import httpx
+    from app.cache import customer_cache
+    from main import app
+    
+    def call(requests):
+        async def run():
+            customer_cache.clear()
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await requests(client)
+        
+        return asyncio.run(run())
+    
+    return call
+
+
+@pytest.fixture(autouse=True)
+def fresh_connection_pools():
+    """Each test runs its own event loop; pooled connections must not outlive it"""
+    yield
+    from app.database import engine, read_engine
+    
+    async def dispose():
+        await engine.dispose()
+        await read_engine.dispose()
+    
+    asyncio.run(dispose())
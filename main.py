@@ -2,18 +2,31 @@
 FastAPI Application
 Main API endpoints for the MCP Multi-Agent Orchestration system
 """
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Header, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse, PlainTextResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List
+from typing import List, Optional, Union
 from contextlib import asynccontextmanager
+from datetime import datetime
+import base64
+import binascii
 
 from app.config import settings
-from app.database import init_db, load_csv_data, get_db, CustomerDB
-from app.models.customer import Customer, CustomerCreate, CustomerUpdate
-from app.models.workflow import WorkflowRequest, WorkflowResponse
+from app.database import init_db, load_csv_data, get_db, get_read_db, read_engine, CustomerDB
+from app.models.customer import Customer, CustomerCreate, CustomerUpdate, CustomerPage, CustomerFilters
+from app.models.workflow import (
+    WorkflowRequest, WorkflowResponse, WorkflowStatus,
+    WorkflowBatchRequest, WorkflowBatchResponse
+)
 from app.orchestrator import orchestrator
+from app.cache import customer_cache
+from app.analytics import customer_analytics
+from app.queries import profile_query, parse_fields, filter_customers, PROFILE_FIELDS
+from app.responses import FastJSONResponse
+from app.export import export_customers, EXPORT_MEDIA_TYPES
+from app.metrics import registry as metrics_registry
+from app.tracing import tracer
 
 
 @asynccontextmanager
@@ -23,12 +36,16 @@ async def lifespan(app: FastAPI):
     print("🚀 Starting MCP Multi-Agent Orchestration System...")
     await init_db()
     await load_csv_data()
+    if settings.ANALYTICS_ENABLED:
+        await customer_analytics.load(read_engine)
+    orchestrator.start()
     print("✓ System ready!")
     
     yield
     
     # Shutdown
     print("👋 Shutting down...")
+    await orchestrator.shutdown()
 
 
 # Create FastAPI app
@@ -68,82 +85,191 @@ async def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy",
-        "timestamp": "2024-01-15T10:00:00Z"
+        "timestamp": datetime.utcnow().isoformat() + "Z"
     }
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus text-format metrics"""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(
+        metrics_registry.render(),
+        media_type="text/plain; version=0.0.4"
+    )
+
+
 # ============================================================================
 # CUSTOMER (MCP) ENDPOINTS
 # ============================================================================
 
-@app.get("/api/customers", response_model=List[Customer])
+def encode_cursor(mcp_id: str) -> str:
+    """Turn the last customer ID on a page into an opaque cursor token"""
+    return base64.urlsafe_b64encode(mcp_id.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    """Recover the customer ID a cursor token points after"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return base64.b64decode(padded.encode(), altchars=b"-_", validate=True).decode()
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@app.get("/api/customers", response_model=Union[CustomerPage, List[Customer]])
 async def list_customers(
     skip: int = 0,
     limit: int = 10,
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    filters: CustomerFilters = Depends(),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """List all customers with pagination"""
-    stmt = select(CustomerDB).offset(skip).limit(limit)
+    """
+    List customers with pagination.
+    
+    Passing cursor switches to keyset pagination ordered by mcp_id: an empty
+    cursor starts at the first page, and each response carries next_cursor
+    for the following one. Without cursor, skip/limit offset paging is used.
+    
+    fields= is a comma-separated column list; only those columns are loaded
+    (cursor mode always includes mcp_id). Filters are applied in SQL.
+    Rows are serialized straight to JSON; they were validated when written.
+    """
+    try:
+        columns = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if cursor is not None:
+        if "mcp_id" not in [column.name for column in columns]:
+            columns = (PROFILE_FIELDS["mcp_id"],) + columns
+        return await list_customers_after(cursor, limit, columns, filters, db)
+    
+    stmt = filter_customers(profile_query(columns), filters).offset(skip).limit(limit)
     result = await db.execute(stmt)
-    customers = result.scalars().all()
-    
-    return [
-        Customer(
-            mcp_id=c.mcp_id,
-            customer_name=c.customer_name,
-            email=c.email,
-            phone=c.phone,
-            credit_limit=c.credit_limit,
-            kyc_date=c.kyc_date,
-            status=c.status,
-            region=c.region,
-            industry=c.industry,
-            country=c.country,
-            zip_code=c.zip_code,
-            subscription_plan=c.subscription_plan,
-            signup_date=c.signup_date,
-            last_login=c.last_login,
-            total_transactions=c.total_transactions,
-            total_spent=c.total_spent,
-            preferred_category=c.preferred_category,
-            loyalty_points=c.loyalty_points,
-            data=c.data
-        )
-        for c in customers
-    ]
+    
+    return FastJSONResponse([dict(row) for row in result.mappings()])
+
+
+async def list_customers_after(
+    cursor: str,
+    limit: int,
+    columns: tuple,
+    filters: CustomerFilters,
+    db: AsyncSession
+) -> FastJSONResponse:
+    """Fetch the page of customers following a cursor"""
+    stmt = filter_customers(profile_query(columns), filters).order_by(CustomerDB.mcp_id).limit(limit + 1)
+    if cursor:
+        stmt = stmt.where(CustomerDB.mcp_id > decode_cursor(cursor))
+    result = await db.execute(stmt)
+    customers = [dict(row) for row in result.mappings()]
+    
+    # The extra row only tells us whether another page exists
+    has_more = len(customers) > limit
+    customers = customers[:limit]
+    
+    return FastJSONResponse({
+        "items": customers,
+        "next_cursor": encode_cursor(customers[-1]["mcp_id"]) if has_more and customers else None
+    })
+
+
+@app.get("/api/customers/export")
+async def export_customer_table(
+    format: str = "ndjson",
+    fields: Optional[str] = None,
+    filters: CustomerFilters = Depends()
+):
+    """
+    Stream every matching customer as NDJSON (default) or CSV.
+    Rows are read through a server-side cursor in EXPORT_BATCH_SIZE chunks,
+    so memory stays flat regardless of table size.
+    """
+    if format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unsupported format: {format}")
+    try:
+        columns = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    stmt = filter_customers(profile_query(columns), filters).order_by(CustomerDB.mcp_id)
+    
+    return StreamingResponse(
+        export_customers(stmt, columns, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="customers.{format}"'}
+    )
 
 
 @app.get("/api/customers/{customer_id}", response_model=Customer)
-async def get_customer(customer_id: str, db: AsyncSession = Depends(get_db)):
-    """Get a specific customer by ID"""
-    stmt = select(CustomerDB).where(CustomerDB.mcp_id == customer_id)
-    result = await db.execute(stmt)
-    customer = result.scalar_one_or_none()
+async def get_customer(
+    customer_id: str,
+    cache_control: Optional[str] = Header(default=None),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Get a specific customer by ID.
+    Served from the customer cache; send Cache-Control: no-cache to read the database.
+    """
+    bypass = cache_control is not None and "no-cache" in cache_control.lower()
+    profile = None if bypass else customer_cache.get(customer_id)
+    cache_status = "MISS" if profile is None else "HIT"
     
-    if not customer:
+    if profile is None:
+        profile = await customer_cache.get_profile(db, customer_id, bypass=True)
+    
+    if not profile:
         raise HTTPException(status_code=404, detail=f"Customer {customer_id} not found")
     
-    return Customer(
-        mcp_id=customer.mcp_id,
-        customer_name=customer.customer_name,
-        email=customer.email,
-        phone=customer.phone,
-        credit_limit=customer.credit_limit,
-        kyc_date=customer.kyc_date,
-        status=customer.status,
-        region=customer.region,
-        industry=customer.industry,
-        country=customer.country,
-        zip_code=customer.zip_code,
-        subscription_plan=customer.subscription_plan,
-        signup_date=customer.signup_date,
-        last_login=customer.last_login,
-        total_transactions=customer.total_transactions,
-        total_spent=customer.total_spent,
-        preferred_category=customer.preferred_category,
-        loyalty_points=customer.loyalty_points,
-        data=customer.data
-    )
+    return FastJSONResponse(profile, headers={"X-Cache": cache_status})
+
+
+@app.get("/api/cache/stats")
+async def get_cache_stats():
+    """Customer cache size and hit-rate statistics"""
+    return customer_cache.get_stats()
+
+
+# ============================================================================
+# ANALYTICS ENDPOINTS
+# ============================================================================
+
+@app.get("/api/analytics")
+async def get_analytics(
+    metric: Optional[str] = None,
+    agg: str = "count",
+    group_by: Optional[str] = None,
+    q: float = 50.0,
+    filters: CustomerFilters = Depends()
+):
+    """
+    Grouped customer aggregates from the in-memory column store.
+    
+    Example: /api/analytics?metric=total_spent&agg=sum&group_by=industry
+    agg is one of count, sum, mean, min, max, percentile (with q in 0-100);
+    group_by takes a comma-separated list of dimensions.
+    """
+    if not customer_analytics.loaded:
+        raise HTTPException(status_code=503, detail="Analytics snapshot not loaded")
+    
+    dimensions = [name.strip() for name in (group_by or "").split(",") if name.strip()]
+    try:
+        result = customer_analytics.aggregate(
+            metric=metric, agg=agg, group_by=dimensions, filters=filters, q=q
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return FastJSONResponse(result)
+
+
+@app.get("/api/analytics/stats")
+async def get_analytics_stats():
+    """Column store size and freshness"""
+    return customer_analytics.get_stats()
 
 
 # ============================================================================
@@ -163,6 +289,26 @@ async def create_workflow(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/workflows/batch", response_model=WorkflowBatchResponse)
+async def create_workflow_batch(request: WorkflowBatchRequest):
+    """Create and queue many workflows in one call"""
+    try:
+        return await orchestrator.create_workflow_batch(request)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/workflows/batch/{batch_id}", response_model=WorkflowBatchResponse)
+async def get_workflow_batch_status(batch_id: str):
+    """Get aggregated progress of a workflow batch"""
+    response = orchestrator.get_batch_status(batch_id)
+    
+    if not response:
+        raise HTTPException(status_code=404, detail=f"Batch {batch_id} not found")
+    
+    return response
+
+
 @app.get("/api/workflows/{workflow_id}", response_model=WorkflowResponse)
 async def get_workflow_status(workflow_id: str):
     """Get the current status of a workflow"""
@@ -174,10 +320,30 @@ async def get_workflow_status(workflow_id: str):
     return response
 
 
+@app.get("/api/workflows/{workflow_id}/trace")
+async def get_workflow_trace(workflow_id: str, format: str = "tree"):
+    """
+    Span timings recorded for a workflow or batch.
+    format=chrome returns Chrome trace-event JSON for chrome://tracing or Perfetto.
+    """
+    if format not in ("tree", "chrome"):
+        raise HTTPException(status_code=400, detail="format must be tree or chrome")
+    trace = tracer.get_trace(workflow_id)
+    if not trace:
+        raise HTTPException(status_code=404, detail=f"No trace recorded for {workflow_id}")
+    return trace.to_chrome() if format == "chrome" else trace.to_tree()
+
+
 @app.get("/api/workflows")
-async def list_workflows():
-    """List all workflows"""
-    return orchestrator.list_workflows()
+async def list_workflows(status: Optional[WorkflowStatus] = None):
+    """List all workflows, optionally filtered by status"""
+    return orchestrator.list_workflows(status)
+
+
+@app.get("/api/orchestrator/queue")
+async def get_queue_stats():
+    """Get work queue depth and worker utilization"""
+    return orchestrator.get_queue_stats()
 
 
 # ============================================================================
@@ -191,16 +357,40 @@ async def get_agents_status():
         "planner": {
             "agent_id": orchestrator.planner_agent.agent_id,
             "type": "planner",
-            "status": orchestrator.planner_agent.status
+            "status": orchestrator.planner_agent.status,
+            "plan_cache": orchestrator.planner_agent.get_cache_stats(),
+            "message_history": orchestrator.planner_agent.message_history.get_stats()
         },
         "executor": {
             "agent_id": orchestrator.executor_agent.agent_id,
             "type": "executor",
-            "status": orchestrator.executor_agent.status
+            "status": orchestrator.executor_agent.status,
+            "message_history": orchestrator.executor_agent.message_history.get_stats()
         }
     }
 
 
+@app.get("/api/agents/{agent_type}/messages")
+async def get_agent_messages(
+    agent_type: str,
+    workflow_id: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=10000)
+):
+    """Recent ACL messages held by an agent, optionally for one workflow"""
+    agents = {"planner": orchestrator.planner_agent, "executor": orchestrator.executor_agent}
+    agent = agents.get(agent_type)
+    if agent is None:
+        raise HTTPException(status_code=404, detail=f"Agent {agent_type} not found")
+    
+    messages = agent.get_messages(workflow_id, limit)
+    return {
+        "agent_id": agent.agent_id,
+        "workflow_id": workflow_id,
+        "count": len(messages),
+        "messages": [m.model_dump(mode="json") for m in messages]
+    }
+
+
 # ============================================================================
 # QUICK OPERATION ENDPOINTS (Convenience wrappers)
 # ============================================================================
@@ -0,0 +1,94 @@
+"""
+Agent Messaging Tests
+ACL conversion, batch planning and the per-agent message history
+    
+    python -m pytest -q test_agents.py
+"""
+import asyncio
+import json
+import os
+import tempfile
+
+from app.agents import PlannerAgent
+from app.agents.message_history import MessageHistory
+from app.database import AsyncSessionLocal, init_db
+from app.models.message import AgentMessage, InternalMessage, InternalResponse, MessageBatch, MessageType
+from app.models.workflow import WorkflowRequest
+from app.orchestrator import OrchestrationEngine
+
+
+def planning_message(workflow_id: str, action: str = "plan_workflow") -> InternalMessage:
+    """Planner request as the orchestrator builds it"""
+    return InternalMessage(
+        message_type=MessageType.REQUEST,
+        sender_id="orchestrator",
+        sender_type="orchestrator",
+        receiver_type="planner",
+        workflow_id=workflow_id,
+        action=action,
+        payload={"operation": "update", "target_customer_id": "CUST001", "parameters": {"loyalty_points": 1}}
+    )
+
+
+def test_history_converts_internal_messages_with_to_acl():
+    """Queried and spilled messages are ACL messages even when InternalMessages were recorded"""
+    spill_path = os.path.join(tempfile.mkdtemp(prefix="mcp_history_"), "agent.jsonl")
+    history = MessageHistory(1, spill_path=spill_path)
+    first, second = planning_message("wf-1"), planning_message("wf-2")
+    history.append(first)
+    history.append(second)
+    history.close()
+    
+    [retained] = history.query()
+    assert isinstance(retained, AgentMessage)
+    assert retained.message_id == second.message_id
+    with open(spill_path) as f:
+        spilled = [json.loads(line) for line in f]
+    assert [m["message_id"] for m in spilled] == [first.message_id]
+    assert spilled[0]["workflow_id"] == "wf-1"
+
+
+def test_process_batch_plans_internal_messages():
+    """A MessageBatch of InternalMessages is planned in one pass and answered in kind"""
+    batch = MessageBatch(messages=[planning_message("wf-1"), planning_message("wf-2", "unknown_action")])
+    responses = asyncio.run(PlannerAgent().process_batch(batch))
+    assert all(isinstance(r, InternalResponse) for r in responses)
+    assert responses[0].success and responses[0].result["tasks"]
+    assert not responses[1].success
+
+
+def test_planner_records_workflow_messages_and_spills_past_capacity():
+    """Planning messages exchanged for real workflows are queryable, and older ones spill to disk"""
+    spill_path = os.path.join(tempfile.mkdtemp(prefix="mcp_history_"), "planner.jsonl")
+    
+    async def run():
+        await init_db()
+        engine = OrchestrationEngine()
+        engine.planner_agent.message_history = MessageHistory(2, spill_path=spill_path)
+        workflow_ids = []
+        async with AsyncSessionLocal() as db:
+            for i in range(3):
+                response = await engine.create_workflow(WorkflowRequest(
+                    name=f"History {i}",
+                    operation="update",
+                    target_customer_id="CUST001",
+                    parameters={"loyalty_points": i}
+                ), db)
+                workflow_ids.append(response.workflow_id)
+        await engine.shutdown()
+        return engine, workflow_ids
+    
+    engine, workflow_ids = asyncio.run(run())
+    planner = engine.planner_agent
+    
+    [message] = planner.get_messages(workflow_ids[-1])
+    assert message.action == "plan_workflow"
+    assert message.sender_type == "orchestrator"
+    assert message.payload["parameters"] == {"loyalty_points": 2}
+    assert planner.get_messages(workflow_ids[0]) == []
+    
+    stats = planner.message_history.get_stats()
+    assert (stats["size"], stats["evicted"], stats["spilled"]) == (2, 1, 1)
+    with open(spill_path) as f:
+        spilled = [json.loads(line) for line in f]
+    assert [m["workflow_id"] for m in spilled] == [workflow_ids[0]]
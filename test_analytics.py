@@ -0,0 +1,106 @@
+"""
+Analytics Tests
+Grouped aggregates of the column store checked against pandas groupby
+    
+    python -m pytest -q test_analytics.py
+"""
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app import analytics
+from app.analytics import CustomerColumnStore
+from app.models.customer import CustomerFilters
+
+ROWS = 2000
+MISSING = "<missing>"
+
+
+def customer_frame(seed: int = 7) -> pd.DataFrame:
+    """Random customers with missing categories and missing measures"""
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({"mcp_id": [f"CUST{i:05d}" for i in range(ROWS)]})
+    for name, choices in (
+        ("status", ["active", "inactive", None]),
+        ("industry", ["Retail", "Finance", "Health", None]),
+        ("country", ["US", "DE", "IN"]),
+        ("subscription_plan", ["Basic", "Premium", None]),
+        ("region", ["North", "South"]),
+        ("preferred_category", ["Books", None]),
+    ):
+        frame[name] = rng.choice(np.array(choices, dtype=object), ROWS)
+    for name in analytics.MEASURES:
+        values = rng.normal(1000, 300, ROWS).round(2)
+        values[rng.random(ROWS) < 0.1] = np.nan
+        frame[name] = values
+    return frame
+
+
+def expected_groups(frame: pd.DataFrame, metric, agg: str, group_by, q: float):
+    """The same aggregate computed with pandas, keyed by group values"""
+    # A placeholder keeps missing categories as groups of their own
+    if group_by:
+        keys = frame[list(group_by)].fillna(MISSING).apply(tuple, axis=1)
+    else:
+        keys = pd.Series([()] * len(frame), index=frame.index)
+    if agg != "count":
+        keys = keys[frame[metric].notna()]
+    column = frame.loc[keys.index, metric].groupby(keys)
+    
+    if agg == "count":
+        values = column.size()
+    elif agg == "percentile":
+        values = column.quantile(q / 100)
+    else:
+        values = column.agg(agg)
+    counts = column.size()
+    return {
+        tuple(None if v == MISSING else v for v in key): (float(values[key]), int(counts[key]))
+        for key in values.index
+    }
+
+
+def actual_groups(result, group_by):
+    """Aggregate result keyed by group values"""
+    return {tuple(g[name] for name in group_by): (g["value"], g["count"]) for g in result["groups"]}
+
+
+@pytest.mark.parametrize("dense", [True, False])
+@pytest.mark.parametrize("agg", analytics.AGGREGATIONS)
+@pytest.mark.parametrize("group_by", [(), ("status",), ("status", "industry"), ("industry", "subscription_plan", "country")])
+def test_aggregate_matches_pandas_groupby(monkeypatch, group_by, agg, dense):
+    """Every aggregation agrees with pandas, including None groups and NaN measures"""
+    if not dense:
+        monkeypatch.setattr(analytics, "DENSE_GROUP_LIMIT", 0)
+    frame = customer_frame()
+    store = CustomerColumnStore()
+    store.load_frame(frame)
+    
+    result = store.aggregate(metric="total_spent", agg=agg, group_by=group_by, q=90)
+    expected = expected_groups(frame, "total_spent", agg, group_by, 90)
+    actual = actual_groups(result, group_by)
+    
+    assert actual.keys() == expected.keys()
+    for key, (value, count) in expected.items():
+        assert actual[key][1] == count
+        assert math.isclose(actual[key][0], value, rel_tol=1e-9), key
+
+
+def test_aggregate_applies_filters_before_grouping():
+    """Filtered aggregates match pandas on the filtered frame"""
+    frame = customer_frame()
+    store = CustomerColumnStore()
+    store.load_frame(frame)
+    filters = CustomerFilters(country="DE", min_credit_limit=900)
+    
+    result = store.aggregate(metric="loyalty_points", agg="mean", group_by=("status",), filters=filters)
+    selected = frame[(frame["country"] == "DE") & (frame["credit_limit"] >= 900)]
+    expected = expected_groups(selected, "loyalty_points", "mean", ("status",), 50)
+    actual = actual_groups(result, ("status",))
+    
+    assert actual.keys() == expected.keys()
+    for key, (value, count) in expected.items():
+        assert actual[key][1] == count
+        assert math.isclose(actual[key][0], value, rel_tol=1e-9)
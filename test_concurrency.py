@@ -0,0 +1,132 @@
+"""
+Concurrency Stress Test
+Launches hundreds of simultaneous update workflows against a temporary
+SQLite database and checks that every one commits to the right customer.
+
+Runs in-process (no server needed):
+    python test_concurrency.py --workflows 300
+"""
+import os
+import sys
+
+# Importing the benchmarks package points the app at a throwaway database;
+# it has to happen before any app module is imported
+import benchmarks  # noqa: F401
+os.environ.setdefault("MAX_CONCURRENT_WORKFLOWS", "50")
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import select
+
+from app.database import init_db, load_csv_data, AsyncSessionLocal, CustomerDB
+from app.models.workflow import WorkflowRequest, WorkflowStatus
+from app.orchestrator import orchestrator
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mcp_dataset.csv")
+DEFAULT_WORKFLOWS = 300
+TIMEOUT_SECONDS = 120
+
+
+def print_section(title):
+    """Print a section header"""
+    print("\n" + "=" * 60)
+    print(f"  {title}")
+    print("=" * 60)
+
+
+async def submit_update(customer_id: str, loyalty_points: int) -> str:
+    """Create one update workflow through the orchestrator"""
+    request = WorkflowRequest(
+        name=f"Stress update {customer_id}",
+        operation="update",
+        target_customer_id=customer_id,
+        parameters={"loyalty_points": loyalty_points}
+    )
+    async with AsyncSessionLocal() as db:
+        response = await orchestrator.create_workflow(request, db)
+    return response.workflow_id
+
+
+async def wait_for_workflows(workflow_ids, timeout: float = TIMEOUT_SECONDS):
+    """Poll until every workflow reaches a terminal status"""
+    terminal = {WorkflowStatus.COMPLETED, WorkflowStatus.FAILED, WorkflowStatus.CANCELLED}
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        statuses = [await orchestrator.get_workflow_status(wid) for wid in workflow_ids]
+        if all(s is not None and s.status in terminal for s in statuses):
+            return statuses
+        await asyncio.sleep(0.05)
+    raise TimeoutError(f"Workflows did not finish within {timeout}s")
+
+
+async def run_concurrent_updates(workflow_count: int) -> dict:
+    """Run workflow_count simultaneous updates and verify each customer's row"""
+    await init_db()
+    await load_csv_data(csv_path=CSV_PATH)
+    
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(CustomerDB.mcp_id).order_by(CustomerDB.mcp_id).limit(workflow_count)
+        )
+        customer_ids = result.scalars().all()
+    
+    # Each customer gets a distinct value so cross-talk between workflows is detectable
+    expected = {cid: 100000 + i for i, cid in enumerate(customer_ids)}
+    
+    started = time.perf_counter()
+    workflow_ids = await asyncio.gather(*(
+        submit_update(cid, points) for cid, points in expected.items()
+    ))
+    statuses = await wait_for_workflows(workflow_ids)
+    elapsed = time.perf_counter() - started
+    
+    failed = [s for s in statuses if s.status != WorkflowStatus.COMPLETED]
+    
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(CustomerDB.mcp_id, CustomerDB.loyalty_points)
+            .where(CustomerDB.mcp_id.in_(list(expected)))
+        )
+        actual = dict(result.all())
+    
+    mismatched = [cid for cid, points in expected.items() if actual.get(cid) != points]
+    
+    return {
+        "workflows": len(workflow_ids),
+        "failed": len(failed),
+        "mismatched": mismatched,
+        "elapsed": elapsed
+    }
+
+
+def test_concurrent_updates():
+    """Every concurrent update workflow commits to its own customer"""
+    report = asyncio.run(run_concurrent_updates(DEFAULT_WORKFLOWS))
+    assert report["failed"] == 0
+    assert report["mismatched"] == []
+
+
+def main():
+    """Run the stress test from the command line"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workflows", type=int, default=DEFAULT_WORKFLOWS)
+    args = parser.parse_args()
+    
+    print_section(f"Concurrent Update Workflows ({args.workflows})")
+    report = asyncio.run(run_concurrent_updates(args.workflows))
+    
+    print(f"Workflows: {report['workflows']}")
+    print(f"Failed: {report['failed']}")
+    print(f"Mismatched customers: {len(report['mismatched'])}")
+    print(f"Elapsed: {report['elapsed']:.2f}s ({report['workflows'] / report['elapsed']:.0f} workflows/sec)")
+    
+    if report["failed"] or report["mismatched"]:
+        print("\n✗ Concurrency check failed")
+        sys.exit(1)
+    print("\n✓ Every workflow committed to the right customer")
+
+
+if __name__ == "__main__":
+    main()
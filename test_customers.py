@@ -0,0 +1,118 @@
+"""
+Customer Endpoint Tests
+Profile caching, cursor paging and JSON serialization of the customer
+endpoints, driven in-process against a temporary SQLite database.
+    
+    python -m pytest -q test_customers.py
+"""
+import json
+
+import pytest
+
+from app.agents.executor_agent import ExecutorAgent
+from app.cache import CustomerCache
+from app.database import AsyncSessionLocal
+from app.responses import FastJSONResponse, dumps
+
+
+def test_cache_evicts_least_recently_used():
+    """Past max_size the least recently read profile is dropped"""
+    cache = CustomerCache(max_size=2, ttl_seconds=60)
+    cache.set("a", {"mcp_id": "a"})
+    cache.set("b", {"mcp_id": "b"})
+    cache.get("a")
+    cache.set("c", {"mcp_id": "c"})
+    
+    assert cache.get("b") is None
+    assert cache.get("a") == {"mcp_id": "a"}
+    assert cache.evictions == 1
+
+
+def test_cache_entries_expire():
+    """An entry older than the TTL is a miss"""
+    cache = CustomerCache(max_size=10, ttl_seconds=0)
+    cache.set("a", {"mcp_id": "a"})
+    
+    assert cache.get("a") is None
+
+
+def test_cache_skips_result_read_before_invalidation():
+    """A read that raced an invalidation does not store its stale profile"""
+    cache = CustomerCache(max_size=10, ttl_seconds=60)
+    generation = cache.generation
+    cache.invalidate(["a"])
+    cache.set("a", {"mcp_id": "a", "loyalty_points": 1}, generation)
+    
+    assert cache.get("a") is None
+
+
+def test_customer_read_is_cached_until_written(call_api):
+    """A second read is a cache hit; an executor write invalidates it"""
+    async def requests(client):
+        first = await client.get("/api/customers/CUST001")
+        second = await client.get("/api/customers/CUST001")
+        async with AsyncSessionLocal() as db:
+            await ExecutorAgent().execute_task(
+                {"parameters": {"operation": "update", "target_customer_id": "CUST001", "loyalty_points": 777}}, db
+            )
+        third = await client.get("/api/customers/CUST001")
+        bypassed = await client.get("/api/customers/CUST001", headers={"Cache-Control": "no-cache"})
+        return first, second, third, bypassed
+    
+    first, second, third, bypassed = call_api(requests)
+    assert [r.headers["X-Cache"] for r in (first, second, third, bypassed)] == ["MISS", "HIT", "MISS", "MISS"]
+    assert second.json() == first.json()
+    assert third.json()["loyalty_points"] == 777
+
+
+def test_cursor_pages_cover_every_match_once(call_api):
+    """Following next_cursor walks the filtered rows in mcp_id order without gaps or repeats"""
+    async def requests(client):
+        params = {"status": "active", "cursor": "", "limit": 400, "fields": "status"}
+        pages = []
+        while True:
+            page = (await client.get("/api/customers", params=params)).json()
+            pages.append(page)
+            if page["next_cursor"] is None:
+                break
+            params["cursor"] = page["next_cursor"]
+        everything = await client.get("/api/customers", params={"status": "active", "limit": 10000, "fields": "mcp_id"})
+        return pages, everything.json()
+    
+    pages, everything = call_api(requests)
+    walked = [item["mcp_id"] for page in pages for item in page["items"]]
+    assert len(pages) > 1
+    assert walked == sorted(item["mcp_id"] for item in everything)
+    assert all(set(item) == {"mcp_id", "status"} for page in pages for item in page["items"])
+    assert all(item["status"] == "active" for page in pages for item in page["items"])
+
+
+def test_invalid_cursor_is_rejected(call_api):
+    """A cursor that does not decode is a 400, not a server error"""
+    async def requests(client):
+        return await client.get("/api/customers", params={"cursor": "not a cursor!"})
+    
+    assert call_api(requests).status_code == 400
+
+
+def test_offset_page_returns_profile_rows(call_api):
+    """Offset paging returns plain rows with every profile field"""
+    async def requests(client):
+        return await client.get("/api/customers", params={"skip": 5, "limit": 3})
+    
+    response = call_api(requests)
+    customers = response.json()
+    assert response.headers["content-type"] == "application/json"
+    assert len(customers) == 3
+    assert {"mcp_id", "email", "credit_limit", "data"} <= set(customers[0])
+
+
+@pytest.mark.parametrize("content", [
+    {"items": [{"mcp_id": "CUST001", "credit_limit": 1500.5, "data": {"tier": "gold"}}], "next_cursor": None},
+    [],
+    "text with \"quotes\" and ünïcode"
+])
+def test_fast_json_matches_standard_json(content):
+    """The fast serializer produces the same document as the json module"""
+    assert json.loads(dumps(content)) == content
+    assert json.loads(FastJSONResponse(content).body) == content
@@ -0,0 +1,103 @@
+"""
+Executor Agent Tests
+Write validation, post-commit publishing and batch writes against a
+temporary SQLite database (set up by conftest.py).
+    
+    python -m pytest -q test_executor.py
+"""
+import asyncio
+import math
+
+import pytest
+from sqlalchemy import select
+
+from app.agents.executor_agent import ExecutorAgent
+from app.analytics import CustomerColumnStore, customer_analytics
+from app.database import AsyncSessionLocal, CustomerDB
+
+pytestmark = pytest.mark.usefixtures("sample_customers")
+
+
+async def customer_column(customer_id: str, column: str):
+    """Current value of one customer column"""
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(getattr(CustomerDB, column)).where(CustomerDB.mcp_id == customer_id))
+        return result.scalar()
+
+
+async def run_update(parameters: dict, customer_id: str = "CUST001"):
+    """Run one update task through a fresh executor"""
+    async with AsyncSessionLocal() as db:
+        response = await ExecutorAgent().execute_task(
+            {"parameters": {"operation": "update", "target_customer_id": customer_id, **parameters}}, db
+        )
+    return response["result"]
+
+
+def test_update_rejects_value_of_wrong_type():
+    """A non-numeric value for a numeric column fails before anything is written"""
+    before = asyncio.run(run_update({"loyalty_points": 111}))
+    assert before["success"]
+    
+    with pytest.raises(ValueError, match="loyalty_points"):
+        asyncio.run(run_update({"loyalty_points": "abc"}))
+    assert asyncio.run(customer_column("CUST001", "loyalty_points")) == 111
+
+
+def test_update_coerces_values_to_column_types():
+    """Numeric strings are stored as numbers, not text"""
+    asyncio.run(run_update({"loyalty_points": "4242", "credit_limit": "1500.5"}))
+    assert asyncio.run(customer_column("CUST001", "loyalty_points")) == 4242
+    assert asyncio.run(customer_column("CUST001", "credit_limit")) == 1500.5
+
+
+def test_publish_failure_does_not_fail_committed_write(monkeypatch):
+    """Analytics errors after commit are logged; the write still reports success"""
+    def broken_upsert(mcp_id, values):
+        raise RuntimeError("analytics down")
+    
+    monkeypatch.setattr(customer_analytics, "apply_upsert", broken_upsert)
+    result = asyncio.run(run_update({"loyalty_points": 777}))
+    assert result["success"]
+    assert asyncio.run(customer_column("CUST001", "loyalty_points")) == 777
+
+
+def test_analytics_upsert_stores_non_numeric_measure_as_missing():
+    """apply_upsert matches load_frame: a non-numeric measure becomes NaN instead of raising"""
+    store = CustomerColumnStore()
+    store.loaded = True
+    store.apply_upsert("CUST900", {"status": "active", "loyalty_points": "abc", "credit_limit": 10})
+    row = store.row_of["CUST900"]
+    assert math.isnan(store.values["loyalty_points"][row])
+    assert store.values["credit_limit"][row] == 10.0
+
+
+async def run_batch(operations: list) -> list:
+    """Run operations through one execute_batch call"""
+    async with AsyncSessionLocal() as db:
+        return await ExecutorAgent().execute_batch(operations, db)
+
+
+def test_batch_rejects_bad_value_without_failing_others():
+    """An invalid update value fails only its own operation"""
+    results = asyncio.run(run_batch([
+        {"operation": "update", "target_customer_id": "CUST002", "credit_limit": "lots"},
+        {"operation": "update", "target_customer_id": "CUST003", "loyalty_points": 4242},
+    ]))
+    assert isinstance(results[0], ValueError)
+    assert results[1]["success"]
+    assert asyncio.run(customer_column("CUST003", "loyalty_points")) == 4242
+
+
+def test_batch_isolates_rows_rejected_by_the_database():
+    """A row the database rejects is retried alone; the rest of the batch still commits"""
+    results = asyncio.run(run_batch([
+        {"operation": "create", "email": "nobody@example.com"},
+        {"operation": "create", "customer_name": "Batch Co", "email": "batch@example.com"},
+        {"operation": "update", "target_customer_id": "CUST004", "loyalty_points": 5151},
+    ]))
+    assert isinstance(results[0], Exception)
+    assert results[1]["success"]
+    assert results[2]["success"]
+    assert asyncio.run(customer_column(results[1]["customer_id"], "customer_name")) == "Batch Co"
+    assert asyncio.run(customer_column("CUST004", "loyalty_points")) == 5151
@@ -0,0 +1,82 @@
+"""
+Customer Export Tests
+NDJSON and CSV streaming from /api/customers/export, driven in-process
+against a temporary SQLite database (set up by conftest.py).
+    
+    python -m pytest -q test_export.py
+"""
+import csv
+import io
+import json
+
+from app.config import settings
+
+ACTIVE = {"status": "active"}
+
+
+async def active_ids(client) -> list:
+    """IDs the list endpoint returns for the same filter, in mcp_id order"""
+    response = await client.get("/api/customers", params={**ACTIVE, "limit": 100000, "fields": "mcp_id"})
+    return sorted(row["mcp_id"] for row in response.json())
+
+
+def test_ndjson_export_streams_filtered_projection(call_api, monkeypatch):
+    """One JSON object per matching customer, with only the requested fields"""
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 500)
+    
+    async def requests(client):
+        response = await client.get("/api/customers/export", params={**ACTIVE, "fields": "mcp_id,status,data"})
+        return response, await active_ids(client)
+    
+    response, expected = call_api(requests)
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [row["mcp_id"] for row in rows] == expected
+    assert all(set(row) == {"mcp_id", "status", "data"} for row in rows)
+    assert all(row["status"] == "active" for row in rows)
+    assert all(isinstance(row["data"], (dict, type(None))) for row in rows)
+
+
+def test_csv_export_writes_header_and_rows(call_api, monkeypatch):
+    """A header row in field order, then one row per matching customer"""
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 500)
+    
+    async def requests(client):
+        response = await client.get(
+            "/api/customers/export", params={**ACTIVE, "format": "csv", "fields": "mcp_id,credit_limit,data"}
+        )
+        return response, await active_ids(client)
+    
+    response, expected = call_api(requests)
+    header, *rows = list(csv.reader(io.StringIO(response.text)))
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="customers.csv"' in response.headers["content-disposition"]
+    assert header == ["mcp_id", "credit_limit", "data"]
+    assert [row[0] for row in rows] == expected
+    # JSON data is written as JSON text; a customer without data gets an empty cell
+    assert all(row[2] == "" or isinstance(json.loads(row[2]), dict) for row in rows)
+
+
+def test_csv_export_with_no_matches_is_header_only(call_api):
+    """Nothing matching still yields a header row"""
+    async def requests(client):
+        return await client.get(
+            "/api/customers/export", params={"status": "no-such-status", "format": "csv", "fields": "mcp_id,email"}
+        )
+    
+    response = call_api(requests)
+    assert response.status_code == 200
+    assert response.text.splitlines() == ["mcp_id,email"]
+
+
+def test_export_rejects_unknown_format_and_fields(call_api):
+    """Unsupported formats and unknown columns are 400s"""
+    async def requests(client):
+        return (
+            await client.get("/api/customers/export", params={"format": "xml"}),
+            await client.get("/api/customers/export", params={"fields": "mcp_id,password"})
+        )
+    
+    bad_format, bad_fields = call_api(requests)
+    assert bad_format.status_code == 400
+    assert bad_fields.status_code == 400
@@ -0,0 +1,55 @@
+"""
+CSV Ingest Tests
+Resumable streaming loads against a throwaway SQLite database
+    
+    python -m pytest -q test_ingest.py
+"""
+import asyncio
+
+from sqlalchemy import func, select
+
+from app import database
+from app.database import Base, CustomerDB, IngestProgressDB, create_engines
+
+def test_interrupted_streaming_load_resumes(monkeypatch, tmp_path, capsys, csv_path):
+    """A load that crashes mid-file picks up after its last committed chunk"""
+    writer, reader = create_engines(f"sqlite+aiosqlite:///{tmp_path / 'ingest.db'}")
+    monkeypatch.setattr(database, "engine", writer)
+    
+    insert_chunk = database.bulk_insert_customers
+    calls = {"count": 0}
+    
+    async def crash_on_third_chunk(conn, df, chunk_size):
+        calls["count"] += 1
+        if calls["count"] == 3:
+            raise RuntimeError("simulated crash")
+        return await insert_chunk(conn, df, chunk_size)
+    
+    async def run():
+        async with writer.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        
+        monkeypatch.setattr(database, "bulk_insert_customers", crash_on_third_chunk)
+        await database.load_csv_data(csv_path=csv_path, chunk_size=1000, mode="streaming")
+        monkeypatch.setattr(database, "bulk_insert_customers", insert_chunk)
+        async with writer.connect() as conn:
+            interrupted = (await conn.execute(select(IngestProgressDB.__table__))).one()
+        
+        await database.load_csv_data(csv_path=csv_path, chunk_size=1000, mode="streaming")
+        async with writer.connect() as conn:
+            rows = (await conn.execute(select(func.count(), func.count(CustomerDB.mcp_id.distinct())))).one()
+            progress = (await conn.execute(select(IngestProgressDB.__table__))).one()
+        
+        capsys.readouterr()
+        await database.load_csv_data(csv_path=csv_path, chunk_size=1000, mode="streaming")
+        third_call = capsys.readouterr().out
+        
+        await writer.dispose()
+        await reader.dispose()
+        return interrupted, rows, progress, third_call
+    
+    interrupted, rows, progress, third_call = asyncio.run(run())
+    assert interrupted.rows_committed == 2000 and not interrupted.completed
+    assert tuple(rows) == (5000, 5000)
+    assert progress.rows_committed == 5000 and progress.completed
+    assert "already populated" in third_call
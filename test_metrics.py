@@ -0,0 +1,68 @@
+"""
+Metrics Tests
+Prometheus rendering and database statement timing
+    
+    python -m pytest -q test_metrics.py
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.database import create_db_engine
+from app.metrics import DB_STATEMENT_SECONDS, MetricsRegistry
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Bucket lines are cumulative and end with +Inf, _sum and _count"""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("test_seconds", "Test latency", ["kind"], buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.labels("a").observe(value)
+    
+    assert registry.render().splitlines() == [
+        "# HELP test_seconds Test latency",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{kind="a",le="0.1"} 1',
+        'test_seconds_bucket{kind="a",le="1"} 3',
+        'test_seconds_bucket{kind="a",le="+Inf"} 4',
+        'test_seconds_sum{kind="a"} 6.05',
+        'test_seconds_count{kind="a"} 4',
+    ]
+
+
+def test_failed_statements_leave_no_timing_state(tmp_path):
+    """Only completed statements are timed; failures leave nothing on the pooled connection"""
+    async def run():
+        engine = create_db_engine(f"sqlite+aiosqlite:///{tmp_path / 'metrics.db'}", "default")
+        series = DB_STATEMENT_SECONDS.labels("write")
+        async with engine.connect() as conn:
+            before = sum(series.counts)
+            for _ in range(5):
+                with pytest.raises(OperationalError):
+                    await conn.execute(text("SELECT * FROM missing_table"))
+            await conn.execute(text("SELECT 1"))
+            timed = sum(series.counts) - before
+            info = dict((await conn.get_raw_connection()).info)
+        await engine.dispose()
+        return timed, info
+    
+    timed, info = asyncio.run(run())
+    assert timed == 1
+    assert "statement_started" not in info
+
+
+def test_metrics_endpoint_renders_statement_histogram(call_api):
+    """/metrics exposes the statement histogram after a database read"""
+    async def requests(client):
+        await client.get("/api/customers", params={"limit": 1})
+        return await client.get("/metrics")
+    
+    response = call_api(requests)
+    lines = response.text.splitlines()
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE mcp_db_statement_seconds histogram" in lines
+    assert any(line.startswith('mcp_db_statement_seconds_bucket{engine="read",le="+Inf"} ') for line in lines)
+    count = next(line for line in lines if line.startswith('mcp_db_statement_seconds_count{engine="read"} '))
+    assert int(count.rsplit(" ", 1)[1]) >= 1
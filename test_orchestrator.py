@@ -0,0 +1,149 @@
+"""
+Orchestrator Tests
+Dependency-graph execution of workflow tasks and work-queue positions
+    
+    python -m pytest -q test_orchestrator.py
+"""
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.agents import PlannerAgent
+from app.agents.executor_agent import ExecutorAgent
+from app.models.workflow import AgentType, Task, TaskStatus, WorkflowRequest, WorkflowStatus
+from app.orchestrator import OrchestrationEngine
+
+TASK_SECONDS = 0.05
+
+
+class SlowExecutor(ExecutorAgent):
+    """Executor whose tasks sleep, recording start order and peak concurrency"""
+    
+    def __init__(self):
+        super().__init__()
+        self.active = 0
+        self.peak = 0
+        self.started: List[str] = []
+    
+    async def execute_task(self, task: Dict[str, Any], db_session: Optional[AsyncSession] = None) -> Dict[str, Any]:
+        """Sleep, then succeed or raise if the task asks to fail"""
+        self.started.append(task["description"])
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(TASK_SECONDS)
+        finally:
+            self.active -= 1
+        if task["parameters"].get("fail"):
+            raise ValueError(f"{task['description']} failed")
+        return {"status": "success"}
+
+
+def task(name: str, depends_on=(), fail: bool = False) -> Task:
+    """Executor task identified by its name"""
+    return Task(
+        task_id=name,
+        description=name,
+        agent_type=AgentType.EXECUTOR,
+        depends_on=list(depends_on),
+        parameters={"fail": fail}
+    )
+
+
+def run_graph(tasks: List[Task], concurrency: int = 4):
+    """Execute a workflow made of tasks; returns the workflow, the executor and the elapsed time"""
+    async def run():
+        engine = OrchestrationEngine()
+        engine.executor_agent = executor = SlowExecutor()
+        engine.task_concurrency = concurrency
+        workflow = engine._new_workflow(WorkflowRequest(name="graph", operation="update"))
+        workflow.tasks = tasks
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await engine._execute_workflow(workflow, None)
+        return workflow, executor, loop.time() - started
+    
+    return asyncio.run(run())
+
+
+def test_diamond_runs_independent_branches_together():
+    """a -> (b, c, d) -> e takes three task times, with the middle tasks in parallel"""
+    workflow, executor, elapsed = run_graph([
+        task("a"), task("b", ["a"]), task("c", ["a"]), task("d", ["a"]), task("e", ["b", "c", "d"])
+    ])
+    assert workflow.status == WorkflowStatus.COMPLETED
+    assert executor.peak == 3
+    assert executor.started[0] == "a" and executor.started[-1] == "e"
+    assert elapsed < 4 * TASK_SECONDS
+
+
+def test_failure_stops_dependents():
+    """Dependents of a failed task never start; the workflow fails with its error"""
+    workflow, executor, _ = run_graph([
+        task("a"), task("b", ["a"], fail=True), task("c", ["a"]), task("d", ["b"])
+    ])
+    statuses = {t.task_id: t.status for t in workflow.tasks}
+    assert workflow.status == WorkflowStatus.FAILED
+    assert workflow.error == "b failed"
+    assert statuses["b"] == TaskStatus.FAILED
+    assert statuses["c"] == TaskStatus.COMPLETED  # already in flight, allowed to finish
+    assert statuses["d"] == TaskStatus.PENDING
+    assert "d" not in executor.started
+
+
+def test_cycle_is_rejected():
+    """A dependency cycle fails the workflow without running anything"""
+    workflow, executor, _ = run_graph([task("a", ["b"]), task("b", ["a"])])
+    assert workflow.status == WorkflowStatus.FAILED
+    assert "cycle" in workflow.error
+    assert executor.started == []
+
+
+def test_unknown_dependency_is_rejected():
+    """Depending on a task that is not in the workflow fails it before anything runs"""
+    workflow, executor, _ = run_graph([task("a"), task("b", ["missing"])])
+    assert workflow.status == WorkflowStatus.FAILED
+    assert "missing" in workflow.error
+    assert executor.started == []
+
+
+def test_concurrency_limit_per_workflow():
+    """No more than task_concurrency tasks of one workflow run at once"""
+    workflow, executor, elapsed = run_graph(
+        [task("root")] + [task(f"leaf{i}", ["root"]) for i in range(6)],
+        concurrency=4
+    )
+    assert workflow.status == WorkflowStatus.COMPLETED
+    assert executor.peak == 4
+    assert elapsed >= 3 * TASK_SECONDS
+
+
+def test_planned_steps_form_a_chain():
+    """Each planned step depends only on the one before it"""
+    plan = asyncio.run(PlannerAgent().plan_workflow({
+        "operation": "update",
+        "target_customer_id": "CUST001",
+        "parameters": {"loyalty_points": 1}
+    }))
+    validate, execute, post = plan["tasks"]
+    assert validate["depends_on"] == []
+    assert execute["depends_on"] == [validate["task_id"]]
+    assert post["depends_on"] == [execute["task_id"]]
+
+
+def test_queue_positions_follow_priority_order():
+    """Positions count jobs ahead in (priority, arrival) order and shift when a worker takes one"""
+    async def run():
+        engine = OrchestrationEngine()
+        engine._queue = asyncio.PriorityQueue()
+        for job_id, priority in (("a", 5), ("b", 1), ("c", 5), ("d", 3)):
+            engine._enqueue(job_id, priority)
+        before = {job_id: engine.get_queue_position(job_id) for job_id in "abcd"}
+        engine._dequeued(engine._queue.get_nowait())
+        after = {job_id: engine.get_queue_position(job_id) for job_id in "abcd"}
+        return before, after
+    
+    before, after = asyncio.run(run())
+    assert before == {"b": 1, "d": 2, "a": 3, "c": 4}
+    assert after == {"b": None, "d": 1, "a": 2, "c": 3}
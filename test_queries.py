@@ -0,0 +1,54 @@
+"""
+Customer Query Tests
+Filter results and the indexes SQLite picks for them
+    
+    python -m pytest -q test_queries.py
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import func, select, text
+
+from app.database import AsyncSessionLocal, CustomerDB, engine
+from app.models.customer import CustomerFilters
+from app.queries import filter_customers
+
+pytestmark = pytest.mark.usefixtures("sample_customers")
+
+
+async def query_plan(filters: CustomerFilters) -> str:
+    """SQLite's EXPLAIN QUERY PLAN for the filtered customer list"""
+    stmt = filter_customers(select(CustomerDB.mcp_id), filters)
+    compiled = stmt.compile(engine.sync_engine, compile_kwargs={"literal_binds": True})
+    async with engine.connect() as conn:
+        rows = (await conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))).all()
+    return " | ".join(row[-1] for row in rows)
+
+
+@pytest.mark.parametrize("filters, index", [
+    (CustomerFilters(subscription_plan="Premium"), "ix_customers_plan_credit_limit"),
+    (CustomerFilters(subscription_plan="Premium", min_credit_limit=10000), "ix_customers_plan_credit_limit"),
+    (CustomerFilters(min_credit_limit=45000), "ix_customers_credit_limit"),
+    (CustomerFilters(min_total_spent=100, max_total_spent=200), "ix_customers_total_spent"),
+    (CustomerFilters(status="active", industry="IT"), "ix_customers_status_industry"),
+])
+def test_filters_use_an_index(filters, index):
+    """Each supported filter is answered from an index instead of a table scan"""
+    plan = asyncio.run(query_plan(filters))
+    assert f"USING INDEX {index}" in plan or f"USING COVERING INDEX {index}" in plan, plan
+
+
+def test_range_filters_match_rows():
+    """Range filters return exactly the rows inside the range"""
+    async def run():
+        filters = CustomerFilters(min_credit_limit=20000, max_credit_limit=30000)
+        async with AsyncSessionLocal() as db:
+            matched = (await db.execute(filter_customers(select(CustomerDB.credit_limit), filters))).scalars().all()
+            expected = (await db.execute(
+                select(func.count()).select_from(CustomerDB).where(CustomerDB.credit_limit.between(20000, 30000))
+            )).scalar()
+        return matched, expected
+    
+    matched, expected = asyncio.run(run())
+    assert len(matched) == expected > 0
+    assert all(20000 <= value <= 30000 for value in matched)
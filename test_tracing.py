@@ -0,0 +1,56 @@
+"""
+Tracing Tests
+Span trees and Chrome export for a workflow run through the API
+(database set up by conftest.py).
+    
+    python -m pytest -q test_tracing.py
+"""
+import asyncio
+
+from app.orchestrator import orchestrator
+
+
+def spans_by_name(nodes: list, found: dict = None) -> dict:
+    """Every span in a tree, keyed by name"""
+    found = {} if found is None else found
+    for node in nodes:
+        found.setdefault(node["name"], []).append(node)
+        spans_by_name(node["children"], found)
+    return found
+
+
+def test_workflow_trace_records_plan_queue_and_tasks(call_api):
+    """A finished workflow's trace holds its plan, queue wait and task spans, in both formats"""
+    async def requests(client):
+        created = await client.post("/api/workflows", json={
+            "name": "Traced update",
+            "operation": "update",
+            "target_customer_id": "CUST002",
+            "parameters": {"loyalty_points": 42}
+        })
+        workflow_id = created.json()["workflow_id"]
+        try:
+            for _ in range(200):
+                status = (await client.get(f"/api/workflows/{workflow_id}")).json()["status"]
+                if status in ("completed", "failed"):
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await orchestrator.shutdown()
+        tree = await client.get(f"/api/workflows/{workflow_id}/trace")
+        chrome = await client.get(f"/api/workflows/{workflow_id}/trace", params={"format": "chrome"})
+        missing = await client.get("/api/workflows/no-such-workflow/trace")
+        return status, tree.json(), chrome.json(), missing
+    
+    status, tree, chrome, missing = call_api(requests)
+    spans = spans_by_name(tree["spans"])
+    assert status == "completed"
+    assert {"plan", "queue.wait", "task.planner", "task.executor", "task.validator"} <= spans.keys()
+    assert all(span["duration_ms"] is not None for group in spans.values() for span in group)
+    assert any(child["name"].startswith("db.") for span in spans["task.executor"] for child in span["children"])
+    
+    events = chrome["traceEvents"]
+    assert len(events) == tree["span_count"]
+    assert all(event["ph"] == "X" for event in events)
+    assert {"plan", "queue.wait", "task.executor"} <= {event["name"] for event in events}
+    assert missing.status_code == 404
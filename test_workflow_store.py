@@ -0,0 +1,184 @@
+"""
+Workflow Store Tests
+Write-behind buffering, flushing, flusher shutdown and eviction against an
+in-memory SQLite database.
+    
+    python -m pytest -q test_workflow_store.py
+"""
+import asyncio
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base, WorkflowDB
+from app.models.workflow import WorkflowRequest, WorkflowState, WorkflowStatus
+from app.orchestrator import OrchestrationEngine
+from app.workflow_store import WorkflowStore
+
+
+async def memory_store(**kwargs) -> WorkflowStore:
+    """Store backed by a fresh in-memory database"""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return WorkflowStore(
+        session_factory=async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False),
+        **kwargs
+    )
+
+
+async def stored_rows(store: WorkflowStore) -> int:
+    """Number of rows in the workflows table"""
+    async with store.session_factory() as session:
+        return (await session.execute(select(func.count()).select_from(WorkflowDB))).scalar()
+
+
+def new_workflow(workflow_id: str) -> WorkflowState:
+    """A minimal pending workflow"""
+    return WorkflowState(workflow_id=workflow_id, name=workflow_id, status=WorkflowStatus.PENDING)
+
+
+def test_transitions_coalesce_into_one_row_write():
+    """Repeated transitions of one workflow are written once, with the latest state"""
+    async def run():
+        store = await memory_store()
+        workflow = new_workflow("wf-1")
+        for status in (WorkflowStatus.PENDING, WorkflowStatus.RUNNING, WorkflowStatus.COMPLETED):
+            workflow.status = status
+            store.mark_dirty(workflow)
+        assert store.get_stats()["pending_writes"] == 1
+        written = await store.flush()
+        loaded = await store.load("wf-1")
+        return store, written, loaded
+    
+    store, written, loaded = asyncio.run(run())
+    assert written == 1
+    assert store.transitions == 3
+    assert loaded.status == WorkflowStatus.COMPLETED
+
+
+def test_flusher_writes_when_batch_threshold_is_reached():
+    """Reaching flush_batch_size flushes early instead of waiting for the timer"""
+    async def run():
+        store = await memory_store(flush_interval=60, flush_batch_size=3)
+        flusher = asyncio.create_task(store.run_flusher())
+        await asyncio.sleep(0)
+        for i in range(3):
+            store.mark_dirty(new_workflow(f"wf-{i}"))
+        for _ in range(100):
+            if store.flushes:
+                break
+            await asyncio.sleep(0.01)
+        store.stop_flusher()
+        await asyncio.wait_for(flusher, timeout=5)
+        return await stored_rows(store)
+    
+    assert asyncio.run(run()) == 3
+
+
+def test_stop_flusher_ends_loop_even_before_it_starts():
+    """stop_flusher() right after the task is created still stops it"""
+    async def run():
+        store = await memory_store(flush_interval=60)
+        flusher = asyncio.create_task(store.run_flusher())
+        store.stop_flusher()
+        await asyncio.wait_for(flusher, timeout=5)
+        return flusher.done()
+    
+    assert asyncio.run(run())
+
+
+def test_cancelled_flusher_does_not_keep_running():
+    """Cancelling the flusher while it waits on its timer ends it"""
+    async def run():
+        store = await memory_store(flush_interval=0.01)
+        flusher = asyncio.create_task(store.run_flusher())
+        await asyncio.sleep(0.05)
+        flusher.cancel()
+        await asyncio.wait({flusher}, timeout=5)
+        return flusher.cancelled()
+    
+    assert asyncio.run(run())
+
+
+def test_shutdown_flushes_buffered_transitions():
+    """Orchestrator shutdown stops its tasks and persists buffered state"""
+    async def run():
+        store = await memory_store(flush_interval=60)
+        engine = OrchestrationEngine(store=store)
+        engine.start()
+        store.mark_dirty(new_workflow("wf-shutdown"))
+        await asyncio.wait_for(engine.shutdown(), timeout=5)
+        return await stored_rows(store)
+    
+    assert asyncio.run(run()) == 1
+
+
+async def finished_engine(count: int, max_in_memory: int) -> OrchestrationEngine:
+    """Engine on a memory store holding count completed workflows"""
+    engine = OrchestrationEngine(store=await memory_store(flush_interval=60))
+    engine.max_workflows_in_memory = max_in_memory
+    for i in range(count):
+        workflow = engine._new_workflow(WorkflowRequest(name=f"wf-{i}", operation="update"))
+        engine._set_status(workflow, WorkflowStatus.COMPLETED)
+    return engine
+
+
+def test_evicted_workflow_is_served_from_storage():
+    """A workflow swept out of memory is still found, from the workflows table"""
+    async def run():
+        engine = await finished_engine(1, max_in_memory=0)
+        workflow_id = next(iter(engine.workflows))
+        evicted = await engine.sweep_workflows(purge=False)
+        response = await engine.get_workflow_status(workflow_id)
+        return engine, evicted, await stored_rows(engine.store), response
+    
+    engine, evicted, rows, response = asyncio.run(run())
+    assert evicted == 1
+    assert engine.workflows == {}
+    assert rows == 1
+    assert response.status == WorkflowStatus.COMPLETED
+
+
+def test_sweep_enforces_cap_least_recently_used_first():
+    """Over the cap, the workflows read longest ago are evicted first"""
+    async def run():
+        engine = await finished_engine(4, max_in_memory=2)
+        first, *_, fourth = engine.workflows
+        await engine.get_workflow_status(first)
+        evicted = await engine.sweep_workflows(purge=False)
+        return evicted, set(engine.workflows), {first, fourth}
+    
+    evicted, in_memory, expected = asyncio.run(run())
+    assert evicted == 2
+    assert in_memory == expected
+
+
+def test_eviction_waits_for_a_flush_in_progress():
+    """A flush holding an older state of a workflow cannot overwrite its eviction"""
+    async def run():
+        engine = await finished_engine(0, max_in_memory=0)
+        store = engine.store
+        workflow = engine._new_workflow(WorkflowRequest(name="racing", operation="update"))
+        engine._set_status(workflow, WorkflowStatus.RUNNING)
+        
+        save_many = store.save_many
+        
+        async def slow_save(workflows):
+            # Snapshot like save_many does, then commit late
+            snapshot = [w.model_copy(deep=True) for w in workflows]
+            await asyncio.sleep(0.05)
+            return await save_many(snapshot)
+        
+        store.save_many = slow_save
+        flush = asyncio.create_task(store.flush())
+        await asyncio.sleep(0)
+        store.save_many = save_many
+        
+        engine._set_status(workflow, WorkflowStatus.COMPLETED)
+        await engine.sweep_workflows(purge=False)
+        await flush
+        return await store.load(workflow.workflow_id)
+    
+    assert asyncio.run(run()).status == WorkflowStatus.COMPLETED
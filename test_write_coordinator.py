@@ -0,0 +1,50 @@
+"""
+Write Coordinator Tests
+Group commits with per-caller results against an in-memory SQLite database
+    
+    python -m pytest -q test_write_coordinator.py
+"""
+import asyncio
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base, CustomerDB
+from app.write_coordinator import WriteCoordinator
+
+
+def customer(mcp_id: str) -> dict:
+    """Minimal customer row"""
+    return {"mcp_id": mcp_id, "customer_name": mcp_id, "email": f"{mcp_id}@example.com", "loyalty_points": 0}
+
+
+def test_group_commit_resolves_each_caller_separately():
+    """A duplicate-key insert fails on its own; the updates grouped with it commit"""
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(insert(CustomerDB), [customer("A"), customer("B")])
+        sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        coordinator = WriteCoordinator(session_factory=sessions, max_batch=10, max_delay=0.05)
+        
+        outcomes = await asyncio.gather(
+            coordinator.submit(update(CustomerDB).where(CustomerDB.mcp_id == "A").values(loyalty_points=10)),
+            coordinator.submit(insert(CustomerDB).values(**customer("A"))),
+            coordinator.submit(update(CustomerDB).where(CustomerDB.mcp_id == "B").values(loyalty_points=20)),
+            return_exceptions=True
+        )
+        await coordinator.shutdown()
+        async with sessions() as session:
+            points = dict((await session.execute(select(CustomerDB.mcp_id, CustomerDB.loyalty_points))).all())
+        await engine.dispose()
+        return outcomes, points, coordinator.get_stats()
+    
+    (first, duplicate, second), points, stats = asyncio.run(run())
+    assert first.rowcount == 1 and second.rowcount == 1
+    assert isinstance(duplicate, IntegrityError)
+    assert points == {"A": 10, "B": 20}
+    assert stats["groups"] == 1
+    assert stats["writes"] == 3 and stats["failed_writes"] == 1